@@ -0,0 +1,79 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+    Measure the cost of chained fluent calls on BQQueryTemplate and on the resource tree
+    against the size of the fixture they hold, as well as the cost of building a resource tree.
+
+    Usage: python benchmarks/fluent_copy_benchmark.py [nb_chained_calls]
+"""
+
+import json
+import logging
+import sys
+from timeit import timeit
+
+import logzero
+from google.cloud.bigquery.schema import SchemaField
+
+from bq_test_kit.bq_dsl import BQQueryTemplate, Project
+from bq_test_kit.bq_test_kit_config import BQTestKitConfig
+from bq_test_kit.constants import DEFAULT_LOCATION
+from bq_test_kit.data_literal_transformers import JsonDataLiteralTransformer
+
+
+def _chain_template(query_template: BQQueryTemplate, nb_chained_calls: int) -> BQQueryTemplate:
+    for i in range(nb_chained_calls):
+        query_template = query_template.update_global_dict({f"key_{i}": i})
+    return query_template
+
+
+def _chain_table(project: Project, nb_tables: int, nb_chained_calls: int):
+    table = project.dataset("dataset_foo").table("table_0")
+    for i in range(1, nb_tables):
+        table = table.table(f"table_{i}")
+    for i in range(nb_chained_calls):
+        table = table.with_alias(f"alias_{i}")
+    return table
+
+
+def _build_tree(project: Project, nb_datasets: int, nb_tables_per_dataset: int) -> Project:
+    for i in range(nb_datasets):
+        table = project.dataset(f"dataset_{i}").table("table_0")
+        for j in range(1, nb_tables_per_dataset):
+            table = table.table(f"table_{j}")
+        project = table.project
+    return project
+
+
+def main(nb_chained_calls: int) -> None:
+    """Print the average time of nb_chained_calls chained calls for growing fixtures.
+
+    Args:
+        nb_chained_calls (int): number of fluent calls chained.
+    """
+    logzero.loglevel(logging.WARNING)
+    conf = BQTestKitConfig({DEFAULT_LOCATION: "EU"})
+    schema = [SchemaField(f"f_string_{i}", "STRING") for i in range(50)]
+    print(f"{nb_chained_calls} chained calls on BQQueryTemplate")
+    for nb_rows in [100, 10000, 100000]:
+        datum = [json.dumps({"f_string_0": f"value {i}"}) for i in range(nb_rows)]
+        query_template = BQQueryTemplate(from_="select * from t1", bqtk_config=conf, bq_client=None) \
+            .with_temp_tables((JsonDataLiteralTransformer(), {"t1": (datum, schema)}))
+        duration = timeit(lambda q=query_template: _chain_template(q, nb_chained_calls), number=3) / 3
+        print(f"{nb_rows:>8} rows: {duration * 1000:10.2f} ms")
+    print(f"{nb_chained_calls} chained calls on Table")
+    for nb_tables in [10, 100]:
+        project = Project("test_project", bq_client=None, bqtk_config=conf)
+        duration = timeit(lambda p=project, n=nb_tables: _chain_table(p, n, nb_chained_calls), number=3) / 3
+        print(f"{nb_tables:>8} tables: {duration * 1000:10.2f} ms")
+    print("Building a tree of 20 datasets with 15 tables each")
+    project = Project("test_project", bq_client=None, bqtk_config=conf)
+    duration = timeit(lambda: _build_tree(project, 20, 15), number=3) / 3
+    print(f"{300:>8} tables: {duration * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,58 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+    Compare cold and warm loads of a data literal through a LiteralCache.
+
+    Usage: python benchmarks/literal_cache_benchmark.py [nb_rows] [nb_columns] [nb_warm_loads]
+"""
+
+import json
+import logging
+import sys
+import tempfile
+
+import logzero
+from google.cloud.bigquery.schema import SchemaField
+
+from bq_test_kit.data_literal_transformers import (JsonDataLiteralTransformer,
+                                                   LiteralCache)
+
+
+def _fixture(nb_rows: int, nb_columns: int):
+    schema = [SchemaField(f"f_string_{i}", "STRING") for i in range(nb_columns)] + [SchemaField("f_int", "INT64")]
+    rows = []
+    for row_number in range(nb_rows):
+        row = {f"f_string_{i}": f"value {row_number}" for i in range(nb_columns)}
+        row["f_int"] = row_number
+        rows.append(json.dumps(row))
+    return rows, schema
+
+
+def main(nb_rows: int, nb_columns: int, nb_warm_loads: int) -> None:
+    """Print cold and warm load times.
+
+    Args:
+        nb_rows (int): number of rows in the datum.
+        nb_columns (int): number of string columns in the schema.
+        nb_warm_loads (int): number of loads once the cache is filled.
+    """
+    logzero.loglevel(logging.WARNING)
+    rows, schema = _fixture(nb_rows, nb_columns)
+    with tempfile.TemporaryDirectory() as directory:
+        cache = LiteralCache(directory)
+        transformer = JsonDataLiteralTransformer().with_literal_cache(cache)
+        for _ in range(nb_warm_loads + 1):
+            transformer.load(rows, schema)
+        stats = cache.stats()
+    print(f"{nb_rows} rows, {len(schema)} columns")
+    print(f"cold: {stats.cold_seconds / stats.misses * 1000:10.1f} ms")
+    print(f"warm: {stats.warm_seconds / stats.hits * 1000:10.1f} ms ({stats.hits} hits)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 10)
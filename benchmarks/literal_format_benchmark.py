@@ -0,0 +1,58 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+    Compare data literals generated with LiteralFormat.UNION_ALL and LiteralFormat.ARRAY_OF_STRUCTS
+    in terms of SQL byte size and render time.
+
+    Usage: python benchmarks/literal_format_benchmark.py [nb_rows] [nb_columns]
+"""
+
+import json
+import logging
+import sys
+from timeit import timeit
+
+import logzero
+from google.cloud.bigquery.schema import SchemaField
+
+from bq_test_kit.data_literal_transformers import (JsonDataLiteralTransformer,
+                                                   LiteralFormat)
+
+
+def _fixture(nb_rows: int, nb_columns: int):
+    nested_fields = [SchemaField("n_int", "INT64"), SchemaField("n_strings", "STRING", mode="REPEATED")]
+    schema = ([SchemaField(f"f_string_{i}", "STRING") for i in range(nb_columns)] +
+              [SchemaField("f_int", "INT64"), SchemaField("f_date", "DATE"),
+               SchemaField("f_nested", "RECORD", fields=nested_fields)])
+    rows = []
+    for row_number in range(nb_rows):
+        row = {f"f_string_{i}": f"value {row_number}" for i in range(0, nb_columns, 2)}
+        row.update({"f_int": row_number, "f_date": "2020-11-26",
+                    "f_nested": {"n_int": row_number, "n_strings": ["a", "b"]}})
+        rows.append(json.dumps(row))
+    return rows, schema
+
+
+def main(nb_rows: int, nb_columns: int) -> None:
+    """Print size and render time of both literal formats.
+
+    Args:
+        nb_rows (int): number of rows in the datum.
+        nb_columns (int): number of string columns in the schema.
+    """
+    logzero.loglevel(logging.WARNING)
+    rows, schema = _fixture(nb_rows, nb_columns)
+    print(f"{nb_rows} rows, {len(schema)} columns")
+    for literal_format in LiteralFormat:
+        transformer = JsonDataLiteralTransformer().with_literal_format(literal_format)
+        literal = transformer.load(rows, schema)
+        duration = timeit(lambda t=transformer: t.load(rows, schema), number=3) / 3
+        print(f"{literal_format.value:>16}: {len(literal.encode('utf-8')):>12} bytes, {duration * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 50)
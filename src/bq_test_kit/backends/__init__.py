@@ -0,0 +1,23 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+# C0114 disabled because this module contains only export
+# pylint: disable=C0114
+
+from bq_test_kit.backends.cassette_client import CassetteClient, CassetteJob
+from bq_test_kit.backends.cassette_mode import CassetteMode
+from bq_test_kit.backends.sqlite_client import (SQLiteClient, SQLiteJob,
+                                                SQLiteRowIterator)
+from bq_test_kit.backends.sqlite_dialect import SQLiteDialect
+
+__all__ = [
+    "CassetteClient",
+    "CassetteJob",
+    "CassetteMode",
+    "SQLiteClient",
+    "SQLiteDialect",
+    "SQLiteJob",
+    "SQLiteRowIterator"
+]
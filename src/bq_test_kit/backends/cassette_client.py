@@ -0,0 +1,322 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+    Record calls made to BigQuery in a cassette, in order to replay them later without network access.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Union
+
+from google.api_core.exceptions import (GoogleAPICallError, NotFound,
+                                        from_http_status)
+from google.cloud.bigquery import SessionInfo
+from google.cloud.bigquery.schema import SchemaField
+from google.cloud.bigquery.table import Table as BQTable
+from google.cloud.bigquery.table import TableReference
+from logzero import logger
+
+from bq_test_kit.backends.cassette_mode import CassetteMode
+from bq_test_kit.exceptions import CassetteMissException
+from bq_test_kit.recorded_rows import RecordedRows
+from bq_test_kit.sql_tokens import tokenize
+
+_CASSETTE_VERSION = 1
+
+
+class CassetteJob():
+    """Recorded job. As BigQuery jobs, recorded failures are raised by result.
+    """
+
+    def __init__(self, record: Dict[str, Any]) -> None:
+        self.job_id = record.get("job_id")
+        self.state = "DONE"
+        self.total_bytes_processed = record.get("total_bytes_processed")
+        self.referenced_tables = [TableReference.from_api_repr(table) for table in record.get("referenced_tables", [])]
+        self.schema = [SchemaField.from_api_repr(field) for field in record.get("schema", [])]
+        self.session_info = SessionInfo({"sessionId": record["session_id"]}) if "session_id" in record else None
+        self._record = record
+
+    # arguments of the bigquery jobs methods are accepted even if they don't apply to recorded jobs.
+    # pylint: disable=W0613
+    def done(self, *args, **kwargs) -> bool:
+        """
+        Returns:
+            bool: always True since recorded jobs are over.
+        """
+        return True
+
+    def result(self, *args, **kwargs) -> RecordedRows:
+        """
+        Raises:
+            GoogleAPICallError: recorded error of the job, if any.
+
+        Returns:
+            RecordedRows: recorded rows of the job.
+        """
+        _raise_recorded_error(self._record)
+        if "result" not in self._record:
+            return RecordedRows([], [], 0)
+        return RecordedRows.from_record(self._record["result"])
+
+
+class _RecordingJob():
+    """Job of the wrapped client, recording its statistics as soon as it is returned, since a dry run
+       is never asked for its result, and its outcome when its result is fetched.
+    """
+
+    def __init__(self, job, record: Dict[str, Any]) -> None:
+        self._job = job
+        self._record = record
+        self._record["job_id"] = job.job_id
+        self._record.update(_statistics(job))
+
+    def result(self, *args, **kwargs) -> RecordedRows:
+        """
+        Returns:
+            RecordedRows: rows of the job, read at once in order to be recorded.
+        """
+        try:
+            row_iterator = self._job.result(*args, **kwargs)
+        except GoogleAPICallError as error:
+            self._record["error"] = {"code": error.code, "message": error.message}
+            raise
+        rows = RecordedRows.from_row_iterator(row_iterator)
+        self._record["result"] = rows.to_record()
+        # session of a job is known once it is done.
+        self._record.update(_statistics(self._job))
+        return rows
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._job, name)
+
+
+class CassetteClient():
+    """Duck typed bigquery Client recording query, load_table_from_file and create_table calls of the wrapped
+       client in a gzipped JSON cassette, see CassetteMode. Calls are identified by a hash of their arguments,
+       queries being normalized beforehand so that whitespaces and comments don't matter.
+       Thus any change of a query makes it a new call, recorded again in CassetteMode.AUTO.
+
+       Other calls are forwarded to the wrapped client. When replaying without client, they are ignored,
+       get_table and get_dataset raising NotFound since nothing is known about resources.
+    """
+
+    def __init__(self, bq_client, cassette_path: str, mode: CassetteMode = CassetteMode.AUTO) -> None:
+        """Constructor of CassetteClient.
+
+        Args:
+            bq_client (Client): wrapped client, may be None when replaying.
+            cassette_path (str): path of the cassette, usually one per test.
+            mode (CassetteMode, optional): how the cassette is used. Defaults to CassetteMode.AUTO.
+        """
+        if bq_client is None and mode != CassetteMode.REPLAY:
+            raise ValueError(f"A client is required to record calls in {mode}.")
+        self.cassette_path = cassette_path
+        self.mode = mode
+        self._bq_client = bq_client
+        self._lock = threading.RLock()
+        self._recorded: Dict[str, Dict[str, Any]] = {}
+        if mode != CassetteMode.RECORD and os.path.exists(cassette_path):
+            with gzip.open(cassette_path, "rt", encoding="utf-8") as cassette:
+                self._recorded = json.load(cassette)["interactions"]
+        self._used: Dict[str, Dict[str, Any]] = {}
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+
+    def query(self, query: str, job_config=None, job_id_prefix: Optional[str] = None,
+              location: Optional[str] = None, project: Optional[str] = None, **kwargs):
+        """Replay or record Client.query. Sessions are left out of the key since their id changes
+           from one run to another, the recorded session id being replayed instead.
+        """
+        normalized_query = " ".join(token.text for token in tokenize(query) if token.kind not in ("space", "comment"))
+        key = _hash("query", normalized_query, _without_session(job_config.to_api_repr()) if job_config else None,
+                    location, project)
+        return self._replay_or_record(
+            key, "query",
+            lambda: self._bq_client.query(query, job_config=job_config, job_id_prefix=job_id_prefix,
+                                          location=location, project=project, **kwargs)
+        )
+
+    def list_jobs(self, parent_job=None, **kwargs):
+        """Replay or record the child jobs of a recorded script, forward other calls.
+        """
+        parent_job_id = getattr(parent_job, "job_id", parent_job)
+        with self._lock:
+            parent_record = self._jobs.get(parent_job_id)
+        if parent_record is None:
+            return self._forward("list_jobs", [], parent_job=parent_job, **kwargs)
+        if "children" in parent_record:
+            return [CassetteJob(record) for record in parent_record["children"]]
+        parent_record["children"] = []
+        jobs = []
+        for job in self._bq_client.list_jobs(parent_job=parent_job, **kwargs):
+            record: Dict[str, Any] = {}
+            parent_record["children"].append(record)
+            jobs.append(_RecordingJob(job, record))
+        return jobs
+
+    def load_table_from_file(self, file_obj, destination,
+                             *, job_id_prefix: Optional[str] = None,
+                             location: Optional[str] = None, project: Optional[str] = None,
+                             job_config=None, **kwargs):
+        """Replay or record Client.load_table_from_file, the file being identified by its content.
+        """
+        # Arguments mirror the ones of Client.load_table_from_file, options being keyword only.
+        # pylint: disable=R0913
+        content = file_obj.read()
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        key = _hash("load_table_from_file", hashlib.sha256(content).hexdigest(), str(destination),
+                    job_config.to_api_repr() if job_config else None, location, project)
+        return self._replay_or_record(
+            key, f"load_table_from_file to {destination}",
+            lambda: self._bq_client.load_table_from_file(io.BytesIO(content), destination,
+                                                         job_id_prefix=job_id_prefix, location=location,
+                                                         project=project, job_config=job_config, **kwargs)
+        )
+
+    def create_table(self, table, exists_ok: bool = False, **kwargs) -> BQTable:
+        """Replay or record Client.create_table. Expiration is ignored, since it changes from one run to another.
+        """
+        bqtable = table if isinstance(table, BQTable) else BQTable(table)
+        table_repr = bqtable.to_api_repr()
+        table_repr.pop("expirationTime", None)
+        key = _hash("create_table", table_repr, exists_ok)
+        with self._lock:
+            record = self._replayed_record(key, f"create_table of {bqtable.full_table_id or bqtable.table_id}")
+        if record is not None:
+            _raise_recorded_error(record)
+            return BQTable.from_api_repr(record["table"])
+        record = {}
+        try:
+            created = self._bq_client.create_table(table, exists_ok=exists_ok, **kwargs)
+        except GoogleAPICallError as error:
+            record["error"] = {"code": error.code, "message": error.message}
+            raise
+        finally:
+            with self._lock:
+                self._used[key] = record
+        record["table"] = created.to_api_repr()
+        return created
+
+    def get_table(self, table, **kwargs):
+        """Forward Client.get_table, raise NotFound when replaying without client.
+        """
+        return self._forward("get_table", NotFound(f"{table} is unknown to the cassette."), table, **kwargs)
+
+    def get_dataset(self, dataset_ref, **kwargs):
+        """Forward Client.get_dataset, raise NotFound when replaying without client.
+        """
+        return self._forward("get_dataset", NotFound(f"{dataset_ref} is unknown to the cassette."),
+                             dataset_ref, **kwargs)
+
+    def save(self) -> None:
+        """Write the cassette, unless replaying. Only the calls made since the client has been created are kept.
+        """
+        if self.mode == CassetteMode.REPLAY:
+            return
+        with self._lock:
+            content = {"version": _CASSETTE_VERSION, "interactions": self._used}
+            directory = os.path.dirname(self.cassette_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with gzip.open(self.cassette_path, "wt", encoding="utf-8") as cassette:
+                json.dump(content, cassette, sort_keys=True)
+        logger.info("%s calls recorded in %s.", len(self._used), self.cassette_path)
+
+    def __enter__(self) -> 'CassetteClient':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.save()
+
+    def __getattr__(self, name: str) -> Any:
+        # calls that aren't recorded, such as create_dataset or delete_table, are ignored without client.
+        if self._bq_client is None:
+            return lambda *args, **kwargs: None
+        return getattr(self._bq_client, name)
+
+    def __deepcopy__(self, memo) -> 'CassetteClient':
+        # a cassette is a shared resource, copies of a resource keep recording in it.
+        return self
+
+    def _replay_or_record(self, key: str, call: str, run: Callable[[], Any]):
+        with self._lock:
+            record = self._replayed_record(key, call)
+            if record is not None:
+                job = CassetteJob(record)
+                self._jobs[job.job_id] = record
+                return job
+        record = {}
+        try:
+            job = _RecordingJob(run(), record)
+        except GoogleAPICallError as error:
+            record["error"] = {"code": error.code, "message": error.message}
+            raise
+        finally:
+            with self._lock:
+                self._used[key] = record
+        with self._lock:
+            self._jobs[job.job_id] = record
+        return job
+
+    def _replayed_record(self, key: str, call: str) -> Optional[Dict[str, Any]]:
+        if self.mode == CassetteMode.RECORD:
+            return None
+        record = self._used.get(key, self._recorded.get(key))
+        if record is None:
+            if self.mode == CassetteMode.REPLAY:
+                raise CassetteMissException(self.cassette_path, call)
+            return None
+        self._used[key] = record
+        return record
+
+    def _forward(self, name: str, replayed: Union[Any, Exception], *args, **kwargs):
+        if self._bq_client is None:
+            if isinstance(replayed, Exception):
+                raise replayed
+            return replayed
+        return getattr(self._bq_client, name)(*args, **kwargs)
+
+
+def _hash(*arguments: Any) -> str:
+    return hashlib.sha256(json.dumps(arguments, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _without_session(job_config_repr: Dict[str, Any]) -> Dict[str, Any]:
+    query_repr = job_config_repr.get("query", {})
+    query_repr.pop("createSession", None)
+    connection_properties = [prop for prop in query_repr.pop("connectionProperties", [])
+                             if prop.get("key") != "session_id"]
+    if connection_properties:
+        query_repr["connectionProperties"] = connection_properties
+    return job_config_repr
+
+
+def _statistics(job) -> Dict[str, Any]:
+    """Statistics of a query job read by dry runs and its session, jobs of other kinds having none."""
+    statistics: Dict[str, Any] = {}
+    session_id = getattr(getattr(job, "session_info", None), "session_id", None)
+    if isinstance(session_id, str):
+        statistics["session_id"] = session_id
+    total_bytes_processed = getattr(job, "total_bytes_processed", None)
+    if isinstance(total_bytes_processed, int):
+        statistics["total_bytes_processed"] = total_bytes_processed
+    referenced_tables = getattr(job, "referenced_tables", None)
+    if isinstance(referenced_tables, list):
+        statistics["referenced_tables"] = [table.to_api_repr() for table in referenced_tables]
+    schema = getattr(job, "schema", None)
+    if isinstance(schema, list):
+        statistics["schema"] = [field.to_api_repr() for field in schema]
+    return statistics
+
+
+def _raise_recorded_error(record: Dict[str, Any]) -> None:
+    if "error" in record:
+        raise from_http_status(record["error"]["code"], record["error"]["message"])
@@ -0,0 +1,22 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+# C0114 disabled because this module contains only one class
+# pylint: disable=C0114
+
+from enum import Enum
+
+
+class CassetteMode(Enum):
+    """
+        Specify how a CassetteClient uses its cassette.
+        RECORD sends every call to BigQuery and records it, replacing the previous cassette.
+        REPLAY serves every call from the cassette and fails on calls that haven't been recorded.
+        AUTO serves recorded calls and records the others, calls that are no longer done being dropped.
+        Thus a change of the rendered query is recorded again without any action.
+    """
+    RECORD = "RECORD"
+    REPLAY = "REPLAY"
+    AUTO = "AUTO"
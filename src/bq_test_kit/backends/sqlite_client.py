@@ -0,0 +1,700 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+    Offline replacement of the BigQuery client, running queries on an in-memory SQLite database.
+"""
+
+import base64
+import csv
+import io
+import json
+import re
+import sqlite3
+import threading
+import uuid
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from google.api_core.exceptions import BadRequest, Conflict, NotFound
+from google.cloud.bigquery import SessionInfo
+from google.cloud.bigquery.dataset import Dataset as BQDataset
+from google.cloud.bigquery.dataset import DatasetReference
+from google.cloud.bigquery.job import (LoadJobConfig, QueryJobConfig,
+                                       SourceFormat, WriteDisposition)
+from google.cloud.bigquery.schema import SchemaField
+from google.cloud.bigquery.table import Row
+from google.cloud.bigquery.table import Table as BQTable
+from google.cloud.bigquery.table import TableReference
+from logzero import logger
+
+from bq_test_kit.backends.sqlite_dialect import Column, DataType, SQLiteDialect
+from bq_test_kit.iso_format import parse_date, parse_datetime, parse_time
+
+_FIELD_TYPES = {"INTEGER": "INTEGER", "REAL": "FLOAT", "NUMERIC": "NUMERIC", "BLOB": "BYTES"}
+
+_STANDARD_TYPES = {
+    "INTEGER": "INT64", "INT": "INT64", "SMALLINT": "INT64", "BIGINT": "INT64", "TINYINT": "INT64",
+    "BYTEINT": "INT64", "FLOAT": "FLOAT64", "BOOLEAN": "BOOL", "DECIMAL": "NUMERIC", "BIGDECIMAL": "BIGNUMERIC",
+    "RECORD": "STRUCT"
+}
+
+_LEGACY_TYPES = {"INT64": "INTEGER", "FLOAT64": "FLOAT", "BOOL": "BOOLEAN", "STRUCT": "RECORD"}
+
+_ABORT_SESSION = re.compile(r"CALL\s+BQ\s*\.\s*ABORT_SESSION\s*\(", re.IGNORECASE)
+
+DatasetLike = Union[BQDataset, DatasetReference, str]
+TableLike = Union[BQTable, TableReference, str]
+
+
+class SQLiteRowIterator():
+    """Rows of a statement, with the attributes of RowIterator used by BQQueryResult.
+    """
+
+    def __init__(self, schema: List[SchemaField], values: List[Tuple[Any, ...]]) -> None:
+        self.schema = schema
+        self._field_to_index = {field.name: index for index, field in enumerate(schema)}
+        self._values = values
+        self.total_rows = len(values)
+
+    def __iter__(self) -> Iterator[Row]:
+        return (Row(row, self._field_to_index) for row in self._values)
+
+    def head(self, max_results: int) -> 'SQLiteRowIterator':
+        """
+        Args:
+            max_results (int): maximum number of rows to keep.
+
+        Returns:
+            SQLiteRowIterator: first rows, total_rows being unchanged.
+        """
+        head = SQLiteRowIterator(self.schema, self._values[:max_results])
+        head.total_rows = self.total_rows
+        return head
+
+
+class SQLiteJob():
+    """Completed query or load job. Like BigQuery jobs, failures are raised by result.
+       Nothing being billed, jobs process no bytes.
+    """
+
+    def __init__(self, job_id: str, rows: Optional[SQLiteRowIterator] = None) -> None:
+        self.job_id = job_id
+        self.state = "DONE"
+        self.rows = rows if rows else SQLiteRowIterator([], [])
+        self.error: Optional[Exception] = None
+        self.child_jobs: List['SQLiteJob'] = []
+        self.session_info: Optional[SessionInfo] = None
+        self.total_bytes_processed = 0
+        self.referenced_tables: List[TableReference] = []
+
+    @property
+    def schema(self) -> List[SchemaField]:
+        """
+        Returns:
+            List[SchemaField]: schema of the rows of the last statement of the job.
+        """
+        return self.rows.schema
+
+    # arguments of the bigquery jobs methods are accepted even if they don't apply to SQLite jobs.
+    # pylint: disable=W0613
+    def done(self, *args, **kwargs) -> bool:
+        """
+        Returns:
+            bool: always True since jobs run synchronously.
+        """
+        return True
+
+    def result(self, *args, max_results: Optional[int] = None, **kwargs) -> SQLiteRowIterator:
+        """
+        Args:
+            max_results (Optional[int], optional): maximum number of rows to return. Defaults to None.
+
+        Raises:
+            Exception: error of the job, if any.
+
+        Returns:
+            SQLiteRowIterator: rows of the last statement of the job.
+        """
+        if self.error is not None:
+            raise self.error
+        return self.rows if max_results is None else self.rows.head(max_results)
+
+
+class SQLiteClient():
+    """Duck typed bigquery Client giving to BQTestKit an embedded execution backend, so that tests run
+       without network access nor cost. Queries are translated by SQLiteDialect, the subset supported being
+       the one generated by bq-test-kit.
+
+       Datasets are namespaces of table names in a single in-memory database, projects are ignored.
+       STRUCT and ARRAY values are stored as JSON, BOOL values as 0 and 1, dates and timestamps as ISO strings.
+       They are read back with the types declared by the query, see SQLiteDialect.column_types,
+       columns of unknown type being STRING ones holding SQLite values.
+
+       Temporary tables being scoped to the connection, a single session may be active at a time.
+    """
+
+    def __init__(self, database: str = ":memory:", dialect: Optional[SQLiteDialect] = None) -> None:
+        """Constructor of SQLiteClient.
+
+        Args:
+            database (str, optional): SQLite database. Defaults to ":memory:".
+            dialect (Optional[SQLiteDialect], optional): translation of queries. Defaults to SQLiteDialect().
+        """
+        self.dialect = dialect if dialect else SQLiteDialect()
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(database, check_same_thread=False, isolation_level=None)
+        self._connection.create_function("from_base64", 1, _from_base64)
+        self._connection.create_function("to_base64", 1, _to_base64)
+        self._connection.create_function("concat", -1, _concat)
+        self._connection.create_function("starts_with", 2, _starts_with)
+        self._connection.create_function("ends_with", 2, _ends_with)
+        self._connection.create_function("generate_uuid", 0, lambda: str(uuid.uuid4()))
+        self._datasets: Dict[str, BQDataset] = {}
+        self._tables: Dict[Tuple[str, str], BQTable] = {}
+        # declared columns of tables created by statements, temporary tables being keyed by their name only.
+        self._created_columns: Dict[Tuple[str, ...], Optional[List[Column]]] = {}
+        self._jobs: Dict[str, SQLiteJob] = {}
+        self._session_id: Optional[str] = None
+        # temporary tables kept until the end of the session.
+        self._session_tables: Set[str] = set()
+
+    # arguments of the bigquery Client methods are accepted even if they don't apply to SQLite.
+    # pylint: disable=W0613
+
+    def create_dataset(self, dataset: DatasetLike, exists_ok: bool = False, **kwargs) -> BQDataset:
+        """Register a dataset, see Client.create_dataset.
+        """
+        bqdataset = dataset if isinstance(dataset, BQDataset) else BQDataset(_dataset_reference(dataset))
+        with self._lock:
+            if bqdataset.dataset_id in self._datasets:
+                if exists_ok:
+                    return self._datasets[bqdataset.dataset_id]
+                raise Conflict(f"Already Exists: Dataset {bqdataset.project}:{bqdataset.dataset_id}")
+            self._datasets[bqdataset.dataset_id] = bqdataset
+        return bqdataset
+
+    def get_dataset(self, dataset_ref: DatasetLike, **kwargs) -> BQDataset:
+        """See Client.get_dataset.
+        """
+        dataset_id = _dataset_reference(dataset_ref).dataset_id
+        with self._lock:
+            if dataset_id not in self._datasets:
+                raise NotFound(f"Not found: Dataset {dataset_id}")
+            return self._datasets[dataset_id]
+
+    def delete_dataset(self, dataset: DatasetLike, delete_contents: bool = False,
+                       not_found_ok: bool = False, **kwargs) -> None:
+        """See Client.delete_dataset.
+        """
+        dataset_id = _dataset_reference(dataset).dataset_id
+        with self._lock:
+            if dataset_id not in self._datasets:
+                if not_found_ok:
+                    return
+                raise NotFound(f"Not found: Dataset {dataset_id}")
+            tables = self.list_tables(dataset_id)
+            if tables and not delete_contents:
+                raise BadRequest(f"Dataset {dataset_id} is still in use")
+            for table in tables:
+                self.delete_table(table)
+            del self._datasets[dataset_id]
+
+    def create_table(self, table: TableLike, exists_ok: bool = False, **kwargs) -> BQTable:
+        """Create a table, see Client.create_table. Table without schema is created on its first load.
+        """
+        bqtable = table if isinstance(table, BQTable) else BQTable(table)
+        key = (bqtable.dataset_id, bqtable.table_id)
+        with self._lock:
+            self.get_dataset(bqtable.dataset_id)
+            if self._exists(key):
+                if exists_ok:
+                    return self.get_table(bqtable)
+                raise Conflict(f"Already Exists: Table {bqtable.project}:{bqtable.dataset_id}.{bqtable.table_id}")
+            if bqtable.schema:
+                self._create_sqlite_table(key, bqtable.schema)
+            self._tables[key] = bqtable
+        return bqtable
+
+    def get_table(self, table: TableLike, **kwargs) -> BQTable:
+        """See Client.get_table. Tables created by queries have a schema derived from their column types.
+        """
+        key = _table_key(table)
+        with self._lock:
+            if key in self._tables:
+                return self._tables[key]
+            columns = self._columns(key)
+            if not columns:
+                raise NotFound(f"Not found: Table {'.'.join(key)}")
+            declared = self._created_columns.get(key)
+            if declared is not None and len(declared) == len(columns):
+                schema = [_schema_field(name, data_type) for (name, _), (_, data_type) in zip(columns, declared)]
+            else:
+                schema = [SchemaField(name, _FIELD_TYPES.get(column_type, "STRING")) for name, column_type in columns]
+            return BQTable(_table_reference(table, key), schema=schema)
+
+    def update_table(self, table: BQTable, fields: List[str], **kwargs) -> BQTable:
+        """See Client.update_table. Labels are merged, a None value removing its label.
+        """
+        with self._lock:
+            stored = self.get_table(table)
+            self._tables[_table_key(table)] = stored
+            for field in fields:
+                if field == "labels":
+                    labels = {**stored.labels, **table.labels}
+                    stored.labels = {key: value for key, value in labels.items() if value is not None}
+                else:
+                    setattr(stored, field, getattr(table, field))
+            return stored
+
+    def list_tables(self, dataset: DatasetLike, **kwargs) -> List[BQTable]:
+        """See Client.list_tables.
+        """
+        reference = _dataset_reference(dataset)
+        with self._lock:
+            names = {table_id for dataset_id, table_id in self._tables if dataset_id == reference.dataset_id}
+            prefix = reference.dataset_id + "."
+            names.update(name[len(prefix):] for (name,) in self._connection.execute(
+                "select name from sqlite_master where type = 'table' and substr(name, 1, ?) = ?",
+                (len(prefix), prefix)))
+            return [BQTable(reference.table(name)) for name in sorted(names)]
+
+    def delete_table(self, table: TableLike, not_found_ok: bool = False, **kwargs) -> None:
+        """See Client.delete_table.
+        """
+        key = _table_key(table)
+        with self._lock:
+            if not self._exists(key):
+                if not_found_ok:
+                    return
+                raise NotFound(f"Not found: Table {'.'.join(key)}")
+            self._tables.pop(key, None)
+            self._created_columns.pop(key, None)
+            self._connection.execute(f"DROP TABLE IF EXISTS {_sqlite_name(key)}")
+
+    def query(self, query: str, job_config: Optional[QueryJobConfig] = None, job_id_prefix: Optional[str] = None,
+              location: Optional[str] = None, project: Optional[str] = None, **kwargs) -> SQLiteJob:
+        """Run a query or a script, see Client.query. Statements of a script have their own child job.
+           As in BigQuery, temporary tables are dropped at the end of the script, unless it runs in a session.
+           A session is created by create_session and joined with the session_id connection property,
+           CALL BQ.ABORT_SESSION() ending it. Dry runs are validated without running the script, see _dry_run,
+           and as in BigQuery, their failure is raised at once.
+        """
+        job = self._new_job(job_id_prefix)
+        effective_config = job_config if job_config else QueryJobConfig()
+        with self._lock:
+            try:
+                job.session_info = self._session_of(effective_config)
+                if effective_config.dry_run:
+                    self._dry_run(job, query, effective_config)
+                else:
+                    self._run_script(job, query, effective_config)
+            except BadRequest as error:
+                job.error = error
+            finally:
+                if job.session_info is not None and job.session_info.session_id == self._session_id:
+                    self._session_tables = self._temp_tables()
+                self._drop_temp_tables()
+        if effective_config.dry_run and job.error is not None:
+            raise job.error
+        return job
+
+    def list_jobs(self, parent_job: Optional[Union[SQLiteJob, str]] = None, **kwargs) -> List[SQLiteJob]:
+        """See Client.list_jobs. Only child jobs of scripts are listed, most recent first.
+        """
+        parent_job_id = parent_job.job_id if isinstance(parent_job, SQLiteJob) else parent_job
+        with self._lock:
+            if parent_job_id is None:
+                return list(reversed(self._jobs.values()))
+            return list(reversed(self._jobs[parent_job_id].child_jobs))
+
+    def load_table_from_file(self, file_obj, destination: TableLike,
+                             *, job_id_prefix: Optional[str] = None,
+                             location: Optional[str] = None, project: Optional[str] = None,
+                             job_config: Optional[LoadJobConfig] = None, **kwargs) -> SQLiteJob:
+        """Load newline delimited JSON or CSV, see Client.load_table_from_file.
+           Partition decorator of the destination is ignored.
+        """
+        # Arguments mirror the ones of Client.load_table_from_file, options being keyword only.
+        # pylint: disable=R0913
+        job = self._new_job(job_id_prefix)
+        effective_config = job_config if job_config else LoadJobConfig()
+        key = _table_key(destination)
+        content = file_obj.read()
+        text = content.decode(effective_config.encoding or "utf-8") if isinstance(content, bytes) else content
+        with self._lock:
+            try:
+                self._load(key, text, effective_config)
+            except (sqlite3.Error, ValueError, KeyError) as error:
+                job.error = BadRequest(f"Error while reading data, error message: {error}")
+            except NotFound as error:
+                job.error = error
+        return job
+
+    def close(self) -> None:
+        """Close the SQLite connection.
+        """
+        self._connection.close()
+
+    def _new_job(self, job_id_prefix: Optional[str]) -> SQLiteJob:
+        job = SQLiteJob(f"{job_id_prefix or ''}{uuid.uuid4().hex}")
+        with self._lock:
+            self._jobs[job.job_id] = job
+        return job
+
+    def _session_of(self, job_config: QueryJobConfig) -> Optional[SessionInfo]:
+        session_id = next((prop.value for prop in job_config.connection_properties if prop.key == "session_id"), None)
+        if session_id is not None:
+            if session_id != self._session_id:
+                raise BadRequest(f"Session {session_id} not found or already aborted")
+            return SessionInfo({"sessionId": session_id})
+        if not job_config.create_session:
+            return None
+        if self._session_id is not None:
+            raise BadRequest(f"Session {self._session_id} is still active, a single session may be active at a time")
+        self._session_id = uuid.uuid4().hex
+        logger.debug("Session %s created.", self._session_id)
+        return SessionInfo({"sessionId": self._session_id})
+
+    def _abort_session(self) -> None:
+        logger.debug("Session %s aborted.", self._session_id)
+        self._session_id = None
+        self._session_tables = set()
+
+    def _run_script(self, job: SQLiteJob, script: str, job_config: QueryJobConfig) -> None:
+        parameters = {parameter.name: _parameter_value(parameter) for parameter in job_config.query_parameters}
+        statements = self.dialect.statements(script)
+        for step, statement in enumerate(statements):
+            destination = job_config.destination if step == len(statements) - 1 else None
+            if _ABORT_SESSION.match(statement):
+                # temporary tables of the session are dropped at the end of the script.
+                if job.session_info is not None:
+                    self._abort_session()
+                job.rows = SQLiteRowIterator([], [])
+                continue
+            try:
+                job.rows = self._execute(statement, parameters, destination, job_config)
+            except (sqlite3.Error, ValueError) as error:
+                job.error = BadRequest(f"{error} in statement {statement}")
+                return
+            if len(statements) > 1:
+                job.child_jobs.append(SQLiteJob(f"{job.job_id}_{step}", job.rows))
+
+    def _execute(self, statement: str, parameters: Dict[str, Any], destination: Optional[TableLike],
+                 job_config: QueryJobConfig) -> SQLiteRowIterator:
+        translated = self.dialect.translate(statement)
+        logger.debug("Statement translated to SQLite as :\n%s", ";\n".join(translated))
+        parameter_types = {parameter.name: _parameter_type(parameter) for parameter in job_config.query_parameters}
+        columns = self.dialect.column_types(statement, self._table_columns, parameter_types)
+        for sqlite_statement in translated[:-1]:
+            self._connection.execute(sqlite_statement, parameters)
+        if destination is not None:
+            self._write_query_result(translated[-1], parameters, _table_key(destination),
+                                     job_config.write_disposition, columns)
+            return SQLiteRowIterator([], [])
+        cursor = self._connection.execute(translated[-1], parameters)
+        created_table = self.dialect.created_table(statement)
+        if created_table is not None:
+            self._created_columns[created_table] = columns
+        if cursor.description is None:
+            return SQLiteRowIterator([], [])
+        names = [description[0] for description in cursor.description]
+        types = _declared_types(names, columns)
+        return SQLiteRowIterator([_schema_field(name, data_type) for name, data_type in zip(names, types)],
+                                 [tuple(_decode(value, data_type) for value, data_type in zip(row, types))
+                                  for row in cursor.fetchall()])
+
+    def _dry_run(self, job: SQLiteJob, script: str, job_config: QueryJobConfig) -> None:
+        """Validate a script without running it. Statements are compiled by EXPLAIN, except the ones creating
+           tables which are run within a savepoint rolled back afterwards, so that following statements compile.
+           The job has the schema of the last statement and no rows.
+        """
+        parameters = {parameter.name: _parameter_value(parameter) for parameter in job_config.query_parameters}
+        parameter_types = {parameter.name: _parameter_type(parameter) for parameter in job_config.query_parameters}
+        created_columns = dict(self._created_columns)
+        statement = ""
+        self._connection.execute("SAVEPOINT dry_run")
+        try:
+            for statement in self.dialect.statements(script):
+                if _ABORT_SESSION.match(statement):
+                    continue
+                translated = self.dialect.translate(statement)
+                columns = self.dialect.column_types(statement, self._table_columns, parameter_types)
+                created_table = self.dialect.created_table(statement)
+                for sqlite_statement in translated:
+                    self._connection.execute(sqlite_statement if created_table else f"EXPLAIN {sqlite_statement}",
+                                             parameters)
+                if created_table is not None:
+                    self._created_columns[created_table] = columns
+                job.rows = SQLiteRowIterator(self._result_schema(translated[-1], parameters, columns), [])
+        except (sqlite3.Error, ValueError) as error:
+            job.error = BadRequest(f"{error} in statement {statement}")
+        finally:
+            self._connection.execute("ROLLBACK TO dry_run")
+            self._connection.execute("RELEASE dry_run")
+            self._created_columns = created_columns
+
+    def _result_schema(self, sqlite_statement: str, parameters: Dict[str, Any],
+                       columns: Optional[List[Column]]) -> List[SchemaField]:
+        """Schema of the result of a statement, read without fetching any row."""
+        if not sqlite_statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            return []
+        cursor = self._connection.execute(f"SELECT * FROM ({sqlite_statement}) LIMIT 0", parameters)
+        names = [description[0] for description in cursor.description]
+        return [_schema_field(name, data_type) for name, data_type in zip(names, _declared_types(names, columns))]
+
+    def _write_query_result(self, select: str, parameters: Dict[str, Any], key: Tuple[str, str],
+                            write_disposition: Optional[str], columns: Optional[List[Column]]) -> None:
+        # Arguments are the ones of the query writing its result.
+        # pylint: disable=R0913
+        name = _sqlite_name(key)
+        if not self._columns(key):
+            self._connection.execute(f"CREATE TABLE {name} AS {select}", parameters)
+            self._created_columns[key] = columns
+            return
+        if write_disposition == WriteDisposition.WRITE_TRUNCATE:
+            self._connection.execute(f"DELETE FROM {name}")
+        elif write_disposition != WriteDisposition.WRITE_APPEND and self._has_rows(key):
+            raise ValueError(f"Already Exists: Table {'.'.join(key)}")
+        self._connection.execute(f"INSERT INTO {name} {select}", parameters)
+
+    def _load(self, key: Tuple[str, str], text: str, job_config: LoadJobConfig) -> None:
+        self.get_dataset(key[0])
+        table = self._tables.get(key)
+        schema = list(job_config.schema or (table.schema if table is not None else []))
+        if job_config.source_format == SourceFormat.NEWLINE_DELIMITED_JSON:
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+            if not schema and not self._columns(key):
+                schema = [SchemaField(name, "STRING") for name in dict.fromkeys(k for r in records for k in r)]
+        else:
+            records, schema = self._read_csv(key, text, job_config, schema)
+        if not self._columns(key):
+            self._create_sqlite_table(key, schema)
+            self._tables.setdefault(key, BQTable(_table_reference(".".join(key), key), schema=schema))
+        columns = [name for name, _ in self._columns(key)]
+        fields = {field.name: field for field in schema}
+        values = [tuple(_load_value(fields.get(column), record.get(column)) for column in columns)
+                  for record in records]
+        unknown = {name for record in records for name in record} - set(columns)
+        if unknown and not job_config.ignore_unknown_values:
+            raise ValueError(f"No such field: {', '.join(sorted(unknown))}.")
+        if job_config.write_disposition == WriteDisposition.WRITE_TRUNCATE:
+            self._connection.execute(f"DELETE FROM {_sqlite_name(key)}")
+        elif job_config.write_disposition == WriteDisposition.WRITE_EMPTY and self._has_rows(key):
+            raise ValueError(f"Already Exists: Table {'.'.join(key)}")
+        placeholders = ", ".join("?" for _ in columns)
+        self._connection.executemany(f"INSERT INTO {_sqlite_name(key)} VALUES ({placeholders})", values)
+
+    def _read_csv(self, key: Tuple[str, str], text: str, job_config: LoadJobConfig,
+                  schema: List[SchemaField]) -> Tuple[List[Dict[str, Any]], List[SchemaField]]:
+        quote = job_config.quote_character
+        lines = list(csv.reader(io.StringIO(text), delimiter=job_config.field_delimiter or ",",
+                                quotechar=quote if quote else '"',
+                                quoting=csv.QUOTE_NONE if quote == "" else csv.QUOTE_MINIMAL))
+        skip = job_config.skip_leading_rows or 0
+        names = [field.name for field in schema] or [name for name, _ in self._columns(key)]
+        if not names and job_config.autodetect and lines:
+            names = lines[0]
+            schema = [SchemaField(name, "STRING") for name in names]
+            skip = max(skip, 1)
+        null_marker = job_config.null_marker if job_config.null_marker is not None else ""
+        records = [{name: (None if value == null_marker else value) for name, value in zip(names, line)}
+                   for line in lines[skip:] if line]
+        return records, schema
+
+    def _create_sqlite_table(self, key: Tuple[str, str], schema: List[SchemaField]) -> None:
+        columns = ", ".join(f'"{field.name}" {_column_type(field)}' for field in schema)
+        self._connection.execute(f"CREATE TABLE {_sqlite_name(key)} ({columns})")
+
+    def _table_columns(self, names: Tuple[str, ...]) -> Optional[List[Column]]:
+        """Declared columns of a table read by a statement, see SQLiteDialect.column_types."""
+        table = self._tables.get(names)
+        if table is not None and table.schema:
+            return [(field.name, _data_type(field)) for field in table.schema]
+        return self._created_columns.get(names)
+
+    def _columns(self, key: Tuple[str, str]) -> List[Tuple[str, str]]:
+        table_info = self._connection.execute(f"PRAGMA main.table_info({_sqlite_name(key)})").fetchall()
+        return [(name, column_type.upper()) for _, name, column_type, *_ in table_info]
+
+    def _has_rows(self, key: Tuple[str, str]) -> bool:
+        return self._connection.execute(f"SELECT 1 FROM {_sqlite_name(key)} LIMIT 1").fetchone() is not None
+
+    def _exists(self, key: Tuple[str, str]) -> bool:
+        return key in self._tables or bool(self._columns(key))
+
+    def _temp_tables(self) -> Set[str]:
+        return {name for (name,) in self._connection.execute(
+            "SELECT name FROM sqlite_temp_master WHERE type = 'table'")}
+
+    def _drop_temp_tables(self) -> None:
+        """Drop temporary tables, except the ones of the active session."""
+        for name in self._temp_tables() - self._session_tables:
+            self._connection.execute(f'DROP TABLE temp."{name}"')
+            self._created_columns.pop((name,), None)
+
+    def __deepcopy__(self, memo) -> 'SQLiteClient':
+        # a client is a shared resource, copies of a resource keep using it.
+        return self
+
+
+def _dataset_reference(dataset: DatasetLike) -> DatasetReference:
+    if isinstance(dataset, (BQDataset, DatasetReference)):
+        return DatasetReference(dataset.project, dataset.dataset_id)
+    parts = dataset.split(".")
+    return DatasetReference(parts[0] if len(parts) > 1 else "sqlite", parts[-1])
+
+
+def _table_key(table: TableLike) -> Tuple[str, str]:
+    if isinstance(table, (BQTable, TableReference)):
+        return table.dataset_id, table.table_id.split("$")[0]
+    parts = table.split("$")[0].split(".")
+    return parts[-2], parts[-1]
+
+
+def _table_reference(table: TableLike, key: Tuple[str, str]) -> str:
+    project = table.project if isinstance(table, (BQTable, TableReference)) else None
+    if project is None:
+        parts = table.split(".")
+        project = parts[0] if len(parts) > 2 else "sqlite"
+    return f"{project}.{key[0]}.{key[1]}"
+
+
+def _sqlite_name(key: Tuple[str, str]) -> str:
+    return '"' + ".".join(key) + '"'
+
+
+def _column_type(field: SchemaField) -> str:
+    if field.mode and field.mode.upper() == "REPEATED":
+        return "TEXT"
+    return SQLiteDialect.sqlite_type(field.field_type)
+
+
+def _load_value(field: Optional[SchemaField], value: Any) -> Any:
+    if value is None or field is None:
+        return json.dumps(value) if isinstance(value, (dict, list)) else value
+    if (field.mode and field.mode.upper() == "REPEATED") or field.field_type.upper() in ("RECORD", "STRUCT"):
+        return json.dumps(json.loads(value) if isinstance(value, str) else value)
+    field_type = field.field_type.upper()
+    if field_type == "BYTES":
+        return base64.b64decode(value)
+    if field_type in ("BOOL", "BOOLEAN"):
+        return int(value if isinstance(value, bool) else str(value).lower() == "true")
+    return value
+
+
+def _parameter_value(parameter) -> Any:
+    if hasattr(parameter, "values"):
+        return json.dumps([_json_value(value) for value in parameter.values])
+    return _sqlite_value(parameter.value)
+
+
+def _parameter_type(parameter) -> Optional[DataType]:
+    if hasattr(parameter, "array_type"):
+        return DataType("ARRAY", element=DataType(parameter.array_type))
+    return DataType(parameter.type_) if hasattr(parameter, "type_") else None
+
+
+def _sqlite_value(value: Any) -> Any:
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _json_value(value: Any) -> Any:
+    value = _sqlite_value(value)
+    return base64.b64encode(value).decode("ascii") if isinstance(value, bytes) else value
+
+
+# Disable too many return statements since this is a dispatch of values to their type.
+# pylint: disable=R0911
+def _decode(value: Any, data_type: Optional[DataType]) -> Any:
+    """Read back a SQLite value as a value of its declared type. STRUCT and ARRAY values are stored as JSON text,
+       holding BYTES base64 encoded.
+    """
+    if value is None or data_type is None:
+        return value
+    type_name = _standard_type(data_type.name)
+    if type_name in ("STRUCT", "ARRAY") and isinstance(value, str):
+        value = json.loads(value)
+    if type_name == "ARRAY":
+        return [_decode(element, data_type.element) for element in value]
+    if type_name == "STRUCT":
+        field_types = {name.lower(): field_type for name, field_type in data_type.fields}
+        return {name: _decode(field, field_types.get(name.lower())) for name, field in value.items()}
+    if type_name == "BOOL":
+        return bool(value)
+    if type_name in ("NUMERIC", "BIGNUMERIC"):
+        return Decimal(str(value))
+    if not isinstance(value, str):
+        return value
+    if type_name == "BYTES":
+        return base64.b64decode(value)
+    if type_name == "DATE":
+        return parse_date(value)
+    if type_name == "DATETIME":
+        return parse_datetime(value)
+    if type_name == "TIME":
+        return parse_time(value)
+    if type_name == "TIMESTAMP":
+        timestamp = parse_datetime(value.replace(" UTC", "+00:00"))
+        return timestamp if timestamp.tzinfo is not None else timestamp.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _declared_types(names: List[str], columns: Optional[List[Column]]) -> List[Optional[DataType]]:
+    """Declared types of the columns of a result, None if they are unknown."""
+    if columns is not None and len(columns) == len(names):
+        return [data_type for _, data_type in columns]
+    return [None] * len(names)
+
+
+def _standard_type(type_name: str) -> str:
+    return _STANDARD_TYPES.get(type_name.upper(), type_name.upper())
+
+
+def _schema_field(name: str, data_type: Optional[DataType]) -> SchemaField:
+    """Field of a column of the given declared type, STRING if it is unknown."""
+    if data_type is None:
+        return SchemaField(name, "STRING")
+    type_name = _standard_type(data_type.name)
+    if type_name == "ARRAY":
+        element = _schema_field(name, data_type.element)
+        return SchemaField(name, element.field_type, mode="REPEATED", fields=element.fields)
+    fields = [_schema_field(field_name, field_type) for field_name, field_type in data_type.fields]
+    return SchemaField(name, _LEGACY_TYPES.get(type_name, type_name), fields=fields)
+
+
+def _data_type(field: SchemaField) -> DataType:
+    data_type = DataType(_standard_type(field.field_type),
+                         fields=tuple((nested.name, _data_type(nested)) for nested in field.fields))
+    if field.mode and field.mode.upper() == "REPEATED":
+        return DataType("ARRAY", element=data_type)
+    return data_type
+
+
+def _from_base64(value: Optional[str]) -> Optional[bytes]:
+    return None if value is None else base64.b64decode(value)
+
+
+def _to_base64(value: Optional[bytes]) -> Optional[str]:
+    return None if value is None else base64.b64encode(value).decode("ascii")
+
+
+def _concat(*values: Any) -> Optional[str]:
+    return None if any(value is None for value in values) else "".join(str(value) for value in values)
+
+
+def _starts_with(value: Optional[str], prefix: Optional[str]) -> Optional[int]:
+    return None if value is None or prefix is None else int(value.startswith(prefix))
+
+
+def _ends_with(value: Optional[str], suffix: Optional[str]) -> Optional[int]:
+    return None if value is None or suffix is None else int(value.endswith(suffix))
@@ -0,0 +1,964 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+    Translation of the BigQuery standard SQL subset generated by bq-test-kit into SQLite SQL.
+    STRUCT and ARRAY values are represented as JSON, built and read with SQLite JSON functions.
+"""
+
+import re
+from typing import (Callable, Dict, Iterator, List, NamedTuple, Optional, Set,
+                    Tuple)
+
+from bq_test_kit.sql_tokens import Token, tokenize
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "a": "\a", "0": "\0"}
+
+_SQLITE_TYPES = {
+    "INT64": "INTEGER", "INT": "INTEGER", "INTEGER": "INTEGER", "SMALLINT": "INTEGER", "BIGINT": "INTEGER",
+    "TINYINT": "INTEGER", "BYTEINT": "INTEGER", "BOOL": "INTEGER", "BOOLEAN": "INTEGER",
+    "FLOAT64": "REAL", "FLOAT": "REAL",
+    "NUMERIC": "NUMERIC", "BIGNUMERIC": "NUMERIC", "DECIMAL": "NUMERIC", "BIGDECIMAL": "NUMERIC",
+    "BYTES": "BLOB"
+}
+
+_TYPED_LITERALS = {"DATE", "DATETIME", "TIME", "TIMESTAMP", "NUMERIC", "BIGNUMERIC", "JSON"}
+
+_RENAMED_FUNCTIONS = {"ARRAY_AGG": "json_group_array", "ARRAY_LENGTH": "json_array_length", "IF": "iif"}
+
+_TABLE_KEYWORDS = {"FROM", "JOIN", "INTO", "TABLE", "UPDATE"}
+
+_CLAUSE_KEYWORDS = {"WHERE", "GROUP", "ORDER", "LIMIT", "JOIN", "LEFT", "RIGHT", "INNER", "CROSS", "FULL", "ON",
+                    "UNION", "EXCEPT", "INTERSECT", "HAVING", "WINDOW", "QUALIFY", "USING", "WITH", "AS",
+                    "SELECT", "FROM", "VALUES", "SET"}
+
+_VALUE_KEYWORDS = {"SELECT", "AS", "IN", "AND", "OR", "NOT", "WHEN", "THEN", "ELSE", "RETURN", "BY", "ON", "IS",
+                   "LIKE", "CASE", "DISTINCT", "ALL"}
+
+_SELECT_CLAUSES = {"FROM", "WHERE", "GROUP", "HAVING", "QUALIFY", "WINDOW", "ORDER", "LIMIT"}
+
+_JOIN_KEYWORDS = {"INNER", "LEFT", "RIGHT", "FULL", "CROSS", "OUTER"}
+
+_BOOL_OPERATORS = {"=", "<", ">", "<=", ">=", "!=", "<>"}
+
+_BOOL_KEYWORDS = {"AND", "OR", "NOT", "IS", "LIKE", "IN", "BETWEEN", "EXISTS"}
+
+_ARITHMETIC_OPERATORS = {"+", "-", "*", "/"}
+
+# numeric types, from the one winning over the others in arithmetic.
+_NUMERIC_TYPES = ("FLOAT64", "BIGNUMERIC", "NUMERIC", "INT64")
+
+_FUNCTION_TYPES = {
+    "COUNT": "INT64", "COUNTIF": "INT64", "ARRAY_LENGTH": "INT64", "LENGTH": "INT64", "ROW_NUMBER": "INT64",
+    "RANK": "INT64", "DENSE_RANK": "INT64", "AVG": "FLOAT64", "CONCAT": "STRING", "UPPER": "STRING",
+    "LOWER": "STRING", "TRIM": "STRING", "SUBSTR": "STRING", "REPLACE": "STRING", "FORMAT": "STRING",
+    "TO_BASE64": "STRING", "GENERATE_UUID": "STRING", "FROM_BASE64": "BYTES", "STARTS_WITH": "BOOL",
+    "ENDS_WITH": "BOOL", "CURRENT_DATE": "DATE", "CURRENT_DATETIME": "DATETIME", "CURRENT_TIME": "TIME",
+    "CURRENT_TIMESTAMP": "TIMESTAMP"
+}
+
+# functions returning the type of their first typed argument, the condition of IF being skipped.
+_ARGUMENT_TYPED_FUNCTIONS = {"SUM", "MIN", "MAX", "ANY_VALUE", "ABS", "COALESCE", "IFNULL", "NULLIF", "IF"}
+
+
+class DataType(NamedTuple):
+    """BigQuery data type, fields are set for STRUCT and element for ARRAY.
+    """
+    name: str
+    fields: Tuple[Tuple[str, 'DataType'], ...] = ()
+    element: Optional['DataType'] = None
+
+
+# name and declared type of a column, type being None when it can't be known statically, as for NULL.
+Column = Tuple[str, Optional[DataType]]
+
+# columns of a table given its names, without project, None if the table is unknown.
+TableColumns = Callable[[Tuple[str, ...]], Optional[List[Column]]]
+
+
+class SQLiteDialect():
+    """Translate BigQuery queries and scripts into SQLite statements.
+       Supported subset is the one generated by bq-test-kit : data literals, typed casts, struct(...),
+       arrays, UNNEST, array_agg, field access of structs, CREATE TEMP TABLE, INSERT INTO and DROP TABLE.
+       Tables are referred to as `project.dataset.table`, datasets being attached databases.
+    """
+
+    def statements(self, script: str) -> List[str]:
+        """Split a script into its statements, comments being removed.
+
+        Args:
+            script (str): BigQuery query or script.
+
+        Returns:
+            List[str]: BigQuery statements, in order.
+        """
+        return ["".join(token.text for token in _strip_spaces(statement_tokens))
+                for statement_tokens in _split(_without_comments(tokenize(script)), ";")
+                if _significant(statement_tokens)]
+
+    def translate(self, statement: str) -> List[str]:
+        """Translate a single statement, see statements.
+
+        Args:
+            statement (str): BigQuery statement.
+
+        Returns:
+            List[str]: SQLite statements having the same effect, in order.
+        """
+        return _Statement(tokenize(statement)).translate()
+
+    def column_types(self, statement: str, table_columns: TableColumns,
+                     parameter_types: Optional[Dict[str, Optional[DataType]]] = None) -> Optional[List[Column]]:
+        """Declared types of the columns returned or created by a statement, read from casts, typed literals,
+           typed structs and arrays, columns of the tables read and operators or functions applied.
+           SQLite values being dynamically typed, they are read back with these types.
+
+        Args:
+            statement (str): BigQuery statement.
+            table_columns (TableColumns): columns of the tables read by the statement.
+            parameter_types (Optional[Dict[str, Optional[DataType]]], optional): types of query parameters,
+              by name. Defaults to None.
+
+        Returns:
+            Optional[List[Column]]: columns in the order of the SQLite result, empty if the statement returns
+              nothing and None if their number can't be known, as for select * of an unknown table.
+        """
+        return _Statement(tokenize(statement)).column_types(_ColumnTypes(table_columns, parameter_types or {}))
+
+    def created_table(self, statement: str) -> Optional[Tuple[str, ...]]:
+        """
+        Args:
+            statement (str): BigQuery statement.
+
+        Returns:
+            Optional[Tuple[str, ...]]: dataset and name of the table created by the statement, name only for
+              temporary tables, None if the statement doesn't create a table.
+        """
+        return _Statement(tokenize(statement)).created_table()
+
+    @staticmethod
+    def sqlite_type(data_type: str) -> str:
+        """
+        Args:
+            data_type (str): BigQuery scalar type or schema field type.
+
+        Returns:
+            str: SQLite column affinity of the type, TEXT for types stored as text or JSON.
+        """
+        return _SQLITE_TYPES.get(data_type.upper(), "TEXT")
+
+
+class _Statement():
+    """Translation of a single statement. Names used as tables are collected first,
+       so that any other dotted path is read as field access of a struct.
+    """
+
+    def __init__(self, tokens: List[Token]) -> None:
+        self.tokens = _strip_spaces(tokens)
+        self.tables = _table_names(self.tokens)
+
+    def translate(self) -> List[str]:
+        """
+        Returns:
+            List[str]: SQLite statements having the same effect as the statement.
+        """
+        tokens = _without_or_replace(self.tokens)
+        prefix = []
+        if tokens is not self.tokens:
+            significant = _significant(tokens)
+            i = 1
+            while significant[i].is_word("TEMP", "TEMPORARY"):
+                i += 1
+            name_start = _position(tokens, significant[i + 1])
+            name = _table_reference(tokens[name_start:_path_end(tokens, name_start)])
+            prefix = [f"DROP {significant[i].text.upper()} IF EXISTS {name}"]
+        columns = _column_definitions_start(tokens)
+        if columns is not None:
+            return prefix + [self._create_table(tokens, columns)]
+        return prefix + [self.render(_unwrap_select(tokens))]
+
+    def column_types(self, column_types: '_ColumnTypes') -> Optional[List[Column]]:
+        """See SQLiteDialect.column_types."""
+        tokens = _significant(_without_or_replace(self.tokens))
+        if not tokens:
+            return []
+        columns = _column_definitions_start(tokens)
+        if columns is not None:
+            return [(_unquote(definition[0].text), _parse_type(definition, 1)[0])
+                    for definition in _split(tokens[columns + 1:_close(tokens, columns)], ",")]
+        if tokens[0].is_word("CREATE"):
+            as_index = next((i for i in _top_level(tokens) if tokens[i].is_word("AS")), None)
+            return None if as_index is None else column_types.query(tokens[as_index + 1:], [])
+        if tokens[0].is_word("SELECT", "WITH") or tokens[0].text == "(":
+            return column_types.query(tokens, [])
+        return []
+
+    def created_table(self) -> Optional[Tuple[str, ...]]:
+        """See SQLiteDialect.created_table."""
+        significant = _significant(_without_or_replace(self.tokens))
+        i = 1
+        while i < len(significant) and significant[i].is_word("TEMP", "TEMPORARY"):
+            i += 1
+        if not (significant and significant[0].is_word("CREATE") and i < len(significant)
+                and significant[i].is_word("TABLE")):
+            return None
+        i += 1
+        while i < len(significant) and significant[i].is_word("IF", "NOT", "EXISTS"):
+            i += 1
+        return tuple(_names(significant[i:_path_end(significant, i)])[-2:])
+
+    def _create_table(self, tokens: List[Token], columns: int) -> str:
+        """Column types are translated, partitioning, clustering and options are dropped."""
+        definitions = []
+        for definition in _split(tokens[columns + 1:_close(tokens, columns)], ","):
+            significant = _significant(definition)
+            data_type, _ = _parse_type(definition, _position(definition, significant[1]))
+            not_null = any(token.is_word("NOT") and following.is_word("NULL")
+                           for token, following in zip(significant, significant[1:]))
+            definitions.append(f'"{_unquote(significant[0].text)}" {SQLiteDialect.sqlite_type(data_type.name)}'
+                               f'{" NOT NULL" if not_null else ""}')
+        return self.render(tokens[:columns]) + "(" + ", ".join(definitions) + ")"
+
+    # Disable too many branches and statements since this is a dispatch of tokens to their translation.
+    # pylint: disable=R0912,R0915
+    def render(self, tokens: List[Token]) -> str:
+        """
+        Args:
+            tokens (List[Token]): tokens of an expression or of a statement.
+
+        Returns:
+            str: SQLite translation of the tokens.
+        """
+        output = []
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            following = _next_significant(tokens, i)
+            following_text = tokens[following].text if following is not None else None
+            if token.kind in ("word", "quoted") and _is_table_position(tokens, i):
+                end = _path_end(tokens, i)
+                output.append(_table_reference(tokens[i:end]))
+                if _needs_alias(tokens, i, end):
+                    output.append(f' AS "{_names(tokens[i:end])[-1]}"')
+                i = end
+                continue
+            if token.kind == "word":
+                upper = token.text.upper()
+                if upper in ("CAST", "SAFE_CAST") and following_text == "(":
+                    end = _close(tokens, following)
+                    output.append(self._cast(tokens[following + 1:end]))
+                    i = end + 1
+                    continue
+                if upper == "STRUCT" and following_text in ("(", "<"):
+                    data_type = None
+                    if following_text == "<":
+                        data_type, after_type = _parse_type(tokens, i)
+                        following = _next_significant(tokens, after_type - 1)
+                    end = _close(tokens, following)
+                    output.append(self._struct(_split(tokens[following + 1:end], ","), data_type))
+                    i = end + 1
+                    continue
+                if upper == "ARRAY" and following_text == "<":
+                    data_type, after_type = _parse_type(tokens, i)
+                    bracket = _next_significant(tokens, after_type - 1)
+                    end = _close(tokens, bracket)
+                    output.append(self._typed_value(tokens[bracket:end + 1], data_type))
+                    i = end + 1
+                    continue
+                if upper == "UNNEST" and following_text == "(":
+                    end = _close(tokens, following)
+                    output.append(self._unnest(tokens[following + 1:end], tokens, end))
+                    i = end + 1
+                    continue
+                if upper in _TYPED_LITERALS and following is not None and tokens[following].kind == "string":
+                    i = following
+                    continue
+                if upper in ("UNION", "EXCEPT", "INTERSECT") and following is not None \
+                        and tokens[following].is_word("DISTINCT"):
+                    output.append(token.text)
+                    i = following + 1
+                    continue
+                if upper in _RENAMED_FUNCTIONS and following_text == "(":
+                    output.append(_RENAMED_FUNCTIONS[upper])
+                    i += 1
+                    continue
+                path_end = _path_end(tokens, i)
+                if path_end > i + 1:
+                    output.append(self._path(tokens, i, path_end))
+                    i = path_end
+                    continue
+                output.append(token.text)
+            elif token.kind == "quoted":
+                output.append(".".join(f'"{name}"' for name in _names([token])))
+            elif token.kind == "string":
+                output.append(_string(token.text))
+            elif token.text == "[" and not _is_subscript(tokens, i):
+                end = _close(tokens, i)
+                output.append(self._typed_value(tokens[i:end + 1], None))
+                i = end + 1
+                continue
+            else:
+                output.append(token.text)
+            i += 1
+        return "".join(output)
+
+    def _path(self, tokens: List[Token], start: int, end: int) -> str:
+        """Dotted path of a column followed by field access of structs."""
+        if end < len(tokens) and tokens[end].text == "(":
+            return "".join(token.text for token in tokens[start:end])
+        names = [_unquote(token.text) for token in tokens[start:end] if token.text != "."]
+        column_length = 2 if names[0].lower() in self.tables else 1
+        if len(names) == column_length:
+            return "".join(token.text for token in tokens[start:end])
+        path = ".".join(f'"{name}"' for name in names[column_length:])
+        return f"json_extract({'.'.join(names[:column_length])}, '$.{path}')"
+
+    def _cast(self, tokens: List[Token]) -> str:
+        depth = 0
+        as_index = None
+        for i, token in enumerate(tokens):
+            if token.text in ("(", "["):
+                depth += 1
+            elif token.text in (")", "]"):
+                depth -= 1
+            elif depth == 0 and token.is_word("AS"):
+                as_index = i
+        data_type, _ = _parse_type(tokens, _next_significant(tokens, as_index))
+        expression = self.render(tokens[:as_index]).strip()
+        if data_type.name in ("STRUCT", "ARRAY"):
+            return f"json({expression})"
+        return f"cast({expression} as {SQLiteDialect.sqlite_type(data_type.name)})"
+
+    def _struct(self, arguments: List[List[Token]], data_type: Optional[DataType]) -> str:
+        members = []
+        for position, argument in enumerate(arguments):
+            significant = _significant(argument)
+            if not significant:
+                continue
+            if data_type is not None and position < len(data_type.fields):
+                name, field_type = data_type.fields[position]
+                value = self._typed_value(argument, field_type)
+            elif len(significant) > 2 and significant[-2].is_word("AS"):
+                name = _unquote(significant[-1].text)
+                value = self._typed_value(argument[:_position(argument, significant[-2])], None)
+            else:
+                name = (_unquote(significant[-1].text) if significant[-1].kind in ("word", "quoted")
+                        else f"_field_{position + 1}")
+                value = self._typed_value(argument, None)
+            members.append(f"'{name}', {value}")
+        return f"json_object({', '.join(members)})"
+
+    def _typed_value(self, tokens: List[Token], data_type: Optional[DataType]) -> str:
+        """Translate a value held by a struct or an array, using its data type to name positional fields of structs.
+           JSON can't hold bytes, they are kept base64 encoded as in BigQuery JSON representation of rows.
+        """
+        significant = _significant(tokens)
+        if not significant:
+            return ""
+        first = significant[0]
+        if first.is_word("FROM_BASE64") and len(significant) == 4 and significant[2].kind == "string":
+            return _string(significant[2].text)
+        start = _position(tokens, first)
+        end = _close(tokens, start) if first.text in ("(", "[") else None
+        whole = end is not None and tokens[end] is significant[-1]
+        if first.text == "[" and whole:
+            element_type = data_type.element if data_type is not None else None
+            elements = [self._typed_value(element, element_type) for element in _split(tokens[start + 1:end], ",")]
+            return f"json_array({', '.join(element for element in elements if element)})"
+        if data_type is not None and data_type.name == "STRUCT":
+            if first.text == "(" and whole:
+                return self._struct(_split(tokens[start + 1:end], ","), data_type)
+            if first.is_word("STRUCT") and len(significant) > 1 and significant[1].text == "(":
+                struct_start = _position(tokens, significant[1])
+                return self._struct(_split(tokens[struct_start + 1:_close(tokens, struct_start)], ","), data_type)
+        return self.render(tokens).strip()
+
+    def _unnest(self, inner: List[Token], tokens: List[Token], end: int) -> str:
+        element_type = _unnest_element_type(inner)
+        array = self.render(inner).strip()
+        if element_type is not None and element_type.name == "STRUCT":
+            columns = ", ".join(_extracted_column(name, field_type) for name, field_type in element_type.fields)
+            return f"(select {columns} from json_each({array}))"
+        alias = _alias_after(tokens, end) or "value"
+        return f"(select value as \"{alias}\" from json_each({array}))"
+
+
+# a table of a FROM clause : its alias, if it can be used to qualify its columns, and its columns.
+_Source = Tuple[Optional[str], Optional[List[Column]]]
+
+
+class _ColumnTypes():
+    """Declared types of the columns of a query, tokens being significant ones.
+       Sources are the tables of the FROM clauses in scope, the innermost first.
+    """
+
+    def __init__(self, table_columns: TableColumns, parameter_types: Dict[str, Optional[DataType]]) -> None:
+        self.table_columns = table_columns
+        self.parameter_types = parameter_types
+        self.ctes: Dict[str, Optional[List[Column]]] = {}
+
+    def query(self, tokens: List[Token], outer: List[_Source]) -> Optional[List[Column]]:
+        """
+        Returns:
+            Optional[List[Column]]: columns of the query, None if their number can't be known.
+              Unknown types of a set operation are the ones of its following queries.
+        """
+        if tokens and tokens[0].is_word("WITH"):
+            tokens = self._with(tokens, outer)
+        columns: Optional[List[Column]] = None
+        for position, part in enumerate(_split_top_level(tokens, _is_set_operation)):
+            if part and part[0].is_word("ALL", "DISTINCT"):
+                part = part[1:]
+            if part and part[0].text == "(":
+                part_columns = self.query(part[1:_close(part, 0)], outer)
+            else:
+                part_columns = self.select(part, outer)
+            if position == 0 or columns is None:
+                columns = part_columns
+            elif part_columns is not None:
+                columns = [(name, data_type if data_type is not None else other)
+                           for (name, data_type), (_, other) in zip(columns, part_columns)]
+        return columns
+
+    def select(self, tokens: List[Token], outer: List[_Source]) -> Optional[List[Column]]:
+        """See query, tokens being the ones of a single SELECT."""
+        if not tokens or not tokens[0].is_word("SELECT"):
+            return None
+        clauses = [i for i in _top_level(tokens) if tokens[i].is_word(*_SELECT_CLAUSES)]
+        local: List[_Source] = []
+        if clauses and tokens[clauses[0]].is_word("FROM"):
+            from_end = clauses[1] if len(clauses) > 1 else len(tokens)
+            for item in _split_top_level(tokens[clauses[0] + 1:from_end], _is_from_separator):
+                while item and item[-1].is_word(*_JOIN_KEYWORDS):
+                    item = item[:-1]
+                condition = next((i for i in _top_level(item) if item[i].is_word("ON", "USING")), len(item))
+                local.append(self._source(item[:condition], local + outer))
+        start = 1
+        while start < len(tokens) and tokens[start].is_word("DISTINCT", "ALL"):
+            start += 1
+        columns = []
+        for item in _split(tokens[start:clauses[0] if clauses else len(tokens)], ","):
+            item_columns = self._item(item, local, local + outer)
+            if item_columns is None:
+                return None
+            columns.extend(item_columns)
+        return columns
+
+    def expression(self, tokens: List[Token], sources: List[_Source]) -> Optional[DataType]:
+        """
+        Returns:
+            Optional[DataType]: type of the expression, None if it can't be known.
+        """
+        if not tokens:
+            return None
+        top_level = list(_top_level(tokens))
+        if any(_is_bool_operator(tokens, i) for i in top_level):
+            return DataType("BOOL")
+        if any(tokens[i].text == "||" for i in top_level):
+            return DataType("STRING")
+        operators = [i for i in top_level if i > 0 and tokens[i].text in _ARITHMETIC_OPERATORS]
+        if not operators:
+            return self._primary(tokens, sources)
+        bounds = [-1] + operators + [len(tokens)]
+        operand_types = [self.expression(tokens[start + 1:end], sources) for start, end in zip(bounds, bounds[1:])]
+        names = {data_type.name for data_type in operand_types if data_type is not None}
+        if any(tokens[i].text == "/" for i in operators) and not names & {"NUMERIC", "BIGNUMERIC"}:
+            return DataType("FLOAT64")
+        return next((DataType(name) for name in _NUMERIC_TYPES if name in names),
+                    next((data_type for data_type in operand_types if data_type is not None), None))
+
+    def _with(self, tokens: List[Token], outer: List[_Source]) -> List[Token]:
+        """Register columns of common table expressions and return the tokens of the query using them."""
+        i = 2 if tokens[1].is_word("RECURSIVE") else 1
+        while i + 2 < len(tokens) and tokens[i + 1].is_word("AS") and tokens[i + 2].text == "(":
+            end = _close(tokens, i + 2)
+            self.ctes[_unquote(tokens[i].text).lower()] = self.query(tokens[i + 3:end], outer)
+            i = end + 2 if end + 1 < len(tokens) and tokens[end + 1].text == "," else end + 1
+        return tokens[i:]
+
+    def _source(self, item: List[Token], scope: List[_Source]) -> _Source:
+        if not item:
+            return None, None
+        if item[0].text == "(":
+            end = _close(item, 0)
+            return _alias_after(item, end), self.query(item[1:end], scope)
+        if item[0].is_word("UNNEST") and len(item) > 1 and item[1].text == "(":
+            end = _close(item, 1)
+            alias = _alias_after(item, end)
+            declared = _unnest_element_type(item[2:end])
+            if declared is not None and declared.name == "STRUCT":
+                # translated as columns, see _Statement._unnest
+                return alias, list(declared.fields)
+            array_type = self.expression(item[2:end], scope)
+            element_type = array_type.element if array_type is not None and array_type.name == "ARRAY" else None
+            return None, [(alias or "value", element_type)]
+        end = _path_end(item, 0)
+        names = _names(item[:end])
+        alias = _alias_after(item, end - 1) or names[-1]
+        if len(names) == 1 and names[0].lower() in self.ctes:
+            return alias, self.ctes[names[0].lower()]
+        return alias, self.table_columns(tuple(names[-2:]))
+
+    def _item(self, item: List[Token], local: List[_Source], sources: List[_Source]) -> Optional[List[Column]]:
+        """Columns of an item of a select list, a star expanding into several ones."""
+        if item and item[0].text == "*":
+            if any(columns is None for _, columns in local):
+                return None
+            columns = [column for _, source_columns in local for column in source_columns]
+            if len(item) > 2 and item[1].is_word("EXCEPT"):
+                excluded = {_unquote(token.text).lower() for token in item[3:-1] if token.text != ","}
+                columns = [column for column in columns if column[0].lower() not in excluded]
+            return columns
+        if len(item) > 2 and item[-1].text == "*" and item[-2].text == ".":
+            names = _names(item[:-2])
+            aliased = _aliased(sources, names[0])
+            if len(names) == 1 and aliased:
+                return aliased[0]
+            data_type = _path_type(names, sources)
+            return list(data_type.fields) if data_type is not None and data_type.name == "STRUCT" else None
+        name, expression = _item_alias(item)
+        return [(name, self.expression(expression, sources))]
+
+    # Disable too many return statements since this is a dispatch of expressions to their type.
+    # pylint: disable=R0911,R0912
+    def _primary(self, tokens: List[Token], sources: List[_Source]) -> Optional[DataType]:
+        """Type of an expression without operators."""
+        first = tokens[0]
+        following = tokens[1].text if len(tokens) > 1 else None
+        if tokens[-1].text == "]":
+            start = [i for i in _top_level(tokens) if tokens[i].text == "["][-1]
+            if start > 0 and _is_subscript(tokens, start):
+                array_type = self.expression(tokens[:start], sources)
+                return array_type.element if array_type is not None and array_type.name == "ARRAY" else None
+        if first.kind == "number":
+            return DataType("FLOAT64" if any(char in first.text for char in ".eE") else "INT64")
+        if first.kind == "string":
+            return DataType("BYTES" if "B" in re.match(r"[rRbB]*", first.text).group().upper() else "STRING")
+        if first.kind == "param":
+            return self.parameter_types.get(first.text[1:])
+        if first.is_word("TRUE", "FALSE"):
+            return DataType("BOOL")
+        if first.is_word(*_TYPED_LITERALS) and len(tokens) > 1 and tokens[1].kind == "string":
+            return DataType(first.text.upper())
+        if first.is_word("STRUCT", "ARRAY") and following == "<":
+            return _parse_type(tokens, 0)[0]
+        if first.is_word("CASE"):
+            return self._case(tokens[1:-1], sources)
+        if first.text in ("(", "["):
+            end = _close(tokens, 0)
+            inner = tokens[1:end]
+            if first.text == "[":
+                element_types = (self.expression(element, sources) for element in _split(inner, ","))
+                return DataType("ARRAY", element=next((t for t in element_types if t is not None), None))
+            if inner and inner[0].is_word("SELECT", "WITH"):
+                columns = self.query(inner, sources)
+                return columns[0][1] if columns else None
+            arguments = _split(inner, ",")
+            return self.expression(inner, sources) if len(arguments) == 1 else self._struct(arguments, sources)
+        if first.kind == "word" and following == "(":
+            return self._function(first.text.upper(), tokens[2:_close(tokens, 1)], sources)
+        if first.kind in ("word", "quoted") and _path_end(tokens, 0) == len(tokens):
+            return _path_type(_names(tokens), sources)
+        return None
+
+    def _function(self, name: str, arguments: List[Token], sources: List[_Source]) -> Optional[DataType]:
+        if name in ("CAST", "SAFE_CAST"):
+            as_index = [i for i in _top_level(arguments) if arguments[i].is_word("AS")][-1]
+            return _parse_type(arguments, as_index + 1)[0]
+        if name == "STRUCT":
+            return self._struct(_split(arguments, ","), sources)
+        if name == "ARRAY":
+            columns = self.query(arguments, sources)
+            return DataType("ARRAY", element=columns[0][1] if columns else None)
+        if name in _FUNCTION_TYPES:
+            return DataType(_FUNCTION_TYPES[name])
+        if name == "ARRAY_AGG":
+            return DataType("ARRAY", element=self.expression(_aggregated(arguments), sources))
+        if name in _ARGUMENT_TYPED_FUNCTIONS:
+            typed_arguments = _split(arguments, ",")[1:] if name == "IF" else _split(arguments, ",")
+            argument_types = (self.expression(_aggregated(argument), sources) for argument in typed_arguments)
+            return next((data_type for data_type in argument_types if data_type is not None), None)
+        return None
+
+    def _struct(self, arguments: List[List[Token]], sources: List[_Source]) -> DataType:
+        """Fields are named as in _Statement._struct."""
+        fields = []
+        for position, argument in enumerate(arguments):
+            if argument:
+                name, expression = _item_alias(argument)
+                fields.append((name or f"_field_{position + 1}", self.expression(expression, sources)))
+        return DataType("STRUCT", fields=tuple(fields))
+
+    def _case(self, inner: List[Token], sources: List[_Source]) -> Optional[DataType]:
+        """Type of the first typed result of a CASE expression."""
+        marks = [i for i in _top_level(inner) if inner[i].is_word("WHEN", "THEN", "ELSE")] + [len(inner)]
+        result_types = (self.expression(inner[start + 1:end], sources)
+                        for start, end in zip(marks, marks[1:]) if inner[start].is_word("THEN", "ELSE"))
+        return next((data_type for data_type in result_types if data_type is not None), None)
+
+
+def _table_names(tokens: List[Token]) -> Set[str]:
+    """Names and aliases of tables of the statement, lower cased.
+       Aliases of UNNEST are values, unless elements are typed structs which are expanded as columns.
+    """
+    tables = set()
+    significant = _significant(tokens)
+    i = 0
+    while i < len(significant):
+        token = significant[i]
+        if not (token.is_word(*_TABLE_KEYWORDS) or (token.text == "," and _in_from(significant, i))):
+            i += 1
+            continue
+        i += 1
+        while i < len(significant) and significant[i].is_word("IF", "NOT", "EXISTS"):
+            i += 1
+        if i >= len(significant):
+            break
+        item = significant[i]
+        value_alias = False
+        if item.text == "(" or (item.is_word("UNNEST") and i + 1 < len(significant)):
+            paren = i if item.text == "(" else i + 1
+            if item.is_word("UNNEST"):
+                element_type = _unnest_element_type(significant[paren + 1:_close(significant, paren)])
+                value_alias = element_type is None or element_type.name != "STRUCT"
+            i = _close(significant, paren) + 1
+        elif item.kind in ("word", "quoted"):
+            end = _path_end(significant, i)
+            tables.add(_names(significant[i:end])[-1].lower())
+            i = end
+        alias = _alias_after(significant, i - 1)
+        if alias is not None and not value_alias:
+            tables.add(alias.lower())
+    return tables
+
+
+def _in_from(significant: List[Token], index: int) -> bool:
+    """True if the comma at index separates items of a FROM clause."""
+    depth = 0
+    for i in range(index - 1, -1, -1):
+        token = significant[i]
+        if token.text in (")", "]"):
+            depth += 1
+        elif token.text in ("(", "["):
+            if depth == 0:
+                return False
+            depth -= 1
+        elif depth == 0 and token.kind == "word" and token.text.upper() in _CLAUSE_KEYWORDS:
+            return token.is_word("FROM", "JOIN")
+    return False
+
+
+def _alias_after(tokens: List[Token], end: int) -> Optional[str]:
+    following = _next_significant(tokens, end)
+    if following is not None and tokens[following].is_word("AS"):
+        following = _next_significant(tokens, following)
+    if following is not None and tokens[following].kind in ("word", "quoted") \
+            and tokens[following].text.upper() not in _CLAUSE_KEYWORDS:
+        return _unquote(tokens[following].text)
+    return None
+
+
+def _unnest_element_type(inner: List[Token]) -> Optional[DataType]:
+    significant = _significant(inner)
+    if len(significant) > 1 and significant[0].is_word("ARRAY") and significant[1].text == "<":
+        return _parse_type(inner, _position(inner, significant[0]))[0].element
+    return None
+
+
+def _without_or_replace(tokens: List[Token]) -> List[Token]:
+    """CREATE OR REPLACE statement without OR REPLACE, other statements being returned as is."""
+    significant = _significant(tokens)
+    if len(significant) > 4 and [t.text.upper() for t in significant[:3]] == ["CREATE", "OR", "REPLACE"]:
+        return [Token("word", "CREATE"), Token("space", " ")] + tokens[_position(tokens, significant[3]):]
+    return tokens
+
+
+def _column_definitions_start(tokens: List[Token]) -> Optional[int]:
+    """Index of the parenthesis opening column definitions of a CREATE TABLE statement, if any."""
+    significant = _significant(tokens)
+    i = 1
+    while i < len(significant) and significant[i].is_word("TEMP", "TEMPORARY"):
+        i += 1
+    if not (significant[0].is_word("CREATE") and i < len(significant) and significant[i].is_word("TABLE")):
+        return None
+    i += 1
+    while i < len(significant) and significant[i].is_word("IF", "NOT", "EXISTS"):
+        i += 1
+    i += 1
+    while i + 1 < len(significant) and significant[i].text == ".":
+        i += 2
+    if i + 1 < len(significant) and significant[i].text == "(" and not significant[i + 1].is_word("SELECT", "WITH"):
+        return _position(tokens, significant[i])
+    return None
+
+
+def _unwrap_select(tokens: List[Token]) -> List[Token]:
+    """SQLite doesn't allow parenthesized select statements, they are unwrapped when they are the query,
+       the source of CREATE TABLE ... AS or of INSERT INTO.
+    """
+    significant = _significant(tokens)
+    for i, token in enumerate(significant):
+        if token.text != "(":
+            continue
+        after_as = i > 0 and significant[i - 1].is_word("AS") and significant[0].is_word("CREATE")
+        after_insert = i == 3 and significant[0].is_word("INSERT") and significant[1].is_word("INTO")
+        if i == 0 or after_as or after_insert:
+            start = _position(tokens, token)
+            end = _close(tokens, start)
+            inner = _significant(tokens[start + 1:end])
+            if end == len(tokens) - 1 and inner and inner[0].is_word("SELECT", "WITH"):
+                return tokens[:start] + _unwrap_select(tokens[start + 1:end])
+        break
+    return tokens
+
+
+def _parse_type(tokens: List[Token], start: int) -> Tuple[DataType, int]:
+    """Parse a data type starting at the given token index.
+
+    Returns:
+        Tuple[DataType, int]: data type and the index of the token following it.
+    """
+    name = tokens[start].text.upper()
+    following = _next_significant(tokens, start)
+    if name not in ("STRUCT", "ARRAY") or following is None or tokens[following].text != "<":
+        if following is not None and tokens[following].text == "(" and name not in ("STRUCT", "ARRAY"):
+            # parameterized types such as STRING(10) or NUMERIC(10, 2)
+            return DataType(name), _close(tokens, following) + 1
+        return DataType(name), start + 1
+    end = _close(tokens, following)
+    if name == "ARRAY":
+        element_start = _next_significant(tokens, following)
+        return DataType(name, element=_parse_type(tokens, element_start)[0]), end + 1
+    fields = []
+    for field_tokens in _split(tokens[following + 1:end], ","):
+        significant = _significant(field_tokens)
+        if len(significant) == 1:
+            field_name, type_index = f"_field_{len(fields) + 1}", _position(field_tokens, significant[0])
+        else:
+            field_name, type_index = _unquote(significant[0].text), _position(field_tokens, significant[1])
+        fields.append((field_name, _parse_type(field_tokens, type_index)[0]))
+    return DataType(name, fields=tuple(fields)), end + 1
+
+
+def _path_type(names: List[str], sources: List[_Source]) -> Optional[DataType]:
+    """Type of a column, qualified or not by its table, followed by field access of structs."""
+    aliased = _aliased(sources, names[0])
+    if len(names) > 1 and aliased:
+        data_type, fields = _column_type(aliased[0], names[1]), names[2:]
+    else:
+        data_type = next((_column_type(columns, names[0]) for _, columns in sources
+                          if any(name.lower() == names[0].lower() for name, _ in columns or [])), None)
+        fields = names[1:]
+    for field in fields:
+        data_type = _column_type(list(data_type.fields), field) if data_type is not None \
+            and data_type.name == "STRUCT" else None
+    return data_type
+
+
+def _aliased(sources: List[_Source], alias: str) -> List[Optional[List[Column]]]:
+    """Columns of the sources having the given alias."""
+    return [columns for name, columns in sources if name is not None and name.lower() == alias.lower()]
+
+
+def _column_type(columns: Optional[List[Column]], name: str) -> Optional[DataType]:
+    return next((data_type for column, data_type in columns or [] if column.lower() == name.lower()), None)
+
+
+def _item_alias(item: List[Token]) -> Tuple[str, List[Token]]:
+    """Name of an item of a select list or of a struct, empty if it has to be generated, and its expression."""
+    if len(item) > 2 and item[-2].is_word("AS"):
+        return _unquote(item[-1].text), item[:-2]
+    if len(item) > 1 and item[-1].kind in ("word", "quoted") and not item[-1].is_word("END", "NULL", "TRUE", "FALSE") \
+            and not _is_operator(item[-2]):
+        return _unquote(item[-1].text), item[:-1]
+    if item and item[0].kind in ("word", "quoted") and _path_end(item, 0) == len(item):
+        return _names(item)[-1], item
+    return "", item
+
+
+def _aggregated(argument: List[Token]) -> List[Token]:
+    """Expression of an aggregate function argument, without DISTINCT nor its modifiers."""
+    start = 1 if argument and argument[0].is_word("DISTINCT") else 0
+    end = next((i for i in _top_level(argument) if argument[i].is_word("IGNORE", "RESPECT", "ORDER", "LIMIT")),
+               len(argument))
+    return argument[start:end]
+
+
+def _is_operator(token: Token) -> bool:
+    if token.kind == "word":
+        return token.text.upper() in _VALUE_KEYWORDS
+    return token.kind == "op" and token.text not in (")", "]")
+
+
+def _is_set_operation(tokens: List[Token], index: int) -> bool:
+    # EXCEPT of SELECT * EXCEPT (...) is followed by a parenthesis.
+    return tokens[index].is_word("UNION", "INTERSECT", "EXCEPT") and index + 1 < len(tokens) \
+        and tokens[index + 1].is_word("ALL", "DISTINCT")
+
+
+def _is_from_separator(tokens: List[Token], index: int) -> bool:
+    return tokens[index].text == "," or tokens[index].is_word("JOIN")
+
+
+def _is_bool_operator(tokens: List[Token], index: int) -> bool:
+    token = tokens[index]
+    if token.kind == "word":
+        return token.text.upper() in _BOOL_KEYWORDS
+    return token.text in _BOOL_OPERATORS and not (token.text == "<" and _opens_type(tokens, index))
+
+
+def _extracted_column(name: str, data_type: DataType) -> str:
+    column = f"json_extract(value, '$.\"{name}\"')"
+    if data_type.name == "BYTES":
+        column = f"from_base64({column})"
+    return f"{column} as \"{name}\""
+
+
+def _path_end(tokens: List[Token], start: int) -> int:
+    end = start + 1
+    while end + 1 < len(tokens) and tokens[end].text == "." and tokens[end + 1].kind in ("word", "quoted"):
+        end += 2
+    return end
+
+
+def _string(text: str) -> str:
+    prefix = re.match(r"[rRbB]*", text).group().upper()
+    body = text[len(prefix):]
+    quote_length = 3 if body[:3] in ("'''", '"""') else 1
+    content = body[quote_length:-quote_length]
+    if "R" not in prefix:
+        content = re.sub(r"\\(.)", lambda match: _ESCAPES.get(match.group(1), match.group(1)), content,
+                         flags=re.DOTALL)
+    if "B" in prefix:
+        return f"X'{content.encode('utf-8').hex()}'"
+    return "'" + content.replace("'", "''") + "'"
+
+
+def _is_table_position(tokens: List[Token], index: int) -> bool:
+    previous = _previous_significant(tokens, index)
+    if tokens[index].is_word("IF", "SELECT", "WITH") or previous is None:
+        return False
+    if previous.is_word("INTO", "TABLE", "UPDATE", "EXISTS"):
+        return True
+    if not (previous.is_word("FROM", "JOIN") or
+            (previous.text == "," and _in_from(tokens, _position(tokens, previous)))):
+        return False
+    # table functions such as UNNEST
+    following = _next_significant(tokens, _path_end(tokens, index) - 1)
+    return following is None or tokens[following].text != "("
+
+
+def _table_reference(tokens: List[Token]) -> str:
+    # project is dropped and datasets are part of table names since SQLite can only attach a few databases.
+    return '"' + ".".join(_names(tokens)[-2:]) + '"'
+
+
+def _needs_alias(tokens: List[Token], start: int, end: int) -> bool:
+    """Tables qualified by their dataset are referred to by their name, as in BigQuery, unless aliased."""
+    previous = _previous_significant(tokens, start)
+    return (len(_names(tokens[start:end])) > 1 and not previous.is_word("INTO", "TABLE", "UPDATE", "EXISTS")
+            and _alias_after(tokens, end - 1) is None)
+
+
+def _names(tokens: List[Token]) -> List[str]:
+    return [name for token in tokens if token.text != "." for name in _unquote(token.text).split(".")]
+
+
+def _unquote(text: str) -> str:
+    return text[1:-1] if text.startswith("`") else text
+
+
+def _is_subscript(tokens: List[Token], index: int) -> bool:
+    previous = _previous_significant(tokens, index)
+    return previous is not None and (previous.text in (")", "]") or previous.kind == "quoted" or
+                                     (previous.kind == "word" and previous.text.upper() not in _VALUE_KEYWORDS))
+
+
+def _close(tokens: List[Token], start: int) -> int:
+    """Index of the token closing the bracket at start. '<' are brackets only after ARRAY or STRUCT."""
+    stack = []
+    for i in range(start, len(tokens)):
+        text = tokens[i].text
+        if text in ("(", "[") or (text == "<" and _opens_type(tokens, i)):
+            stack.append(text)
+        elif text in (")", "]") or (text == ">" and stack and stack[-1] == "<"):
+            stack.pop()
+            if not stack:
+                return i
+    raise ValueError(f"Unbalanced brackets in {''.join(token.text for token in tokens[start:])}")
+
+
+def _top_level(tokens: List[Token]) -> Iterator[int]:
+    """Indices of tokens outside of brackets and of CASE expressions, opening tokens included."""
+    stack = []
+    for i, token in enumerate(tokens):
+        if token.text in (")", "]") or token.is_word("END") or (token.text == ">" and stack and stack[-1] == "<"):
+            if stack:
+                stack.pop()
+            continue
+        if not stack:
+            yield i
+        if token.text in ("(", "[") or token.is_word("CASE") or (token.text == "<" and _opens_type(tokens, i)):
+            stack.append(token.text)
+
+
+def _split_top_level(tokens: List[Token], is_separator: Callable[[List[Token], int], bool]) -> List[List[Token]]:
+    parts = [[]]
+    separators = {i for i in _top_level(tokens) if is_separator(tokens, i)}
+    for i, token in enumerate(tokens):
+        if i in separators:
+            parts.append([])
+        else:
+            parts[-1].append(token)
+    return parts
+
+
+def _opens_type(tokens: List[Token], index: int) -> bool:
+    previous = _previous_significant(tokens, index)
+    return previous is not None and previous.is_word("ARRAY", "STRUCT")
+
+
+def _split(tokens: List[Token], separator: str) -> List[List[Token]]:
+    parts = [[]]
+    stack = []
+    for i, token in enumerate(tokens):
+        if token.text in ("(", "[") or (token.text == "<" and _opens_type(tokens, i)):
+            stack.append(token.text)
+        elif token.text in (")", "]") or (token.text == ">" and stack and stack[-1] == "<"):
+            stack.pop()
+        if token.text == separator and not stack:
+            parts.append([])
+        else:
+            parts[-1].append(token)
+    return parts
+
+
+def _position(tokens: List[Token], token: Token) -> int:
+    """Index of the token itself, equal tokens being distinct lexical units."""
+    return next(i for i, candidate in enumerate(tokens) if candidate is token)
+
+
+def _previous_significant(tokens: List[Token], index: int) -> Optional[Token]:
+    return next((token for token in reversed(tokens[:index]) if token.kind not in ("space", "comment")), None)
+
+
+def _next_significant(tokens: List[Token], index: Optional[int]) -> Optional[int]:
+    start = 0 if index is None else index + 1
+    return next((i for i in range(start, len(tokens)) if tokens[i].kind not in ("space", "comment")), None)
+
+
+def _significant(tokens: List[Token]) -> List[Token]:
+    return [token for token in tokens if token.kind not in ("space", "comment")]
+
+
+def _without_comments(tokens: List[Token]) -> List[Token]:
+    # comments may hold ';' and are useless to SQLite, they are replaced by a space.
+    return [Token("space", " ") if token.kind == "comment" else token for token in tokens]
+
+
+def _strip_spaces(tokens: List[Token]) -> List[Token]:
+    start = next((i for i, token in enumerate(tokens) if token.kind != "space"), len(tokens))
+    end = next((i for i in range(len(tokens) - 1, -1, -1) if tokens[i].kind != "space"), -1)
+    return tokens[start:end + 1]
@@ -7,9 +7,14 @@
 # pylint: disable=C0114
 
 from bq_test_kit.bq_dsl.bq_query_datum import BQQueryDatum
+from bq_test_kit.bq_dsl.bq_query_dry_run import BQQueryDryRun, BQQueryEstimate
+from bq_test_kit.bq_dsl.bq_query_rows import BQQueryRows
+from bq_test_kit.bq_dsl.bq_query_run import BQQueryRun
 from bq_test_kit.bq_dsl.bq_query_template import BQQueryTemplate
 from bq_test_kit.bq_dsl.bq_resources import (BaseBQResource, Dataset, Project,
                                              Table)
+from bq_test_kit.bq_dsl.query_result_cache import (QueryResultCache,
+                                                   QueryResultCacheStats)
 
 __all__ = [
     "Dataset",
@@ -17,5 +22,11 @@ __all__ = [
     "Project",
     "BQQueryTemplate",
     "BQQueryDatum",
-    "BaseBQResource"
+    "BQQueryRun",
+    "BQQueryRows",
+    "BQQueryDryRun",
+    "BQQueryEstimate",
+    "BaseBQResource",
+    "QueryResultCache",
+    "QueryResultCacheStats"
 ]
@@ -9,7 +9,7 @@
 # Disabled check of cyclic import
 # pylint: disable=R0401
 
-from copy import deepcopy
+from copy import copy
 from typing import TYPE_CHECKING
 
 from bq_test_kit.data_literal_transformers.base_data_literal_transformer import \
@@ -42,7 +42,7 @@ class BQQueryDatum():
         Returns:
             BQQueryDatum: new instance with use_temp_tables as False
         """
-        bq_datum = deepcopy(self)
+        bq_datum = copy(self)
         bq_datum.use_temp_tables = False
         return bq_datum
 
@@ -52,7 +52,7 @@ class BQQueryDatum():
         Returns:
             BQQueryDatum: new instance with use_temp_tables as True
         """
-        bq_datum = deepcopy(self)
+        bq_datum = copy(self)
         bq_datum.use_temp_tables = True
         return bq_datum
 
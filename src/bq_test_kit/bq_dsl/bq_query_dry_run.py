@@ -0,0 +1,39 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+    Outcome of query templates validated by BigQuery without being run.
+"""
+
+from typing import List, NamedTuple, Optional
+
+from google.cloud.bigquery.schema import SchemaField
+
+
+class BQQueryEstimate(NamedTuple):
+    """Estimate of a query template given by a dry run, see BQQueryTemplate.dry_run.
+       referenced_tables are fully qualified table names.
+       schema is empty when BigQuery doesn't give it, for instance for scripts.
+    """
+    total_bytes_processed: int
+    referenced_tables: List[str]
+    schema: List[SchemaField]
+
+
+class BQQueryDryRun(NamedTuple):
+    """Outcome of a query template dry run among many others.
+       Either estimate or error is set, duration is the wall time of the dry run in seconds.
+    """
+    estimate: Optional[BQQueryEstimate]
+    error: Optional[BaseException]
+    duration: float
+
+    @property
+    def succeeded(self) -> bool:
+        """
+        Returns:
+            bool: True if the query template is valid and within its budget.
+        """
+        return self.error is None
@@ -7,20 +7,36 @@
 # pylint: disable=C0114
 
 from base64 import b64encode
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Union
 
 from google.cloud.bigquery.schema import SchemaField
 from google.cloud.bigquery.table import Row, RowIterator
 
+from bq_test_kit.bq_dsl.bq_query_rows import BQQueryRows, RowSource
+
 
 class BQQueryResult():
     """
         Wrap BigQuery RowIterator in order to add additional features to it.
     """
-    def __init__(self, row_iterator: RowIterator) -> None:
+    def __init__(self, row_iterator: RowIterator, lazy: bool = False) -> None:
+        """Constructor of BQQueryResult.
+
+        Args:
+            row_iterator (RowIterator): rows of the query.
+            lazy (bool, optional): read rows page by page as they are accessed, see BQQueryRows,
+                instead of reading all of them at once. Defaults to False.
+        """
         self._row_iterator = row_iterator
-        self._rows = list(row_iterator)
-        self._rows_dict = self._convert_row_to_dict(self._rows)
+        self.lazy = lazy
+        self._rows: Optional[List[Row]] = None
+        self._rows_dict: Optional[List[Dict[str, Any]]] = None
+        if lazy:
+            source = RowSource(row_iterator)
+            self._lazy_rows_bq = BQQueryRows(source, lambda row: row)
+            self._lazy_rows = BQQueryRows(source, self._convert_row)
+        else:
+            self._rows = list(row_iterator)
 
     @property
     def schema(self) -> List[SchemaField]:
@@ -31,21 +47,27 @@ class BQQueryResult():
         return self._row_iterator.schema
 
     @property
-    def rows_bq(self) -> List[Row]:
+    def rows_bq(self) -> Union[List[Row], BQQueryRows]:
         """
         Returns:
-            List[Row]: native BigQuery rows
+            Union[List[Row], BQQueryRows]: native BigQuery rows, as a BQQueryRows view if lazy.
         """
+        if self.lazy:
+            return self._lazy_rows_bq
         return self._rows
 
     @property
-    def rows(self) -> List[Dict[str, Any]]:
-        """Transform BigQuery rows as dict.
+    def rows(self) -> Union[List[Dict[str, Any]], BQQueryRows]:
+        """Transform BigQuery rows as dict, on first access.
            Transform array of bytes into base64 encoded string.
 
         Returns:
-            List[Dict[str, Any]]: [description]
+            Union[List[Dict[str, Any]], BQQueryRows]: rows as dict, as a BQQueryRows view if lazy.
         """
+        if self.lazy:
+            return self._lazy_rows
+        if self._rows_dict is None:
+            self._rows_dict = self._convert_row_to_dict(self._rows)
         return self._rows_dict
 
     @property
@@ -56,17 +78,41 @@ class BQQueryResult():
         """
         return self._row_iterator.total_rows
 
+    def head(self, max_rows: int) -> List[Dict[str, Any]]:
+        """
+        Args:
+            max_rows (int): maximum number of rows to return.
+
+        Returns:
+            List[Dict[str, Any]]: first rows as dict, the others not being read if lazy.
+        """
+        if self.lazy:
+            return self._lazy_rows.head(max_rows)
+        return self.rows[:max_rows]
+
+    def count(self) -> int:
+        """
+        Returns:
+            int: total rows of the query, rows not being read if lazy.
+                Rows written to a destination table are counted as well, even though they are not fetched.
+        """
+        if self.lazy:
+            return self._lazy_rows.count()
+        total_rows = self._row_iterator.total_rows
+        return len(self._rows) if total_rows is None else total_rows
+
     @staticmethod
     def _convert_row_to_dict(row_iterator: List[Row]) -> List[Dict[str, Any]]:
-        def _convert_type(element: Any):
-            convertion_result = element
-            if isinstance(element, bytes):
-                convertion_result = b64encode(element).decode('ascii')
-            elif isinstance(element, (dict, Row)):
-                convertion_result = {k: _convert_type(v) for k, v in element.items()}
-            elif isinstance(element, list):
-                convertion_result = [_convert_type(v) for v in element]
-            return convertion_result
-
-        result = [_convert_type(row) for row in row_iterator]
+        result = [BQQueryResult._convert_row(row) for row in row_iterator]
         return result
+
+    @staticmethod
+    def _convert_row(element: Any) -> Any:
+        convertion_result = element
+        if isinstance(element, bytes):
+            convertion_result = b64encode(element).decode('ascii')
+        elif isinstance(element, (dict, Row)):
+            convertion_result = {k: BQQueryResult._convert_row(v) for k, v in element.items()}
+        elif isinstance(element, list):
+            convertion_result = [BQQueryResult._convert_row(v) for v in element]
+        return convertion_result
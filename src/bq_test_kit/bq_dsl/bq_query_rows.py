@@ -0,0 +1,104 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+    Rows of a query result read page by page, as they are accessed.
+"""
+
+import threading
+from itertools import islice
+from typing import Any, Callable, Iterator, List, Optional
+
+from google.cloud.bigquery.table import Row, RowIterator
+
+
+class RowSource():
+    """Single pass over a RowIterator, shared by the views of a lazy BQQueryResult.
+       Rows read ahead by head are kept, the others are given once.
+    """
+
+    def __init__(self, row_iterator: RowIterator) -> None:
+        self.row_iterator = row_iterator
+        self._lock = threading.Lock()
+        self._iterator: Optional[Iterator[Row]] = None
+        self._head: List[Row] = []
+        self._consumed = False
+
+    def head(self, max_rows: int) -> List[Row]:
+        """
+        Args:
+            max_rows (int): maximum number of rows to read.
+
+        Raises:
+            ValueError: rows have already been iterated over and fewer than max_rows have been kept.
+
+        Returns:
+            List[Row]: first rows, kept for later access.
+        """
+        with self._lock:
+            if len(self._head) < max_rows:
+                self._check_not_consumed()
+                self._head.extend(islice(self._rows(), max_rows - len(self._head)))
+            return self._head[:max_rows]
+
+    def iterate(self) -> Iterator[Row]:
+        """
+        Raises:
+            ValueError: rows have already been iterated over.
+
+        Returns:
+            Iterator[Row]: all rows, pages being fetched as the iteration goes.
+        """
+        with self._lock:
+            self._check_not_consumed()
+            self._consumed = True
+            head = list(self._head)
+            self._head = []
+        yield from head
+        yield from self._rows()
+
+    def _rows(self) -> Iterator[Row]:
+        if self._iterator is None:
+            self._iterator = iter(self.row_iterator)
+        return self._iterator
+
+    def _check_not_consumed(self) -> None:
+        if self._consumed:
+            raise ValueError("Rows of a lazy result are read once, they have already been iterated over.")
+
+
+class BQQueryRows():
+    """View of the rows of a lazy BQQueryResult, rows being converted as they are accessed.
+       Iteration is done once, as for a RowIterator, whereas head may be called many times beforehand.
+    """
+
+    def __init__(self, source: RowSource, convert: Callable[[Row], Any]) -> None:
+        self._source = source
+        self._convert = convert
+
+    def __iter__(self) -> Iterator[Any]:
+        return (self._convert(row) for row in self._source.iterate())
+
+    def head(self, max_rows: int) -> List[Any]:
+        """Read the first rows without reading the others.
+
+        Args:
+            max_rows (int): maximum number of rows to return.
+
+        Returns:
+            List[Any]: first rows.
+        """
+        return [self._convert(row) for row in self._source.head(max_rows)]
+
+    def count(self) -> int:
+        """Count rows without reading them. Only the first page is fetched if BigQuery hasn't given the count yet.
+
+        Returns:
+            int: total rows of the query.
+        """
+        row_iterator = self._source.row_iterator
+        if row_iterator.total_rows is None:
+            self._source.head(1)
+        return row_iterator.total_rows or 0
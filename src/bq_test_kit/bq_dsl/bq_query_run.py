@@ -0,0 +1,28 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+# C0114 disabled because this module contains only one class
+# pylint: disable=C0114
+
+from typing import NamedTuple, Optional
+
+from bq_test_kit.bq_dsl.bq_query_results import BQQueryResult
+
+
+class BQQueryRun(NamedTuple):
+    """Outcome of a query template run among many others.
+       Either result or error is set, duration is the wall time of the run in seconds.
+    """
+    result: Optional[BQQueryResult]
+    error: Optional[BaseException]
+    duration: float
+
+    @property
+    def succeeded(self) -> bool:
+        """
+        Returns:
+            bool: True if the query template ran without error.
+        """
+        return self.error is None
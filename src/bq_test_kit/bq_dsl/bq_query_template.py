@@ -6,12 +6,15 @@
 # C0114 disabled because this module contains only one class
 # pylint: disable=C0114
 
-import uuid
-from copy import deepcopy
+import asyncio
+import hashlib
+import itertools
+import json
+from copy import copy, deepcopy
 from functools import reduce
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-from google.cloud.bigquery import Client
+from google.cloud.bigquery import Client, ConnectionProperty
 from google.cloud.bigquery.job import (QueryJob, QueryJobConfig,
                                        WriteDisposition)
 from google.cloud.bigquery.query import UDFResource
@@ -19,20 +22,45 @@ from google.cloud.bigquery.schema import SchemaField
 from logzero import logger
 
 from bq_test_kit.bq_dsl.bq_query_datum import BQQueryDatum
+from bq_test_kit.bq_dsl.bq_query_dry_run import BQQueryEstimate
 from bq_test_kit.bq_dsl.bq_query_results import BQQueryResult
 from bq_test_kit.bq_dsl.bq_resources import BaseBQResource, Project, Table
+from bq_test_kit.bq_dsl.query_result_cache import QueryResultCache
 from bq_test_kit.bq_dsl.schema_mixin import SchemaMixin
 from bq_test_kit.bq_test_kit_config import BQTestKitConfig
 from bq_test_kit.constants import (DEFAULT_JOB_ID_PREFIX,
+                                   DEFAULT_MAX_CONCURRENCY,
+                                   DEFAULT_POLL_INITIAL_DELAY,
+                                   DEFAULT_POLL_MAX_DELAY,
+                                   DEFAULT_POLL_MULTIPLIER,
                                    DEFAULT_TECHNICAL_COLUMN_PREFIX)
 from bq_test_kit.data_literal_transformers.base_data_literal_transformer import \
     BaseDataLiteralTransformer
+from bq_test_kit.exceptions import BytesBudgetExceededException
 from bq_test_kit.interpolators.base_interpolator import BaseInterpolator
 from bq_test_kit.resource_loaders import BaseResourceLoader
+from bq_test_kit.sql_tokens import tokenize
 from bq_test_kit.typing import (QueryParameter, SchemaFieldTypedDatum,
                                 TableResources)
 
+# statements changing data and functions whose result changes from one run to another can't be cached.
+_UNCACHEABLE_WORDS = {
+    "INSERT", "UPDATE", "DELETE", "MERGE", "TRUNCATE", "CREATE", "DROP", "ALTER", "CALL", "EXECUTE", "EXPORT",
+    "LOAD", "CURRENT_DATE", "CURRENT_DATETIME", "CURRENT_TIME", "CURRENT_TIMESTAMP", "RAND", "GENERATE_UUID",
+    "SESSION_USER"
+}
 
+# properties of a job config that only apply to the query itself, not to the statements filling its temp tables.
+_QUERY_ONLY_PROPERTIES = [
+    "destinationTable", "writeDisposition", "createDisposition", "allowLargeResults", "flattenResults",
+    "timePartitioning", "rangePartitioning", "clustering", "schemaUpdateOptions",
+    "destinationEncryptionConfiguration", "queryParameters", "parameterMode", "connectionProperties",
+    "createSession"
+]
+
+
+# R0904 disabled because each option of the query DSL has its own fluent method.
+# pylint: disable=R0904
 class BQQueryTemplate(SchemaMixin):
     """Query DSL which allows query to be interpolated before its execution.
     """
@@ -43,7 +71,12 @@ class BQQueryTemplate(SchemaMixin):
                  job_config: QueryJobConfig = None, project: Project = None,
                  interpolators: List[BaseInterpolator] = None, global_dict: Dict[str, Any] = None,
                  temp_tables: List[Tuple[BaseDataLiteralTransformer, TableResources]] = None,
-                 temp_technical_column_prefix: str = DEFAULT_TECHNICAL_COLUMN_PREFIX) -> None:
+                 temp_technical_column_prefix: str = DEFAULT_TECHNICAL_COLUMN_PREFIX,
+                 max_literal_size: Optional[int] = None,
+                 drop_temp_tables: bool = False,
+                 result_cache: Optional[QueryResultCache] = None,
+                 lazy_result: bool = False,
+                 page_size: Optional[int] = None) -> None:
         """Constructor of BQQueryTemplate
 
         Args:
@@ -64,7 +97,24 @@ class BQQueryTemplate(SchemaMixin):
             temp_technical_column_prefix (str):
                 prefix used when renaming partition column which are invalid in bigquery.
                 Defaults to bq_test_kit.constants.DEFAULT_TECHNICAL_COLUMN_PREFIX.
+            max_literal_size (Optional[int]):
+                maximum size, in characters, of a data literal in a single statement.
+                Bigger temp tables are created then filled by several INSERT INTO jobs, see with_max_literal_size.
+                Defaults to None, temp tables being always created in a single statement.
+            drop_temp_tables (bool):
+                append a DROP TABLE statement for each temp table after the query.
+                Result of the query is then looked up among the child jobs of the script.
+                Defaults to False, temp tables being scoped to the script.
+            result_cache (Optional[QueryResultCache]):
+                cache of query results, see with_result_cache. Defaults to None.
+            lazy_result (bool):
+                read rows of the result page by page as they are accessed, see with_lazy_result.
+                Defaults to False.
+            page_size (Optional[int]):
+                number of rows per page fetched from BigQuery. Defaults to None, BigQuery choosing it.
         """
+        # Options are keyword only, each of them being set by a fluent method and kept by _copy.
+        # pylint: disable=R0913,R0914
         self.from_ = from_
         self._bq_client = bq_client
         self.job_config = job_config if job_config else QueryJobConfig()
@@ -76,26 +126,274 @@ class BQQueryTemplate(SchemaMixin):
         self.temp_tables = ([self._to_temp_tables_with_schema_field(temp_table) for temp_table in temp_tables]
                             if temp_tables else [])
         self.temp_technical_column_prefix = temp_technical_column_prefix
+        self.max_literal_size = max_literal_size
+        self.drop_temp_tables = drop_temp_tables
+        self.result_cache = result_cache
+        self.lazy_result = lazy_result
+        self.page_size = page_size
 
     def run(self) -> BQQueryResult:
         """Execute the query and return a BQQueryResult.
+           When a result cache is set, the result of a query already run is read from it instead.
+
+        Returns:
+            BQQueryResult: results are stored in this object.
+        """
+        effective_query, user_query, nb_statements, setup_statements = self._render()
+        cache_key = self._result_cache_key(effective_query, user_query, setup_statements)
+        if cache_key is not None:
+            result = self.result_cache.get(cache_key)
+            if result is not None:
+                return result
+        query_job, created_session_id = self._submit(effective_query, setup_statements)
+        try:
+            result = self._to_result(query_job, nb_statements)
+        finally:
+            if created_session_id is not None:
+                self._abort_session(created_session_id)
+        if cache_key is not None:
+            self.result_cache.put(cache_key, result)
+        return result
+
+    async def arun(self,
+                   *, initial_delay: float = DEFAULT_POLL_INITIAL_DELAY,
+                   max_delay: float = DEFAULT_POLL_MAX_DELAY,
+                   multiplier: float = DEFAULT_POLL_MULTIPLIER) -> BQQueryResult:
+        """Coroutine version of run. Blocking calls to the client are done in the default executor of the loop
+           and job completion is polled on the loop with an exponential backoff, so that running queries
+           don't hold a thread of the executor and many of them may run concurrently.
+
+        Args:
+            initial_delay (float, optional): seconds to wait before the second poll.
+                Defaults to bq_test_kit.constants.DEFAULT_POLL_INITIAL_DELAY.
+            max_delay (float, optional): maximum seconds between two polls.
+                Defaults to bq_test_kit.constants.DEFAULT_POLL_MAX_DELAY.
+            multiplier (float, optional): delay growth between two polls.
+                Defaults to bq_test_kit.constants.DEFAULT_POLL_MULTIPLIER.
 
         Returns:
             BQQueryResult: results are stored in this object.
         """
-        temp_table_queries, create_statements, drop_statements, nb_statements = self._generate_temp_tables()
+        loop = asyncio.get_event_loop()
+        effective_query, user_query, nb_statements, setup_statements = await loop.run_in_executor(None, self._render)
+        cache_key = self._result_cache_key(effective_query, user_query, setup_statements)
+        if cache_key is not None:
+            result = await loop.run_in_executor(None, self.result_cache.get, cache_key)
+            if result is not None:
+                return result
+        query_job, created_session_id = await loop.run_in_executor(None, self._submit,
+                                                                   effective_query, setup_statements)
+        try:
+            delay = initial_delay
+            while not await loop.run_in_executor(None, query_job.done):
+                await asyncio.sleep(delay)
+                delay = min(delay * multiplier, max_delay)
+            result = await loop.run_in_executor(None, self._to_result, query_job, nb_statements)
+        finally:
+            if created_session_id is not None:
+                await loop.run_in_executor(None, self._abort_session, created_session_id)
+        if cache_key is not None:
+            await loop.run_in_executor(None, self.result_cache.put, cache_key, result)
+        return result
+
+    @staticmethod
+    async def arun_all(query_templates: List['BQQueryTemplate'],
+                       *, return_exceptions: bool = False,
+                       max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> List[Union[BQQueryResult, BaseException]]:
+        """Run all query templates concurrently, at most max_concurrency at a time, see arun.
+
+        Args:
+            query_templates (List[BQQueryTemplate]): query templates to run.
+            return_exceptions (bool, optional): return exceptions in place of results instead of raising the first
+                one. Defaults to False.
+            max_concurrency (int, optional): maximum number of queries running at the same time.
+                Defaults to bq_test_kit.constants.DEFAULT_MAX_CONCURRENCY.
+
+        Returns:
+            List[Union[BQQueryResult, BaseException]]: results in the order of query_templates.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _arun(query_template: BQQueryTemplate) -> BQQueryResult:
+            async with semaphore:
+                return await query_template.arun()
+        return await asyncio.gather(*[_arun(query_template) for query_template in query_templates],
+                                    return_exceptions=return_exceptions)
+
+    def dry_run(self, *, max_bytes: Optional[int] = None) -> BQQueryEstimate:
+        """Validate the query without running it. The whole script is rendered, temp tables included,
+           and submitted as a dry run, which costs nothing and bypasses the BigQuery cache.
+           Statements filling temp tables split by max_literal_size are inlined at the head of the script.
+
+        Args:
+            max_bytes (Optional[int], optional): maximum bytes the query may process. Defaults to None, no budget.
+
+        Raises:
+            BytesBudgetExceededException: the query would process more than max_bytes.
+
+        Returns:
+            BQQueryEstimate: bytes processed, referenced tables and schema of the result.
+        """
+        effective_query, _, _, setup_statements = self._render()
+        effective_query = "".join(statement + "\n" for statement in setup_statements) + effective_query
+        job_config = deepcopy(self.job_config)
+        job_config.dry_run = True
+        job_config.use_query_cache = False
+        query_job: QueryJob = self._bq_client.query(
+            effective_query,
+            job_id_prefix=DEFAULT_JOB_ID_PREFIX,
+            job_config=job_config,
+            location=self.location,
+            project=self.project.fqdn() if self.project else None
+        )
+        total_bytes_processed = query_job.total_bytes_processed or 0
+        logger.info("Query would process %s bytes.", total_bytes_processed)
+        if max_bytes is not None and total_bytes_processed > max_bytes:
+            raise BytesBudgetExceededException(total_bytes_processed, max_bytes)
+        referenced_tables = [f"{table.project}.{table.dataset_id}.{table.table_id}"
+                             for table in query_job.referenced_tables or []]
+        return BQQueryEstimate(total_bytes_processed, referenced_tables, list(query_job.schema or []))
+
+    def _render(self) -> Tuple[str, str, int, List[str]]:
+        """
+        Returns:
+            Tuple[str, str, int, List[str]]: script to run, interpolated user query,
+                the number of statements appended after the user query
+                and the statements to run beforehand, each one in its own job.
+        """
+        (temp_table_queries, setup_statements, create_statements,
+         drop_statements, nb_statements) = self._generate_temp_tables()
         interpolated_query = self._interpolate(temp_table_queries)
         effective_query = create_statements + interpolated_query + drop_statements
         logger.debug("Query rendered as :\n%s", effective_query)
+        return effective_query, interpolated_query, nb_statements, setup_statements
+
+    def _result_cache_key(self, effective_query: str, user_query: str,
+                          setup_statements: List[str]) -> Optional[str]:
+        """Hash of the query and of the job configuration changing its result.
+           Queries with a destination, DML or non deterministic functions bypass the cache,
+           as well as lazy results which are never fully read.
+
+        Returns:
+            Optional[str]: hexadecimal hash, None if the result must not be cached.
+        """
+        if self.result_cache is None or self.job_config.destination or self.lazy_result:
+            return None
+        if any(token.kind == "word" and token.text.upper() in _UNCACHEABLE_WORDS for token in tokenize(user_query)):
+            logger.debug("Query result is not cached since the query changes data or is not deterministic.")
+            return None
+        key_parts = {
+            "query": effective_query,
+            "setup_statements": setup_statements,
+            "query_parameters": [param.to_api_repr() for param in self.job_config.query_parameters],
+            "udf_resources": [[udf.udf_type, udf.value] for udf in self.job_config.udf_resources],
+            "use_legacy_sql": self.job_config.use_legacy_sql,
+            "default_dataset": str(self.job_config.default_dataset) if self.job_config.default_dataset else None,
+            # a lower limit or a dry run must not be answered by a result obtained without them.
+            "maximum_bytes_billed": self.job_config.maximum_bytes_billed,
+            "dry_run": self.job_config.dry_run,
+            "connection_properties": [[prop.key, prop.value] for prop in self.job_config.connection_properties],
+            "location": self.location,
+            "project": self.project.fqdn() if self.project else None
+        }
+        return hashlib.sha256(json.dumps(key_parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _submit(self, effective_query: str, setup_statements: List[str]) -> Tuple[QueryJob, Optional[str]]:
+        """Run setup statements, if any, and submit the query.
+           Under a dry run, setup statements are inlined at the head of the script instead, as by dry_run.
+
+        Returns:
+            Tuple[QueryJob, Optional[str]]: job of the query and the id of the session created for it if any,
+                to abort once the result is read.
+        """
+        job_config = self.job_config
+        created_session_id = None
+        if setup_statements and self.job_config.dry_run:
+            effective_query = "".join(statement + "\n" for statement in setup_statements) + effective_query
+        elif setup_statements:
+            job_config = deepcopy(self.job_config)
+            session_id, created = self._run_setup_statements(setup_statements)
+            created_session_id = session_id if created else None
+            job_config.connection_properties = (
+                [prop for prop in job_config.connection_properties if prop.key != "session_id"] +
+                [ConnectionProperty("session_id", session_id)]
+            )
         query_job: QueryJob = self._bq_client.query(
             effective_query,
             job_id_prefix=DEFAULT_JOB_ID_PREFIX,
-            job_config=self.job_config,
+            job_config=job_config,
             location=self.location,
             project=self.project.fqdn() if self.project else None
         )
         logger.info("Job id is : %s", query_job.job_id)
-        row_iterator = query_job.result(max_results=0 if self.job_config.destination else None)
+        return query_job, created_session_id
+
+    def _run_setup_statements(self, setup_statements: List[str]) -> Tuple[str, bool]:
+        """Run each statement in its own job, one after the other, within a session,
+           so that temp tables they fill are visible to the query run afterwards in the same session.
+           The session of the job config is used if any, otherwise a new one is created by the first job.
+           Jobs are configured as the query is, without its destination and parameters.
+
+        Returns:
+            Tuple[str, bool]: id of the session and whether it has been created.
+        """
+        session_id = self._session_id()
+        created = session_id is None
+        api_repr = self.job_config.to_api_repr()
+        for key in _QUERY_ONLY_PROPERTIES:
+            api_repr.get("query", {}).pop(key, None)
+        for statement in setup_statements:
+            job_config = QueryJobConfig.from_api_repr(deepcopy(api_repr))
+            job_config.use_legacy_sql = False
+            if session_id is None:
+                job_config.create_session = True
+            else:
+                job_config.connection_properties = [ConnectionProperty("session_id", session_id)]
+            setup_job: QueryJob = self._bq_client.query(
+                statement,
+                job_id_prefix=DEFAULT_JOB_ID_PREFIX,
+                job_config=job_config,
+                location=self.location,
+                project=self.project.fqdn() if self.project else None
+            )
+            logger.info("Setup job id is : %s", setup_job.job_id)
+            setup_job.result()
+            if session_id is None:
+                session_id = setup_job.session_info.session_id
+                logger.info("Session id is : %s", session_id)
+        return session_id, created
+
+    def _session_id(self) -> Optional[str]:
+        """
+        Returns:
+            Optional[str]: id of the session set in the connection properties of the job config, if any.
+        """
+        return next((prop.value for prop in self.job_config.connection_properties if prop.key == "session_id"), None)
+
+    def _abort_session(self, session_id: str) -> None:
+        """Terminate a session created by _run_setup_statements, dropping its temp tables.
+        """
+        job_config = QueryJobConfig(use_legacy_sql=False,
+                                    connection_properties=[ConnectionProperty("session_id", session_id)])
+        abort_job: QueryJob = self._bq_client.query(
+            "CALL BQ.ABORT_SESSION();",
+            job_id_prefix=DEFAULT_JOB_ID_PREFIX,
+            job_config=job_config,
+            location=self.location,
+            project=self.project.fqdn() if self.project else None
+        )
+        abort_job.result()
+        logger.info("Session %s has been aborted.", session_id)
+
+    def _to_result(self, query_job: QueryJob, nb_statements: int) -> BQQueryResult:
+        """Result of the script is the one of its last statement.
+           When statements are appended after the user query, the result of the last user statement
+           is fetched from the child jobs of the script, costing an extra list_jobs call.
+        """
+        result_options = {"max_results": 0 if self.job_config.destination else None}
+        if self.page_size is not None:
+            result_options["page_size"] = self.page_size
+        row_iterator = query_job.result(**result_options)
         if nb_statements > 0:
             query_jobs = self._bq_client.list_jobs(parent_job=query_job.job_id)
             job_ids = []
@@ -107,8 +405,8 @@ class BQQueryTemplate(SchemaMixin):
             jobs_with_step = sorted(jobs_with_step, key=lambda j: j[0], )
             last_user_statement_job = jobs_with_step[-nb_statements-1][1]
             logger.debug("selected job for result is %s", last_user_statement_job.job_id)
-            row_iterator = last_user_statement_job.result(max_results=0 if self.job_config.destination else None)
-        return BQQueryResult(row_iterator)
+            row_iterator = last_user_statement_job.result(**result_options)
+        return BQQueryResult(row_iterator, lazy=self.lazy_result)
 
     def allow_large_results(self, allow: bool) -> 'BQQueryTemplate':
         """Allow large query results tables (legacy SQL, only)
@@ -119,7 +417,7 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: a new instance of BQQueryTemplate with allow_large_results set.
         """
-        query_template = deepcopy(self)
+        query_template = self._copy()
         query_template.job_config.allow_large_results = allow
         return query_template
 
@@ -134,7 +432,7 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: a new instance of BQQueryTemplate with destination set.
         """
-        query_template = deepcopy(self)
+        query_template = self._copy()
         fqdn = table.fqdn()
         _partition = "$" + partition if partition else ""
         target = fqdn + _partition
@@ -150,7 +448,7 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: a new instance of BQQueryTemplate with query parameters set.
         """
-        query_template = deepcopy(self)
+        query_template = self._copy()
         query_template.job_config.query_parameters = params
         return query_template
 
@@ -163,7 +461,7 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: a new instance of BQQueryTemplate with a list of udf resources set.
         """
-        query_template = deepcopy(self)
+        query_template = self._copy()
         query_template.job_config.udf_resources = udf_resources
         return query_template
 
@@ -176,7 +474,7 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: a new instance of BQQueryTemplate with an updated list of udf resources.
         """
-        query_template = deepcopy(self)
+        query_template = self._copy()
         udfs = query_template.job_config.udf_resources if query_template.job_config.udf_resources else []
         udfs = udfs + [udf_resource]
         query_template.job_config.udf_resources = udfs
@@ -191,7 +489,7 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: a new instance of BQQueryTemplate with legacy sql usage set.
         """
-        query_template = deepcopy(self)
+        query_template = self._copy()
         query_template.job_config.use_legacy_sql = use
         return query_template
 
@@ -204,7 +502,7 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: a new instance of BQQueryTemplate with cache usage set.
         """
-        query_template = deepcopy(self)
+        query_template = self._copy()
         query_template.job_config.use_query_cache = use
         return query_template
 
@@ -214,7 +512,7 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: a new instance of BQQueryTemplate with data overwrite set.
         """
-        query_template = deepcopy(self)
+        query_template = self._copy()
         query_template.job_config.write_disposition = WriteDisposition.WRITE_TRUNCATE
         return query_template
 
@@ -224,7 +522,7 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: a new instance of BQQueryTemplate with data append set.
         """
-        query_template = deepcopy(self)
+        query_template = self._copy()
         query_template.job_config.write_disposition = WriteDisposition.WRITE_APPEND
         return query_template
 
@@ -234,7 +532,7 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: a new instance of BQQueryTemplate with error to thrown if data exists.
         """
-        query_template = deepcopy(self)
+        query_template = self._copy()
         query_template.job_config.write_disposition = WriteDisposition.WRITE_EMPTY
         return query_template
 
@@ -247,7 +545,7 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: a new instance of BQQueryTemplate with a list of interpolators.
         """
-        query_template = deepcopy(self)
+        query_template = self._copy()
         query_template.interpolators = renderers
         return query_template
 
@@ -260,9 +558,8 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: a new instance of BQQueryTemplate with an updated list of interpolators.
         """
-        query_template = deepcopy(self)
-        query_template.interpolators = query_template.interpolators if query_template.interpolators else []
-        query_template.interpolators.append(renderer)
+        query_template = self._copy()
+        query_template.interpolators = query_template.interpolators + [renderer]
         return query_template
 
     def with_global_dict(self, global_dict: Dict[str, Any]) -> 'BQQueryTemplate':
@@ -274,7 +571,7 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: a new instance of BQQueryTemplate with global dict overwritten.
         """
-        query_template = deepcopy(self)
+        query_template = self._copy()
         query_template.global_dict = global_dict
         return query_template
 
@@ -301,8 +598,8 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: a new instance of BQQueryTemplate with global dict updated.
         """
-        query_template = deepcopy(self)
-        query_template.global_dict.update(dict_update)
+        query_template = self._copy()
+        query_template.global_dict = {**query_template.global_dict, **dict_update}
         return query_template
 
     def update_global_dict_with_bq_resources(self, bq_resources: List[BaseBQResource],
@@ -319,10 +616,10 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: a new instance of BQQueryTemplate with global dict updated.
         """
-        query_template = deepcopy(self)
+        query_template = self._copy()
         to_kv = resource_to_kv if resource_to_kv else self._default_resource_to_kv
         local_dict = dict([to_kv(bq_resource) for bq_resource in bq_resources])
-        query_template.global_dict.update(local_dict)
+        query_template.global_dict = {**query_template.global_dict, **local_dict}
         return query_template
 
     def with_temp_tables(self, tables: Tuple[BaseDataLiteralTransformer, TableResources]) -> 'BQQueryTemplate':
@@ -336,8 +633,8 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: new instance with temp_tables filled
         """
-        query_template = deepcopy(self)
-        query_template.temp_tables.append(self._to_temp_tables_with_schema_field(tables))
+        query_template = self._copy()
+        query_template.temp_tables = query_template.temp_tables + [self._to_temp_tables_with_schema_field(tables)]
         return query_template
 
     def with_datum(self, tables: TableResources) -> BQQueryDatum:
@@ -366,10 +663,76 @@ class BQQueryTemplate(SchemaMixin):
         Returns:
             BQQueryTemplate: new instance of current Query template with column prefix updated.
         """
-        query_template = deepcopy(self)
+        query_template = self._copy()
         query_template.temp_technical_column_prefix = prefix
         return query_template
 
+    def with_max_literal_size(self, max_size: Optional[int]) -> 'BQQueryTemplate':
+        """Change the maximum size of a data literal in a single statement.
+           Temp tables whose data literal is bigger are created with the first rows
+           and filled with the remaining ones by several INSERT INTO statements.
+           Each of these statements is run in its own job, within a BigQuery session
+           that the query joins afterwards, so that no job exceeds the query length limit.
+
+        Args:
+            max_size (Optional[int]): maximum size in characters. None disables the split.
+
+        Returns:
+            BQQueryTemplate: new instance of current Query template with max literal size updated.
+        """
+        query_template = self._copy()
+        query_template.max_literal_size = max_size
+        return query_template
+
+    def with_temp_tables_dropped(self, drop: bool = True) -> 'BQQueryTemplate':
+        """Append a DROP TABLE statement for each temp table after the query.
+           Temp tables are scoped to the script anyway, thus dropping them explicitly
+           only costs an extra lookup of the query result among the child jobs of the script.
+
+        Args:
+            drop (bool, optional): drop temp tables explicitly. Defaults to True.
+
+        Returns:
+            BQQueryTemplate: new instance of current Query template with drop_temp_tables updated.
+        """
+        query_template = self._copy()
+        query_template.drop_temp_tables = drop
+        return query_template
+
+    def with_lazy_result(self, lazy: bool = True, page_size: Optional[int] = None) -> 'BQQueryTemplate':
+        """Read rows of the result page by page as they are accessed, instead of reading all of them at once.
+           rows and rows_bq of the result are then BQQueryRows views, iterated once,
+           and head and count of the result don't read the other rows. Lazy results are never cached.
+
+        Args:
+            lazy (bool, optional): read rows lazily. Defaults to True.
+            page_size (Optional[int], optional): number of rows per page fetched from BigQuery.
+                Defaults to None, BigQuery choosing it.
+
+        Returns:
+            BQQueryTemplate: new instance of current Query template with lazy result updated.
+        """
+        query_template = self._copy()
+        query_template.lazy_result = lazy
+        query_template.page_size = page_size
+        return query_template
+
+    def with_result_cache(self, result_cache: Optional[QueryResultCache]) -> 'BQQueryTemplate':
+        """Read results of queries already run from a cache instead of running them again.
+           Entries are addressed by the hash of the rendered script, query parameters, udf resources
+           and legacy sql flag. Queries with a destination, DML or non deterministic functions always run.
+           The cache is shared across copies.
+
+        Args:
+            result_cache (Optional[QueryResultCache]): cache to use, None disables it.
+
+        Returns:
+            BQQueryTemplate: new instance of current Query template with result cache updated.
+        """
+        query_template = self._copy()
+        query_template.result_cache = result_cache
+        return query_template
+
     def _interpolate(self, temp_table_queries) -> str:
         query = self.from_ if isinstance(self.from_, str) else self.from_.load()
         merged_global_dict = deepcopy(self.global_dict)
@@ -388,33 +751,49 @@ class BQQueryTemplate(SchemaMixin):
             return self.temp_technical_column_prefix + name
         return name
 
-    def _generate_temp_tables(self) -> Tuple[str, str, str, int]:
+    def _generate_temp_tables(self) -> Tuple[Dict[str, str], List[str], str, str, int]:
         """Generate part of the future script to execute.
 
         Returns:
-            Tuple[str, str, str]:
-                tuple of queries to substitute with the table, temp table create statements and drop of them.
+            Tuple[Dict[str, str], List[str], str, str, int]:
+                tuple of queries to substitute with the table, statements of temp tables split by
+                max_literal_size, temp table create statements, drop of them
+                and the number of statements appended after the user query.
+                Split temp tables are created then filled with several INSERT INTO statements,
+                each one to be run in its own job before the script.
+                Drop statements are generated only if drop_temp_tables is True.
         """
         temp_table_queries = {}
+        setup_statements = []
         create_table_statements = ""
         drop_table_statements = ""
         nb_statements = 0
-        for table_def in self.temp_tables:
-            transformer, tables = table_def
+        # temp tables of the session of the job config outlive the query, they are replaced on the next run.
+        create = "CREATE TEMP TABLE" if self._session_id() is None else "CREATE OR REPLACE TEMP TABLE"
+        for transformer, tables in self.temp_tables:
             for (table_name, (datum, schema)) in tables.items():
                 logger.info("Generating temp table %s", table_name)
 
-                datum_literal = transformer.load(datum, schema, self._rename_technical_column)
-                temp_table_create = f"CREATE TEMP TABLE {table_name} as {datum_literal};"
-                temp_table_drop = f"DROP TABLE {table_name};"
-                logger.debug("Generated prepend statement as :\n%s", temp_table_create)
-                logger.debug("Generated append statement as :\n%s", temp_table_create)
-                create_table_statements += temp_table_create + "\n"
-                drop_table_statements += "\n" + temp_table_drop
-                temp_table_query = self._simple_select(table_name, schema, self._rename_technical_column)
-                temp_table_queries.update({table_name: temp_table_query})
-                nb_statements += 1
-        return (temp_table_queries, create_table_statements, drop_table_statements, nb_statements)
+                datum_literals = transformer.load_chunks(datum, schema, self._rename_technical_column,
+                                                         self.max_literal_size)
+                temp_table_create = f"{create} {table_name} as {datum_literals[0]};"
+                if len(datum_literals) > 1:
+                    # data literals are parenthesized selects, which INSERT INTO takes unparenthesized.
+                    setup_statements += [temp_table_create] + [f"INSERT INTO {table_name} {datum_literal[1:-1]};"
+                                                               for datum_literal in datum_literals[1:]]
+                    logger.debug("Generated %s setup statements for %s", len(datum_literals), table_name)
+                else:
+                    logger.debug("Generated prepend statement as :\n%s", temp_table_create)
+                    create_table_statements += temp_table_create + "\n"
+                if self.drop_temp_tables:
+                    temp_table_drop = f"DROP TABLE {table_name};"
+                    logger.debug("Generated append statement as :\n%s", temp_table_drop)
+                    drop_table_statements += "\n" + temp_table_drop
+                    nb_statements += 1
+                temp_table_queries.update({
+                    table_name: self._simple_select(table_name, schema, self._rename_technical_column)
+                })
+        return (temp_table_queries, setup_statements, create_table_statements, drop_table_statements, nb_statements)
 
     @staticmethod
     def _simple_select(table_name: str, schema: List[SchemaField],
@@ -431,6 +810,8 @@ class BQQueryTemplate(SchemaMixin):
                 and output selection will be _PARTITIONDATE, as expected.
         """
         effective_transform_field_name = transform_field_name if transform_field_name else lambda x: x
+        # aliases are numbered rather than random, so that the rendered query is the same from one run to another.
+        unnest_numbers = itertools.count()
         # Disabling too many statements since this is related to nested functions.
         # Function scope is only for _transform_to_literal
         # pylint: disable=R0915
@@ -438,7 +819,7 @@ class BQQueryTemplate(SchemaMixin):
         def _transform_repeated_field_to_literal(parent_path: Optional[str], schema_field: SchemaField):
             current_projection = None
             nested_result = None
-            unnest_name = "ut" + str(uuid.uuid4()).replace("-", "_")
+            unnest_name = f"_bqtk_ut{next(unnest_numbers)}"
             if str.upper(schema_field.field_type) == "RECORD":
                 nested_result = _transform_struct_to_literal(schema_field.fields, False, unnest_name, None)
             else:
@@ -498,6 +879,18 @@ class BQQueryTemplate(SchemaMixin):
             key = bq_resource.name
         return key, bq_resource.fqdn()
 
+    def _copy(self) -> 'BQQueryTemplate':
+        """Copy sharing all attributes with the current instance, datum and schema of temp tables included.
+           Fluent methods replace attributes instead of mutating them, except job_config which is small,
+           thus it is copied.
+
+        Returns:
+            BQQueryTemplate: new instance of BQQueryTemplate.
+        """
+        query_template = copy(self)
+        query_template.job_config = deepcopy(self.job_config)
+        return query_template
+
     def __deepcopy__(self, memo) -> 'BQQueryTemplate':
         return BQQueryTemplate(
             from_=deepcopy(self.from_, memo),
@@ -511,5 +904,10 @@ class BQQueryTemplate(SchemaMixin):
             interpolators=deepcopy(self.interpolators),
             global_dict=deepcopy(self.global_dict),
             temp_tables=deepcopy(self.temp_tables),
-            temp_technical_column_prefix=deepcopy(self.temp_technical_column_prefix)
+            temp_technical_column_prefix=deepcopy(self.temp_technical_column_prefix),
+            max_literal_size=self.max_literal_size,
+            drop_temp_tables=self.drop_temp_tables,
+            result_cache=self.result_cache,
+            lazy_result=self.lazy_result,
+            page_size=self.page_size
         )
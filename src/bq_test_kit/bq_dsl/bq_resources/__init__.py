@@ -7,13 +7,25 @@
 # pylint: disable=C0114
 
 from bq_test_kit.bq_dsl.bq_resources.base_bq_resource import BaseBQResource
+from bq_test_kit.bq_dsl.bq_resources.cleanup_queue import (CleanupQueue,
+                                                           CleanupReport,
+                                                           DeferredCleanAfter)
 from bq_test_kit.bq_dsl.bq_resources.dataset import Dataset
+from bq_test_kit.bq_dsl.bq_resources.dataset_pool import (DatasetPool,
+                                                          DatasetPoolStats,
+                                                          PooledDataset)
 from bq_test_kit.bq_dsl.bq_resources.project import Project
 from bq_test_kit.bq_dsl.bq_resources.table import Table
 
 __all__ = [
     "BaseBQResource",
+    "CleanupQueue",
+    "CleanupReport",
     "Dataset",
+    "DatasetPool",
+    "DatasetPoolStats",
+    "DeferredCleanAfter",
+    "PooledDataset",
     "Project",
     "Table"
 ]
@@ -0,0 +1,179 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+    Deletion of resources in a background thread, so that tests don't wait for their cleanup.
+"""
+
+import atexit
+import threading
+import weakref
+from collections import deque
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from logzero import logger
+
+from bq_test_kit.bq_dsl.bq_resources.resource_strategy import CleanAfter
+from bq_test_kit.constants import DEFAULT_CLEANUP_DRAIN_TIMEOUT
+
+# queues of the process, drained at exit.
+_QUEUES = weakref.WeakSet()
+
+
+def _drain_all_queues() -> None:
+    for cleanup_queue in list(_QUEUES):
+        cleanup_queue.drain_at_exit()
+
+
+atexit.register(_drain_all_queues)
+
+
+class CleanupReport(NamedTuple):
+    """Outcome of the deletions submitted to a CleanupQueue.
+       failed holds descriptions of resources along with their error,
+       left holds descriptions of resources not deleted yet.
+    """
+    done: int
+    failed: List[Tuple[str, str]]
+    left: List[str]
+
+
+class CleanupQueue():
+    """Run submitted deletions one at a time, in submission order, in a background thread.
+       Resources are thus deleted before the resources they belong to, as with synchronous deletions.
+       The queue is drained at interpreter exit, resources left behind are logged.
+    """
+
+    def __init__(self, drain_timeout: float = DEFAULT_CLEANUP_DRAIN_TIMEOUT) -> None:
+        """Constructor of CleanupQueue.
+
+        Args:
+            drain_timeout (float, optional): seconds to wait for pending deletions when draining.
+                Defaults to bq_test_kit.constants.DEFAULT_CLEANUP_DRAIN_TIMEOUT.
+        """
+        self.drain_timeout = drain_timeout
+        self._condition = threading.Condition()
+        self._pending = deque()
+        self._running: Optional[Tuple[str, Optional[str]]] = None
+        self._done = 0
+        self._failed: List[Tuple[str, str]] = []
+        self._worker: Optional[threading.Thread] = None
+        _QUEUES.add(self)
+
+    def strategy(self) -> 'DeferredCleanAfter':
+        """
+        Returns:
+            DeferredCleanAfter: resource strategy that submits deletions to this queue.
+        """
+        return DeferredCleanAfter(self)
+
+    def submit(self, description: str, delete: Callable[[], None], *, key: Optional[str] = None) -> None:
+        """Delete a resource in the background.
+
+        Args:
+            description (str): description of the resource, used in logs and reports.
+            delete (Callable[[], None]): deletion of the resource.
+            key (Optional[str], optional): fqdn of the resource, see wait_for. Defaults to None.
+        """
+        with self._condition:
+            self._pending.append((description, key, delete))
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._work, name="bq_test_kit_cleanup", daemon=True)
+                self._worker.start()
+            self._condition.notify_all()
+
+    def drain(self, timeout: Optional[float] = None) -> CleanupReport:
+        """Wait for pending deletions, for instance at the end of a test session.
+
+        Args:
+            timeout (Optional[float], optional): seconds to wait. Defaults to drain_timeout.
+
+        Returns:
+            CleanupReport: deletions done, failed and left behind.
+        """
+        drain_timeout = self.drain_timeout if timeout is None else timeout
+        with self._condition:
+            self._condition.wait_for(lambda: not self._pending and self._running is None, drain_timeout)
+            left = [self._running[0]] if self._running is not None else []
+            left += [description for description, _, _ in self._pending]
+            return CleanupReport(self._done, list(self._failed), left)
+
+    def wait_for(self, key: str, timeout: Optional[float] = None) -> bool:
+        """Wait for pending deletions of a resource, so that it is not deleted after being created again.
+
+        Args:
+            key (str): fqdn of the resource.
+            timeout (Optional[float], optional): seconds to wait. Defaults to drain_timeout.
+
+        Returns:
+            bool: True if no deletion of the resource is pending anymore.
+        """
+        def _deleted() -> bool:
+            keys = [pending_key for _, pending_key, _ in self._pending]
+            keys += [self._running[1]] if self._running is not None else []
+            return key not in keys
+        with self._condition:
+            return self._condition.wait_for(_deleted, self.drain_timeout if timeout is None else timeout)
+
+    def drain_at_exit(self) -> None:
+        """Drain the queue and log the deletions left behind, called at interpreter exit.
+        """
+        # failed deletions have already been logged.
+        for description in self.drain().left:
+            logger.warning("%s is still pending deletion after %s seconds. Please delete it yourself.",
+                           description, self.drain_timeout)
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                description, key, delete = self._pending.popleft()
+                self._running = (description, key)
+            error = self._delete(description, delete)
+            with self._condition:
+                if error is None:
+                    self._done += 1
+                else:
+                    self._failed.append((description, error))
+                self._running = None
+                self._condition.notify_all()
+
+    @staticmethod
+    def _delete(description: str, delete: Callable[[], None]) -> Optional[str]:
+        # Catch all kind of exception in order to keep the worker alive and report all of them.
+        # pylint: disable=W0718
+        try:
+            delete()
+            return None
+        except Exception as error:
+            logger.error("Deferred deletion of %s failed: %s", description, error)
+            return str(error)
+
+    def __deepcopy__(self, memo) -> 'CleanupQueue':
+        # a queue is a shared resource, copies of a resource keep using it.
+        return self
+
+
+class DeferredCleanAfter(CleanAfter):
+    """Create before its usage and delete after in the background, see CleanupQueue.
+       Creation waits for a pending deletion of the same resource, as with resources that aren't isolated.
+    """
+
+    def __init__(self, cleanup_queue: CleanupQueue) -> None:
+        self.cleanup_queue = cleanup_queue
+
+    def manage_before(self, bq_resource, create: Optional[Callable[[], None]] = None) -> None:
+        fqdn = bq_resource.fqdn()
+        if not self.cleanup_queue.wait_for(fqdn):
+            logger.warning("%s is still pending deletion after %s seconds, creating it anyway.",
+                           fqdn, self.cleanup_queue.drain_timeout)
+        super().manage_before(bq_resource, create)
+
+    def manage_after(self, bq_resource) -> None:
+        fqdn = bq_resource.fqdn()
+        self.cleanup_queue.submit(f"{type(bq_resource).__name__} {fqdn}", bq_resource.delete, key=fqdn)
+
+    def __deepcopy__(self, memo) -> 'DeferredCleanAfter':
+        return self
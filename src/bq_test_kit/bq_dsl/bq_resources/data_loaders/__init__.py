@@ -8,6 +8,10 @@
 
 from bq_test_kit.bq_dsl.bq_resources.data_loaders.base_data_loader import \
     BaseDataLoader
+from bq_test_kit.bq_dsl.bq_resources.data_loaders.data_load_run import \
+    DataLoadRun
+from bq_test_kit.bq_dsl.bq_resources.data_loaders.data_load_stats import \
+    DataLoadStats
 from bq_test_kit.bq_dsl.bq_resources.data_loaders.dsv_data_loader import \
     DsvDataLoader
 from bq_test_kit.bq_dsl.bq_resources.data_loaders.json_data_loader import \
@@ -15,6 +19,8 @@ from bq_test_kit.bq_dsl.bq_resources.data_loaders.json_data_loader import \
 
 __all__ = [
     "BaseDataLoader",
+    "DataLoadRun",
+    "DataLoadStats",
     "DsvDataLoader",
     "JsonDataLoader"
 ]
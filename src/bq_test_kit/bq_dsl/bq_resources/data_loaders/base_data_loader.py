@@ -6,17 +6,34 @@
 # C0114 disabled because this module contains only one class
 # pylint: disable=C0114
 
-from copy import deepcopy
-from typing import Optional
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from copy import copy, deepcopy
+from typing import List, Optional, Tuple
 
+from google.api_core.exceptions import GoogleAPICallError, NotFound
 from google.cloud.bigquery import LoadJobConfig
 from google.cloud.bigquery.client import Client
-from google.cloud.bigquery.job import WriteDisposition
+from google.cloud.bigquery.job import LoadJob, WriteDisposition
+from google.cloud.bigquery.table import Table as BQTable
 from logzero import logger
 
-from bq_test_kit.constants import DEFAULT_JOB_ID_PREFIX
+from bq_test_kit.bq_dsl.bq_resources.data_loaders.data_load_run import \
+    DataLoadRun
+from bq_test_kit.bq_dsl.bq_resources.data_loaders.data_load_stats import \
+    DataLoadStats
+from bq_test_kit.constants import (DEFAULT_JOB_ID_PREFIX,
+                                   DEFAULT_MAX_CONCURRENCY)
+from bq_test_kit.exceptions import DataLoadException
 from bq_test_kit.resource_loaders.package_file_loader import PackageFileLoader
 
+# errors of a load reported by load_all, any other error is a bug and is raised.
+_LOAD_ERRORS = (GoogleAPICallError, FutureTimeoutError, DataLoadException)
+
 
 class BaseDataLoader():
     """
@@ -24,6 +41,12 @@ class BaseDataLoader():
         relies on file load only.
     """
 
+    FINGERPRINT_LABEL = "bqtk_load"
+    DEFINITION_LABEL = "bqtk_definition"
+    _stats_lock = threading.Lock()
+    _performed = 0
+    _skipped = 0
+
     def __init__(self,
                  *, table, partition: Optional[str] = None, from_: PackageFileLoader,
                  bq_client: Client, load_job_config: LoadJobConfig = LoadJobConfig()):
@@ -43,17 +66,96 @@ class BaseDataLoader():
         self.from_ = from_
         self._bq_client = bq_client
         self.partition = partition
+        self.skip_unchanged = False
 
     def load(self):
         """Load data from the given resource loader into the specified table.
 
         Returns:
-            [type]: [description]
+            Table: table where data has been loaded into.
+        """
+        submitted = self.submit()
+        if submitted:
+            self.complete(*submitted)
+        return self.table
+
+    @staticmethod
+    def load_all(data_loaders: List['BaseDataLoader'],
+                 *, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> List[DataLoadRun]:
+        """Submit all load jobs first, then wait for them together, so that they run concurrently in BigQuery.
+
+        Args:
+            data_loaders (List[BaseDataLoader]): data loaders to run.
+            max_concurrency (int, optional): maximum number of load jobs waited for at the same time.
+                Defaults to bq_test_kit.constants.DEFAULT_MAX_CONCURRENCY.
+
+        Raises:
+            DataLoadException: one or more loads failed, all errors are reported at once.
+
+        Returns:
+            List[DataLoadRun]: outcome of each load, in the order of data_loaders.
         """
+        submissions = []
+        for data_loader in data_loaders:
+            start = time.perf_counter()
+            try:
+                submissions.append((data_loader, start, data_loader.submit(), None))
+            # other loads are submitted anyway in order to report all errors at once.
+            except _LOAD_ERRORS as error:
+                logger.warning("Failed to submit load into %s : %s", data_loader.table.fqdn(), error)
+                submissions.append((data_loader, start, None, error))
+
+        def _wait(submission) -> DataLoadRun:
+            data_loader, start, submitted, error = submission
+            if error is None and submitted:
+                try:
+                    data_loader.complete(*submitted)
+                # other loads are waited for anyway in order to report all errors at once.
+                except _LOAD_ERRORS as load_error:
+                    logger.warning("Failed to load into %s : %s", data_loader.table.fqdn(), load_error)
+                    error = load_error
+            return DataLoadRun(data_loader.table, error, time.perf_counter() - start,
+                               skipped=error is None and not submitted)
+        if not submissions:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(submissions))) as executor:
+            runs = list(executor.map(_wait, submissions))
+        if any(not run.succeeded for run in runs):
+            raise DataLoadException(runs)
+        return runs
+
+    @staticmethod
+    def load_stats() -> DataLoadStats:
+        """
+        Returns:
+            DataLoadStats: number of loads performed and skipped, see skip_if_unchanged.
+        """
+        with BaseDataLoader._stats_lock:
+            return DataLoadStats(BaseDataLoader._performed, BaseDataLoader._skipped)
+
+    @staticmethod
+    def reset_load_stats() -> None:
+        """Reset counters returned by load_stats.
+        """
+        with BaseDataLoader._stats_lock:
+            BaseDataLoader._performed = 0
+            BaseDataLoader._skipped = 0
+
+    def submit(self) -> Optional[Tuple[LoadJob, Optional[str]]]:
+        """Upload data and start the load job, unless data is unchanged. See complete.
+
+        Returns:
+            Optional[Tuple[LoadJob, Optional[str]]]: load job and the fingerprint to store once it is done,
+                None if the load is skipped.
+        """
+        fingerprint = self._fingerprint() if self.skip_unchanged else None
+        if fingerprint and self._loaded_fingerprint() == fingerprint:
+            logger.info("%s is unchanged since its last load into %s, load skipped.",
+                        self.from_.absolute_path(), self._target())
+            self._count(skipped=True)
+            return None
         with open(self.from_.absolute_path(), 'rb') as source_file:
-            fqdn = self.table.fqdn()
-            _partition = "$" + self.partition if self.partition else ""
-            target = fqdn + _partition
+            target = self._target()
             logger.info("Loading %s into %s",
                         self.from_.absolute_path(), target)
             load_job = self._bq_client.load_table_from_file(
@@ -65,8 +167,82 @@ class BaseDataLoader():
                 job_config=self.load_job_config
             )
             logger.info("Job id is : %s", load_job.job_id)
-            load_job.result()
-        return self.table
+        return load_job, fingerprint
+
+    def complete(self, load_job: LoadJob, fingerprint: Optional[str]) -> None:
+        """Wait for a load job started by submit and store the fingerprint of its data.
+
+        Args:
+            load_job (LoadJob): load job returned by submit.
+            fingerprint (Optional[str]): fingerprint returned by submit.
+        """
+        load_job.result()
+        if fingerprint:
+            bqtable = BQTable(self.table.fqdn())
+            bqtable.labels = {self._fingerprint_label(): fingerprint,
+                              self.DEFINITION_LABEL: self._definition_fingerprint(self.table)}
+            self._bq_client.update_table(bqtable, ["labels"])
+        self._count(skipped=False)
+
+    def _target(self) -> str:
+        _partition = "$" + self.partition if self.partition else ""
+        return self.table.fqdn() + _partition
+
+    def _fingerprint(self) -> str:
+        """Hash of the data and of the load job config, short enough to be a label value.
+        """
+        digest = hashlib.sha256()
+        with open(self.from_.absolute_path(), 'rb') as source_file:
+            for block in iter(lambda: source_file.read(1024 * 1024), b""):
+                digest.update(block)
+        digest.update(json.dumps(self.load_job_config.to_api_repr(), sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()[:32]
+
+    @staticmethod
+    def _definition_fingerprint(table) -> str:
+        """Hash of the schema, partitioning and clustering of the table, short enough to be a label value.
+        """
+        # the definition is the one the table is created with.
+        # pylint: disable=W0212
+        api_repr = table._to_bq_table().to_api_repr()
+        definition = {key: api_repr.get(key) for key in ["schema", "timePartitioning", "rangePartitioning",
+                                                         "clustering", "requirePartitionFilter"]}
+        return hashlib.sha256(json.dumps(definition, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+    @staticmethod
+    def is_reusable(table) -> bool:
+        """Tell if the table already exists with the same definition and data loaded with skip_if_unchanged.
+           Such a table may be kept between runs instead of being recreated, see Table.clean_and_keep.
+
+        Args:
+            table (Table): table to check.
+
+        Returns:
+            bool: True if the table may be kept as is.
+        """
+        try:
+            labels = table.show().labels
+        except NotFound:
+            return False
+        return labels.get(BaseDataLoader.DEFINITION_LABEL) == BaseDataLoader._definition_fingerprint(table)
+
+    def _fingerprint_label(self) -> str:
+        return self.FINGERPRINT_LABEL + ("_" + self.partition.lower() if self.partition else "")
+
+    def _loaded_fingerprint(self) -> Optional[str]:
+        try:
+            labels = self._bq_client.get_table(self.table.fqdn()).labels
+        except NotFound:
+            return None
+        return labels.get(self._fingerprint_label())
+
+    @staticmethod
+    def _count(*, skipped: bool) -> None:
+        with BaseDataLoader._stats_lock:
+            if skipped:
+                BaseDataLoader._skipped += 1
+            else:
+                BaseDataLoader._performed += 1
 
     def ignore_unknown_values(self, ignore: bool = True):
         """Ignore extra values not represented in the table schema.
@@ -77,7 +253,7 @@ class BaseDataLoader():
         Returns:
             BaseDataLoader: new instance of the current data loader with ignore_unknown_values set to 'ignore'.
         """
-        data_loader = deepcopy(self)
+        data_loader = self._copy()
         data_loader.load_job_config.ignore_unknown_values = ignore
         return data_loader
 
@@ -87,7 +263,7 @@ class BaseDataLoader():
         Returns:
             BaseDataLoader: new instance of the current data loader with write_disposition set to 'truncate'.
         """
-        data_loader = deepcopy(self)
+        data_loader = self._copy()
         data_loader.load_job_config.write_disposition = WriteDisposition.WRITE_TRUNCATE
         return data_loader
 
@@ -98,7 +274,7 @@ class BaseDataLoader():
         Returns:
             BaseDataLoader: new instance of the current data loader with write_disposition set to 'append'.
         """
-        data_loader = deepcopy(self)
+        data_loader = self._copy()
         data_loader.load_job_config.write_disposition = WriteDisposition.WRITE_APPEND
         return data_loader
 
@@ -108,10 +284,26 @@ class BaseDataLoader():
         Returns:
             BaseDataLoader: new instance of the current data loader with ignore_unknown_values set to 'ignore'.
         """
-        data_loader = deepcopy(self)
+        data_loader = self._copy()
         data_loader.load_job_config.write_disposition = WriteDisposition.WRITE_EMPTY
         return data_loader
 
+    def skip_if_unchanged(self, skip: bool = True):
+        """Skip the load when the same data has already been loaded with the same config into the same target.
+           A fingerprint of the last load is stored in the table labels, thus it's only useful with tables kept
+           between runs, such as tables managed by clean_and_keep(keep_loaded=True).
+           With several appends into the same target, only the last one may be skipped.
+
+        Args:
+            skip (bool, optional): skip unchanged loads. Defaults to True.
+
+        Returns:
+            BaseDataLoader: new instance of the current data loader with skip_unchanged set to 'skip'.
+        """
+        data_loader = self._copy()
+        data_loader.skip_unchanged = skip
+        return data_loader
+
     def to_partition(self, partition: str):
         """Specify a partition where the data has to be loaded into. Used as a decorator.
 
@@ -121,12 +313,23 @@ class BaseDataLoader():
         Returns:
             BaseDataLoader: new instance of the current data loader with ignore_unknown_values set to 'ignore'.
         """
-        data_loader = deepcopy(self)
+        data_loader = self._copy()
         data_loader.partition = partition
         return data_loader
 
+    def _copy(self):
+        """Copy sharing the table and the resource loader, which are never mutated.
+           Only load job config is copied since fluent methods update it.
+
+        Returns:
+            BaseDataLoader: new instance of the current data loader.
+        """
+        data_loader = copy(self)
+        data_loader.load_job_config = deepcopy(self.load_job_config)
+        return data_loader
+
     def _deepcopy_base_data_loader(self, target_type, memo, **kwargs):
-        return target_type(
+        data_loader = target_type(
             table=deepcopy(self.table, memo),
             from_=deepcopy(self.from_, memo),
             partition=deepcopy(self.partition, memo),
@@ -136,6 +339,8 @@ class BaseDataLoader():
             load_job_config=deepcopy(self.load_job_config, memo),
             **kwargs
         )
+        data_loader.skip_unchanged = self.skip_unchanged
+        return data_loader
 
     def __deepcopy__(self, memo):
         return self._deepcopy_base_data_loader(BaseDataLoader, memo)
@@ -0,0 +1,27 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+# C0114 disabled because this module contains only one class
+# pylint: disable=C0114
+
+from typing import Any, NamedTuple, Optional
+
+
+class DataLoadRun(NamedTuple):
+    """Outcome of a data load among many others, see BaseDataLoader.load_all.
+       duration is the wall time in seconds from the upload of the data until the end of the load job.
+    """
+    table: Any
+    error: Optional[BaseException]
+    duration: float
+    skipped: bool = False
+
+    @property
+    def succeeded(self) -> bool:
+        """
+        Returns:
+            bool: True if data has been loaded or the load skipped, without error.
+        """
+        return self.error is None
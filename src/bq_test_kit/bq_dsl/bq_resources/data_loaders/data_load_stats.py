@@ -0,0 +1,17 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+# C0114 disabled because this module contains only one class
+# pylint: disable=C0114
+
+from typing import NamedTuple
+
+
+class DataLoadStats(NamedTuple):
+    """Counters of data loads since the start of the process or the last reset.
+       skipped counts loads of unchanged data, see BaseDataLoader.skip_if_unchanged.
+    """
+    performed: int
+    skipped: int
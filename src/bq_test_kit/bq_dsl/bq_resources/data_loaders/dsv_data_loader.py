@@ -51,7 +51,7 @@ class DsvDataLoader(BaseDataLoader, RawFileLoaderMixin):
         Returns:
             DsvDataLoader: new instance of DsvDataLoader with allow_jagged_rows set to 'allow'.
         """
-        data_loader = deepcopy(self)
+        data_loader = self._copy()
         data_loader.load_job_config.allow_jagged_rows = allow
         return data_loader
 
@@ -64,7 +64,7 @@ class DsvDataLoader(BaseDataLoader, RawFileLoaderMixin):
         Returns:
             DsvDataLoader: new instance of DsvDataLoader with allow_quoted_newlines set to 'allow'.
         """
-        data_loader = deepcopy(self)
+        data_loader = self._copy()
         data_loader.load_job_config.allow_quoted_newlines = allow
         return data_loader
 
@@ -77,7 +77,7 @@ class DsvDataLoader(BaseDataLoader, RawFileLoaderMixin):
         Returns:
             DsvDataLoader: new instance of DsvDataLoader with updated field_delimiter.
         """
-        data_loader = deepcopy(self)
+        data_loader = self._copy()
         data_loader.load_job_config.field_delimiter = delimiter
         return data_loader
 
@@ -90,7 +90,7 @@ class DsvDataLoader(BaseDataLoader, RawFileLoaderMixin):
         Returns:
             DsvDataLoader: new instance of DsvDataLoader with updated null marker.
         """
-        data_loader = deepcopy(self)
+        data_loader = self._copy()
         data_loader.load_job_config.null_marker = marker
         return data_loader
 
@@ -103,7 +103,7 @@ class DsvDataLoader(BaseDataLoader, RawFileLoaderMixin):
         Returns:
             DsvDataLoader: new instance of DsvDataLoader with updated quote character.
         """
-        data_loader = deepcopy(self)
+        data_loader = self._copy()
         data_loader.load_job_config.quote_character = char
         return data_loader
 
@@ -116,7 +116,7 @@ class DsvDataLoader(BaseDataLoader, RawFileLoaderMixin):
         Returns:
             DsvDataLoader: new instance of DsvDataLoader with updated leading rows to skip.
         """
-        data_loader = deepcopy(self)
+        data_loader = self._copy()
         data_loader.load_job_config.skip_leading_rows = nb_lines
         return data_loader
 
@@ -6,8 +6,6 @@
 # C0114 disabled because this module contains only one class
 # pylint: disable=C0114
 
-from copy import deepcopy
-
 
 class RawFileLoaderMixin():
     """This module provide features available for all raw file loader.
@@ -22,7 +20,7 @@ class RawFileLoaderMixin():
         Returns:
             BaseDataLoader: return a new instance of the current type
         """
-        data_loader = deepcopy(self)
+        data_loader = self._copy()
         data_loader.load_job_config.encoding = encoding
         return data_loader
 
@@ -35,6 +33,6 @@ class RawFileLoaderMixin():
         Returns:
             BaseDataLoader: return a new instance of the current type
         """
-        data_loader = deepcopy(self)
+        data_loader = self._copy()
         data_loader.load_job_config.autodetect = active
         return data_loader
@@ -5,8 +5,11 @@
 
 # C0114 disabled because this module contains only one class
 # pylint: disable=C0114
+# W0212 disabled because resources of the same tree maintain each other's name index
+# pylint: disable=W0212
 
-from copy import deepcopy
+from copy import copy, deepcopy
+from datetime import timedelta
 from typing import List, Optional
 
 from google.cloud.bigquery.client import Client
@@ -15,10 +18,13 @@ from google.cloud.bigquery.schema import SchemaField
 from logzero import logger
 
 from bq_test_kit.bq_dsl.bq_resources.base_bq_resource import BaseBQResource
+from bq_test_kit.bq_dsl.bq_resources.dataset_pool import DatasetPool
 from bq_test_kit.bq_dsl.bq_resources.resource_strategy import (
-    BaseResourceStrategy, CleanAfter, CleanBeforeAndKeepAfter, Noop)
+    BaseResourceStrategy, CleanAfter, CleanAfterWithContents,
+    CleanBeforeAndKeepAfter, ExpireAfter, Noop)
 from bq_test_kit.bq_dsl.bq_resources.table import Table
 from bq_test_kit.bq_test_kit_config import BQTestKitConfig
+from bq_test_kit.constants import DEFAULT_RESOURCE_TTL
 
 
 class Dataset(BaseBQResource):
@@ -65,18 +71,25 @@ class Dataset(BaseBQResource):
 
     def __enter__(self):
         dataset_strategy = self.resource_strategy
-        dataset_strategy.before(self.delete, self.create)
+        dataset_strategy.manage_before(self)
         return self
 
     def __exit__(self, exception_type, exception_value, traceback) -> None:
         dataset_strategy = self.resource_strategy
-        dataset_strategy.after(self.delete)
+        dataset_strategy.manage_after(self)
 
     def fqdn(self) -> str:
         project_fqdn = self.project.fqdn()
         final_name = self.isolate_func(self)
         return f"{project_fqdn}.{final_name}"
 
+    def is_isolated(self) -> bool:
+        """
+        Returns:
+            bool: True if the name of the dataset is changed by its isolation function.
+        """
+        return self.isolate_func(self) != self.name
+
     def table(self, name: str,
               *, alias: Optional[str] = None,
               schema: List[SchemaField] = None) -> Table:
@@ -90,13 +103,40 @@ class Dataset(BaseBQResource):
         Returns:
             Table: Table datasetL
         """
-        table = next((t for t in self.tables if t.name == name), None)
-        if not table:
-            dataset = deepcopy(self)
-            table_schema = schema if schema else []
-            table = Table(name, from_dataset=dataset, alias=alias, schema=table_schema, bq_client=self._bq_client,
-                          bqtk_config=self.bqtk_config)
-            dataset.tables.append(table)
+        if name in self._tables:
+            return self._bound_table(name)
+        dataset = self._copy()
+        table_schema = schema if schema else []
+        table = Table(name, from_dataset=dataset, alias=alias, schema=table_schema, bq_client=self._bq_client,
+                      bqtk_config=self.bqtk_config)
+        dataset._tables[name] = table
+        return table
+
+    @property
+    def tables(self) -> List[Table]:
+        """
+        Returns:
+            List[Table]: tables of this dataset, in the order they were defined.
+        """
+        return [self._bound_table(name) for name in list(self._tables)]
+
+    @tables.setter
+    def tables(self, tables: List[Table]) -> None:
+        """Set tables of this dataset, indexed by name.
+
+        Args:
+            tables (List[Table]): tables of this dataset.
+        """
+        self._tables = {table.name: table for table in tables}
+
+    def _bound_table(self, name: str) -> Table:
+        """Tables are not copied along with the dataset, see _rebind.
+           They are rebound to this dataset on first access instead.
+        """
+        table = self._tables[name]
+        if table.dataset is not self:
+            table = table._rebind(self)
+            self._tables[name] = table
         return table
 
     def isolate(self, *, with_=None):
@@ -112,7 +152,7 @@ class Dataset(BaseBQResource):
         """
         if not with_:
             with_ = self.isolate_with_context()
-        dataset = deepcopy(self)
+        dataset = self._copy()
         dataset.isolate_func = with_
         return dataset
 
@@ -122,7 +162,7 @@ class Dataset(BaseBQResource):
         Returns:
             Dataset: new instance of Dataset with noop strategy.
         """
-        dataset = deepcopy(self)
+        dataset = self._copy()
         dataset.resource_strategy = Noop()
         return dataset
 
@@ -132,10 +172,52 @@ class Dataset(BaseBQResource):
         Returns:
             Dataset: new instance of Dataset with CleanBeforeAndKeepAfter strategy.
         """
-        dataset = deepcopy(self)
+        dataset = self._copy()
         dataset.resource_strategy = CleanBeforeAndKeepAfter()
         return dataset
 
+    def pooled(self, pool: DatasetPool):
+        """Lease the dataset from a pool when entered instead of creating and deleting it.
+           Tables are dropped when the dataset is returned to the pool.
+
+        Args:
+            pool (DatasetPool): pool of pre-created datasets.
+
+        Returns:
+            Dataset: new instance of Dataset named and managed by the pool.
+        """
+        dataset = self._copy()
+        dataset.resource_strategy = pool.strategy()
+        dataset.isolate_func = pool.name_of
+        return dataset
+
+    def clean_with_contents(self):
+        """Create before its usage and delete it along with its tables after, in a single call.
+           Tables are then not deleted one by one. Only applies if the dataset is isolated,
+           otherwise tables and dataset are deleted as with the default strategy.
+
+        Returns:
+            Dataset: new instance of Dataset with CleanAfterWithContents strategy.
+        """
+        dataset = self._copy()
+        dataset.resource_strategy = CleanAfterWithContents()
+        return dataset
+
+    def expire_after(self, ttl: timedelta = timedelta(seconds=DEFAULT_RESOURCE_TTL)):
+        """Create with a default expiration of its tables and let BigQuery delete them.
+           The dataset itself can't expire, it is left behind without any deletion attempt.
+
+        Args:
+            ttl (timedelta, optional): time to live from its creation.
+                Defaults to bq_test_kit.constants.DEFAULT_RESOURCE_TTL seconds.
+
+        Returns:
+            Dataset: new instance of Dataset with ExpireAfter strategy.
+        """
+        dataset = self._copy()
+        dataset.resource_strategy = ExpireAfter(ttl)
+        return dataset
+
     def with_resource_strategy(self, resource_strategy: BaseResourceStrategy):
         """Prevent management of the table
 
@@ -145,7 +227,7 @@ class Dataset(BaseBQResource):
         Returns:
             Table: new instance of Table with the resource_strategy
         """
-        dataset = deepcopy(self)
+        dataset = self._copy()
         dataset.resource_strategy = resource_strategy
         return dataset
 
@@ -158,7 +240,7 @@ class Dataset(BaseBQResource):
         Returns:
             Dataset: new instance of Dataset with create options.
         """
-        dataset = deepcopy(self)
+        dataset = self._copy()
         dataset.create_options = create_options
         return dataset
 
@@ -171,18 +253,22 @@ class Dataset(BaseBQResource):
         Returns:
             Dataset: new instance of Dataset with location.
         """
-        dataset = deepcopy(self)
+        dataset = self._copy()
         dataset.location = location
         return dataset
 
     def create(self) -> None:
         """Create dataset with the computed fqdn and the specified create options.
+           Tables of the dataset expire by default after the expiration of its resource strategy, if any.
         """
         fqdn = self.fqdn()
         logger.info("Creating dataset %s", fqdn)
         try:
             bqdataset: BQDataset = BQDataset(fqdn)
             bqdataset.location = self.location
+            expiration = self.resource_strategy.expiration
+            if expiration is not None:
+                bqdataset.default_table_expiration_ms = int(expiration.total_seconds() * 1000)
             self._bq_client.create_dataset(bqdataset, **self.create_options)
         except Exception:
             logger.error("Failed to create dataset %s at %s with options %s.",
@@ -202,16 +288,20 @@ class Dataset(BaseBQResource):
         logger.info("Deleting dataset %s", fqdn)
         return self._bq_client.get_dataset(fqdn)
 
-    def delete(self) -> None:
+    def delete(self, *, delete_contents: bool = False) -> None:
         """Delete current dataset. Doesn't throw any exception when dataset doesn't exist.
-           Prevent deletion of the dataset when tables still exist under it for security reason.
+           Prevent deletion of the dataset when tables still exist under it for security reason,
+           unless delete_contents is set.
+
+        Args:
+            delete_contents (bool, optional): delete tables of the dataset as well. Defaults to False.
         """
         fqdn = self.fqdn()
-        logger.info("Deleting dataset %s", fqdn)
+        logger.info("Deleting dataset %s%s", fqdn, " with its contents" if delete_contents else "")
         try:
             bqdataset: BQDataset = BQDataset(fqdn)
             self._bq_client.delete_dataset(bqdataset,
-                                           delete_contents=False,
+                                           delete_contents=delete_contents,
                                            not_found_ok=True)
         except Exception:
             logger.error("Failed to delete dataset %s. Please delete it yourself.", fqdn)
@@ -238,10 +328,32 @@ class Dataset(BaseBQResource):
         self._project = project
         self.dataset = project.dataset
 
+    def _copy(self) -> 'Dataset':
+        """Copy sharing attributes and tables with the current instance, see Project._copy.
+
+        Returns:
+            Dataset: new instance of Dataset, registered in a new instance of its project.
+        """
+        project = self.project._copy()
+        dataset = self._rebind(project)
+        if self.name in project._datasets:
+            project._datasets[self.name] = dataset
+        return dataset
+
+    def _rebind(self, project) -> 'Dataset':
+        dataset = copy(self)
+        dataset.project = project
+        dataset._tables = dict(self._tables)
+        return dataset
+
     def __deepcopy__(self, memo):
+        project = deepcopy(self.project, memo)
+        if id(self) in memo:
+            # already copied along with its project
+            return memo[id(self)]
         dataset = Dataset(
             deepcopy(self.name, memo),
-            project=deepcopy(self.project, memo),
+            project=project,
             # copy is not done because bq client have non-trivial state
             # that is local and unpickleable
             bq_client=self._bq_client,
@@ -249,9 +361,11 @@ class Dataset(BaseBQResource):
             resource_strategy=deepcopy(self.resource_strategy, memo),
             isolate_with=deepcopy(self.isolate_func, memo),
             location=deepcopy(self.location, memo),
-            tables=deepcopy(self.tables, memo),
             **deepcopy(self.create_options, memo)
         )
+        # registered before copying tables since they refer back to their dataset
+        memo[id(self)] = dataset
+        dataset.tables = deepcopy(self.tables, memo)
         dataset.project.datasets = [dataset if self.name == pd.name else pd for pd in dataset.project.datasets]
         for table in dataset.tables:
             table.dataset = dataset
@@ -0,0 +1,337 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+    Pool of datasets that are created once and leased to test sessions, possibly running in several processes.
+"""
+
+import atexit
+import os
+import re
+import socket
+import tempfile
+import threading
+import time
+import weakref
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from google.api_core.exceptions import NotFound
+from google.cloud.bigquery.client import Client
+from google.cloud.bigquery.dataset import Dataset as BQDataset
+from logzero import logger
+
+from bq_test_kit.bq_dsl.bq_resources.resource_strategy import \
+    BaseResourceStrategy
+from bq_test_kit.constants import (DEFAULT_DATASET_POOL_LEASE_TIMEOUT,
+                                   DEFAULT_DATASET_POOL_POLL_INTERVAL,
+                                   DEFAULT_DATASET_POOL_SIZE)
+from bq_test_kit.exceptions import DatasetPoolExhaustedException
+
+PoolKey = Tuple[str, str]
+
+# pools of the process, whose leases are returned at exit.
+_POOLS = weakref.WeakSet()
+
+
+def _release_all_pools() -> None:
+    for pool in list(_POOLS):
+        pool.release_all()
+
+
+atexit.register(_release_all_pools)
+
+
+class DatasetPoolStats(NamedTuple):
+    """Counters of a DatasetPool in the current process.
+       waits is the number of leases that had to wait for a dataset to be returned.
+    """
+    leases: int
+    returns: int
+    created: int
+    waits: int
+    in_use: int
+
+
+class DatasetPool():
+    """Lease datasets named <name>_pool_<host_id>_<slot>, slot being lower than max_size.
+       Leases are lock files shared by all processes of the host, thus pytest-xdist workers share the pool.
+       Hosts lease distinct datasets since their id is part of the name, lock files being local to each host.
+       Datasets are created on their first lease and never deleted : they are emptied when returned.
+       Datasets returned without being emptied, at exit or by a dead process, are emptied on their next lease.
+       Threads of a process share the lease of a dataset, which is returned once all of them have released it.
+    """
+
+    def __init__(self, bq_client: Client,
+                 *, max_size: int = DEFAULT_DATASET_POOL_SIZE,
+                 host_id: Optional[str] = None,
+                 lease_directory: Optional[str] = None,
+                 lease_timeout: float = DEFAULT_DATASET_POOL_LEASE_TIMEOUT,
+                 poll_interval: float = DEFAULT_DATASET_POOL_POLL_INTERVAL) -> None:
+        """Constructor of DatasetPool.
+
+        Args:
+            bq_client (Client): instance of bigquery client used to create and empty datasets.
+            max_size (int, optional): maximum number of datasets per dataset name.
+                Defaults to bq_test_kit.constants.DEFAULT_DATASET_POOL_SIZE.
+            host_id (Optional[str], optional): id of the host in dataset names, letters, digits and underscores only.
+                Defaults to the host name, other characters being replaced by underscores.
+            lease_directory (Optional[str], optional): directory of lease files.
+                Defaults to bq_test_kit_dataset_pool in the temp directory.
+            lease_timeout (float, optional): seconds to wait for a dataset to be returned when all are leased.
+                Defaults to bq_test_kit.constants.DEFAULT_DATASET_POOL_LEASE_TIMEOUT.
+            poll_interval (float, optional): seconds between two attempts to lease a dataset.
+                Defaults to bq_test_kit.constants.DEFAULT_DATASET_POOL_POLL_INTERVAL.
+        """
+        # Options are keyword only.
+        # pylint: disable=R0913
+        self._bq_client = bq_client
+        self.max_size = max_size
+        self.host_id = host_id if host_id else re.sub(r"\W", "_", socket.gethostname())
+        self.lease_directory = (lease_directory if lease_directory
+                                else os.path.join(tempfile.gettempdir(), "bq_test_kit_dataset_pool"))
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+        self._lock = threading.RLock()
+        self._leases: Dict[PoolKey, int] = {}
+        self._references: Dict[PoolKey, int] = {}
+        self._dirty = set()
+        self._existing = set()
+        self._leases_count = 0
+        self._returns_count = 0
+        self._created_count = 0
+        self._waits_count = 0
+        _POOLS.add(self)
+
+    def strategy(self) -> 'PooledDataset':
+        """
+        Returns:
+            PooledDataset: resource strategy that leases datasets from this pool.
+        """
+        return PooledDataset(self)
+
+    def name_of(self, dataset) -> str:
+        """Isolation function of pooled datasets, see Dataset.isolate.
+           Datasets are leased by acquire, those not leased yet are named <name>_pool.
+
+        Args:
+            dataset (Dataset): pooled dataset.
+
+        Returns:
+            str: name of the leased dataset.
+        """
+        with self._lock:
+            slot = self._leases.get(self._key(dataset))
+        return f"{dataset.name}_pool" if slot is None else self._slot_name(dataset.name, slot)
+
+    def lease(self, dataset) -> str:
+        """Lease a dataset if not done yet, waiting for one to be returned when all of them are leased.
+
+        Args:
+            dataset (Dataset): dataset to lease.
+
+        Raises:
+            DatasetPoolExhaustedException: no dataset has been returned within lease_timeout.
+
+        Returns:
+            str: name of the leased dataset.
+        """
+        key = self._key(dataset)
+        deadline = time.monotonic() + self.lease_timeout
+        waited = False
+        while True:
+            with self._lock:
+                slot = self._leases.get(key)
+                if slot is not None:
+                    return self._slot_name(dataset.name, slot)
+                os.makedirs(self.lease_directory, exist_ok=True)
+                slot = next((slot for slot in range(self.max_size) if self._try_lease(key, slot)), None)
+                if slot is not None:
+                    logger.info("Dataset %s has been leased.", self._slot_name(dataset.name, slot))
+                    self._leases[key] = slot
+                    if os.path.exists(self._dirty_file(key, slot)):
+                        self._dirty.add(key)
+                    self._leases_count += 1
+                    self._waits_count += 1 if waited else 0
+                    return self._slot_name(dataset.name, slot)
+            if time.monotonic() >= deadline:
+                raise DatasetPoolExhaustedException(dataset.name, self.max_size, self.lease_timeout)
+            waited = True
+            time.sleep(self.poll_interval)
+
+    def acquire(self, dataset) -> None:
+        """Lease a dataset if not done yet and create it if it does not exist.
+           A dataset that has not been emptied when it was returned is emptied first.
+           Each acquire must be followed by a release.
+
+        Args:
+            dataset (Dataset): dataset to lease.
+        """
+        self.lease(dataset)
+        key = self._key(dataset)
+        fqdn = dataset.fqdn()
+        with self._lock:
+            self._references[key] = self._references.get(key, 0) + 1
+            # emptied while holding the lock so that other threads don't use the dataset in the meantime.
+            if key in self._dirty:
+                try:
+                    self._empty(fqdn)
+                except NotFound:
+                    pass
+                self._dirty.discard(key)
+                self._remove_file(self._dirty_file(key, self._leases[key]))
+            if fqdn in self._existing:
+                return
+        try:
+            self._bq_client.get_dataset(fqdn)
+        except NotFound:
+            logger.info("Creating pooled dataset %s", fqdn)
+            bqdataset = BQDataset(fqdn)
+            bqdataset.location = dataset.location
+            self._bq_client.create_dataset(bqdataset, exists_ok=True)
+            with self._lock:
+                self._created_count += 1
+        with self._lock:
+            self._existing.add(fqdn)
+
+    def release(self, dataset) -> None:
+        """Drop all tables of the leased dataset and return it to the pool,
+           unless other threads of the process still use it.
+
+        Args:
+            dataset (Dataset): dataset to return.
+        """
+        key = self._key(dataset)
+        fqdn = dataset.fqdn()
+        with self._lock:
+            if key not in self._leases:
+                return
+            references = self._references.pop(key, 1) - 1
+            if references > 0:
+                self._references[key] = references
+                logger.info("Dataset %s is still in use, it is returned to the pool later.", fqdn)
+                return
+            # the lease file is kept until the dataset is emptied, next leases of the process take another slot.
+            slot = self._leases.pop(key)
+        emptied = False
+        try:
+            self._empty(fqdn)
+            emptied = True
+        finally:
+            with self._lock:
+                if not emptied:
+                    self._mark_dirty(key, slot)
+                self._remove_lease_file(key, slot)
+                self._returns_count += 1
+            logger.info("Dataset %s has been returned to the pool.", fqdn)
+
+    def release_all(self) -> None:
+        """Return all datasets leased by this process without emptying them, they are emptied on their next lease.
+           Called at exit for datasets whose context has not been exited.
+        """
+        with self._lock:
+            for key, slot in list(self._leases.items()):
+                self._mark_dirty(key, slot)
+                self._remove_lease_file(key, slot)
+            self._leases.clear()
+            self._references.clear()
+            self._dirty.clear()
+
+    def stats(self) -> DatasetPoolStats:
+        """
+        Returns:
+            DatasetPoolStats: leases, returns, creations and waits in the current process.
+        """
+        with self._lock:
+            return DatasetPoolStats(self._leases_count, self._returns_count, self._created_count,
+                                    self._waits_count, len(self._leases))
+
+    def _empty(self, fqdn: str) -> None:
+        for table in self._bq_client.list_tables(fqdn):
+            logger.info("Dropping %s.%s of pooled dataset", fqdn, table.table_id)
+            self._bq_client.delete_table(table, not_found_ok=True)
+
+    def _try_lease(self, key: PoolKey, slot: int) -> bool:
+        path = self._lease_file(key, slot)
+        try:
+            lease_file = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if not self._is_stale(path):
+                return False
+            logger.warning("Lease %s belongs to a dead process, taking it over.", path)
+            self._mark_dirty(key, slot)
+            self._remove_file(path)
+            return self._try_lease(key, slot)
+        with os.fdopen(lease_file, "w", encoding="utf-8") as lease:
+            lease.write(str(os.getpid()))
+        return True
+
+    @staticmethod
+    def _is_stale(path: str) -> bool:
+        if os.name != "posix":
+            return False
+        try:
+            with open(path, "r", encoding="utf-8") as lease:
+                pid = int(lease.read())
+            os.kill(pid, 0)
+        except (ValueError, FileNotFoundError):
+            # lease is being written or has just been removed.
+            return False
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            return False
+        return False
+
+    def _remove_lease_file(self, key: PoolKey, slot: int) -> None:
+        self._remove_file(self._lease_file(key, slot))
+
+    def _mark_dirty(self, key: PoolKey, slot: int) -> None:
+        with open(self._dirty_file(key, slot), "w", encoding="utf-8"):
+            pass
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _lease_file(self, key: PoolKey, slot: int) -> str:
+        project, name = key
+        return os.path.join(self.lease_directory, f"{project}.{self._slot_name(name, slot)}.lease")
+
+    def _dirty_file(self, key: PoolKey, slot: int) -> str:
+        return self._lease_file(key, slot) + ".dirty"
+
+    def _slot_name(self, name: str, slot: int) -> str:
+        return f"{name}_pool_{self.host_id}_{slot}"
+
+    @staticmethod
+    def _key(dataset) -> PoolKey:
+        return dataset.project.fqdn(), dataset.name
+
+    def __deepcopy__(self, memo) -> 'DatasetPool':
+        # a pool is a shared resource, copies of a dataset keep using it.
+        return self
+
+
+# W0223 disabled because the pool needs the dataset itself, thus only manage_before and manage_after apply.
+# pylint: disable=W0223
+class PooledDataset(BaseResourceStrategy):
+    """Lease a dataset before its usage and return it emptied after, see DatasetPool.
+       Only applies to datasets since the pool manages dataset names, see Dataset.pooled.
+    """
+
+    def __init__(self, pool: DatasetPool) -> None:
+        self.pool = pool
+
+    def manage_before(self, bq_resource, create: Optional[Callable[[], None]] = None) -> None:
+        self.pool.acquire(bq_resource)
+
+    def manage_after(self, bq_resource) -> None:
+        self.pool.release(bq_resource)
+
+    def __deepcopy__(self, memo) -> 'PooledDataset':
+        return self
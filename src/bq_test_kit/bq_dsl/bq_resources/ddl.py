@@ -0,0 +1,86 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+    Render BigQuery tables as DDL statements, so that many of them may be created by a single script.
+"""
+
+import json
+from typing import List, Optional
+
+from google.cloud.bigquery.schema import SchemaField
+from google.cloud.bigquery.table import Table as BQTable
+
+from bq_test_kit.bq_dsl.schema_mixin import SchemaMixin
+
+_TRUNC_FUNCTIONS = {
+    "DATE": "DATE_TRUNC",
+    "DATETIME": "DATETIME_TRUNC",
+    "TIMESTAMP": "TIMESTAMP_TRUNC"
+}
+
+
+def create_table_statement(bqtable: BQTable, *, if_not_exists: bool = False) -> str:
+    """Render the CREATE TABLE statement of a table as given to Client.create_table,
+       that is to say once partition and clustering have been applied.
+
+    Args:
+        bqtable (BQTable): table to render, with a non empty schema.
+        if_not_exists (bool, optional): don't fail if the table already exists. Defaults to False.
+
+    Returns:
+        str: CREATE TABLE statement.
+    """
+    statement = "CREATE TABLE IF NOT EXISTS" if if_not_exists else "CREATE TABLE"
+    columns = ",\n".join(f"  {_column(field)}" for field in bqtable.schema)
+    ddl = f"{statement} `{bqtable.project}.{bqtable.dataset_id}.{bqtable.table_id}` (\n{columns}\n)"
+    partition_expression = _partition_expression(bqtable)
+    if partition_expression:
+        ddl += f"\nPARTITION BY {partition_expression}"
+    if bqtable.clustering_fields:
+        ddl += "\nCLUSTER BY " + ", ".join(f"`{field}`" for field in bqtable.clustering_fields)
+    if bqtable.expires:
+        ddl += f'\nOPTIONS(expiration_timestamp=TIMESTAMP "{bqtable.expires.isoformat()}")'
+    return ddl
+
+
+def _column(field: SchemaField) -> str:
+    # fields of records are rendered as columns as well, keeping their mode and description.
+    column = f"`{field.name}` {_column_type(field)}"
+    if field.mode and field.mode.upper() == "REQUIRED":
+        column += " NOT NULL"
+    if field.description:
+        column += f" OPTIONS(description={json.dumps(field.description)})"
+    return column
+
+
+def _column_type(field: SchemaField) -> str:
+    if field.field_type.upper() in ("RECORD", "STRUCT"):
+        column_type = "STRUCT<" + ", ".join(_column(nested_field) for nested_field in field.fields) + ">"
+    else:
+        column_type = SchemaMixin.generate_data_type(SchemaField(field.name, field.field_type))
+    return f"ARRAY<{column_type}>" if field.mode and field.mode.upper() == "REPEATED" else column_type
+
+
+def _partition_expression(bqtable: BQTable) -> Optional[str]:
+    if bqtable.range_partitioning:
+        range_partitioning = bqtable.range_partitioning
+        partition_range = range_partitioning.range_
+        return (f"RANGE_BUCKET(`{range_partitioning.field}`, GENERATE_ARRAY("
+                f"{partition_range.start}, {partition_range.end}, {partition_range.interval}))")
+    if bqtable.time_partitioning:
+        unit = bqtable.time_partitioning.type_
+        field = bqtable.time_partitioning.field
+        if field is None:
+            return "_PARTITIONDATE" if unit == "DAY" else f"TIMESTAMP_TRUNC(_PARTITIONTIME, {unit})"
+        field_type = _field_type(bqtable.schema, field)
+        if field_type == "DATE" and unit == "DAY":
+            return f"`{field}`"
+        return f"{_TRUNC_FUNCTIONS.get(field_type, 'TIMESTAMP_TRUNC')}(`{field}`, {unit})"
+    return None
+
+
+def _field_type(schema: List[SchemaField], name: str) -> Optional[str]:
+    return next((field.field_type.upper() for field in schema if field.name == name), None)
@@ -5,8 +5,10 @@
 
 # C0114 disabled because this module contains only one class
 # pylint: disable=C0114
+# W0212 disabled because resources of the same tree maintain each other's name index
+# pylint: disable=W0212
 
-from copy import deepcopy
+from copy import copy, deepcopy
 from typing import List
 
 from google.cloud.bigquery.client import Client
@@ -46,11 +48,38 @@ class Project(BaseBQResource):
         Returns:
             Dataset: dataset DSL.
         """
-        dataset = next((d for d in self.datasets if d.name == name), None)
-        if not dataset:
-            new_project = deepcopy(self)
-            dataset = Dataset(name, project=new_project, bq_client=self._bq_client, bqtk_config=self.bqtk_config)
-            new_project.datasets.append(dataset)
+        if name in self._datasets:
+            return self._bound_dataset(name)
+        new_project = self._copy()
+        dataset = Dataset(name, project=new_project, bq_client=self._bq_client, bqtk_config=self.bqtk_config)
+        new_project._datasets[name] = dataset
+        return dataset
+
+    @property
+    def datasets(self) -> List[Dataset]:
+        """
+        Returns:
+            List[Dataset]: datasets of this project, in the order they were defined.
+        """
+        return [self._bound_dataset(name) for name in list(self._datasets)]
+
+    @datasets.setter
+    def datasets(self, datasets: List[Dataset]) -> None:
+        """Set datasets of this project, indexed by name.
+
+        Args:
+            datasets (List[Dataset]): datasets of this project.
+        """
+        self._datasets = {dataset.name: dataset for dataset in datasets}
+
+    def _bound_dataset(self, name: str) -> Dataset:
+        """Datasets are not copied along with the project, see _copy.
+           They are rebound to this project on first access instead.
+        """
+        dataset = self._datasets[name]
+        if dataset.project is not self:
+            dataset = dataset._rebind(self)
+            self._datasets[name] = dataset
         return dataset
 
     def fqdn(self) -> str:
@@ -62,15 +91,29 @@ class Project(BaseBQResource):
     def __exit__(self, exception_type, exception_value, traceback) -> None:
         pass
 
+    def _copy(self) -> 'Project':
+        """Copy sharing attributes and datasets with the current instance.
+           Fluent methods replace attributes instead of mutating them, thus sharing is safe.
+           Only the index of datasets is copied, datasets are rebound lazily, see _bound_dataset.
+
+        Returns:
+            Project: new instance of Project.
+        """
+        new_project = copy(self)
+        new_project._datasets = dict(self._datasets)
+        return new_project
+
     def __deepcopy__(self, memo):
         new_project = Project(
             deepcopy(self.name, memo),
             # copy is not done because bq client have non-trivial state
             # that is local and unpickleable
             bq_client=self._bq_client,
-            bqtk_config=deepcopy(self.bqtk_config, memo),
-            datasets=deepcopy(self.datasets, memo)
+            bqtk_config=deepcopy(self.bqtk_config, memo)
         )
+        # registered before copying datasets since they refer back to their project
+        memo[id(self)] = new_project
+        new_project.datasets = deepcopy(self.datasets, memo)
         for dataset in new_project.datasets:
             dataset.project = new_project
         return new_project
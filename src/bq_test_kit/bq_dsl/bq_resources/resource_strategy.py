@@ -7,13 +7,44 @@
     This module contains all kind of resource strategy.
 """
 
-from typing import Callable
+# Disabled check of cyclic import, tables are imported by CleanBeforeAndKeepAfter when used only.
+# pylint: disable=R0401
+
+from datetime import timedelta
+from typing import Callable, Optional
+
+from logzero import logger
+
+from bq_test_kit.constants import DEFAULT_RESOURCE_TTL
 
 
 class BaseResourceStrategy():
     """Resource management strategy to use with BaseBQResource.
+       Strategies implement before and after, given the methods of the resource,
+       or manage_before and manage_after when they need the resource itself.
     """
 
+    # fqdn of the resources deleted along with their contents, see deletes_contents_of.
+    _deleted_with_contents = frozenset()
+
+    def manage_before(self, bq_resource, create: Optional[Callable[[], None]] = None) -> None:
+        """Apply management strategy on bq_resource before its usage. Defaults to before.
+
+        Args:
+            bq_resource (BaseBQResource): bq_resource to manage.
+            create (Optional[Callable[[], None]], optional): creation of bq_resource.
+                Defaults to None, that is to say bq_resource.create.
+        """
+        self.before(bq_resource.delete, create if create else bq_resource.create)
+
+    def manage_after(self, bq_resource) -> None:
+        """Apply management strategy on bq_resource after its usage. Defaults to after.
+
+        Args:
+            bq_resource (BaseBQResource): bq_resource to manage.
+        """
+        self.after(bq_resource.delete)
+
     def before(self, delete: Callable[[], None], create: Callable[[], None]) -> None:
         """Apply management strategy on bq_resource before it's usage.
 
@@ -36,6 +67,26 @@ class BaseResourceStrategy():
         """
         raise NotImplementedError("Resource strategy must implement after method")
 
+    @property
+    def expiration(self) -> Optional[timedelta]:
+        """
+        Returns:
+            Optional[timedelta]: time to live of the resources created under this strategy, None if they don't expire.
+        """
+        return None
+
+    def deletes_contents_of(self, bq_resource) -> bool:
+        """Tell if resources under bq_resource are deleted along with it, they don't need to be deleted one by one.
+
+        Args:
+            bq_resource (BaseBQResource): bq_resource managed by this strategy.
+
+        Returns:
+            bool: False unless the strategy deletes bq_resource with its contents,
+                otherwise resources under bq_resource have to manage themselves.
+        """
+        return bq_resource.fqdn() in self._deleted_with_contents
+
 
 class Noop(BaseResourceStrategy):
     """Doesn't manage the resource at all.
@@ -70,10 +121,76 @@ class CleanAfter(BaseResourceStrategy):
 
 class CleanBeforeAndKeepAfter(BaseResourceStrategy):
     """Clean before the creation of the resource and let instance after it's usage.
+       With keep_loaded, tables loaded by data loaders with skip_if_unchanged are kept instead of being recreated,
+       as long as their definition is unchanged. Their unchanged loads may then be skipped.
     """
+    def __init__(self, keep_loaded: bool = False) -> None:
+        """Constructor of CleanBeforeAndKeepAfter.
+
+        Args:
+            keep_loaded (bool, optional): keep tables reusable by skip_if_unchanged loads,
+                see BaseDataLoader.is_reusable. Defaults to False.
+        """
+        self.keep_loaded = keep_loaded
+
+    def manage_before(self, bq_resource, create: Optional[Callable[[], None]] = None) -> None:
+        # imported here since tables and their data loaders depend on resource strategies.
+        # pylint: disable=C0415
+        from bq_test_kit.bq_dsl.bq_resources.data_loaders import BaseDataLoader
+        from bq_test_kit.bq_dsl.bq_resources.table import Table
+        if self.keep_loaded and isinstance(bq_resource, Table) and BaseDataLoader.is_reusable(bq_resource):
+            logger.info("Table %s is kept since its definition and its loads are unchanged.", bq_resource.fqdn())
+            return
+        super().manage_before(bq_resource, create)
+
     def before(self, delete: Callable[[], None], create: Callable[[], None]) -> None:
         delete()
         create()
 
     def after(self, delete: Callable[[], None]):
         pass
+
+
+class ExpireAfter(BaseResourceStrategy):
+    """Create with an expiration and let BigQuery delete the resource, no deletion is done after its usage.
+       Datasets get a default table expiration : their tables expire, datasets themselves can't
+       and are left behind, empty once their tables have expired.
+    """
+    def __init__(self, ttl: timedelta = timedelta(seconds=DEFAULT_RESOURCE_TTL)) -> None:
+        """Constructor of ExpireAfter.
+
+        Args:
+            ttl (timedelta, optional): time to live of the resource from its creation.
+                Defaults to bq_test_kit.constants.DEFAULT_RESOURCE_TTL seconds.
+        """
+        self.ttl = ttl
+
+    @property
+    def expiration(self) -> Optional[timedelta]:
+        return self.ttl
+
+    def before(self, delete: Callable[[], None], create: Callable[[], None]) -> None:
+        create()
+
+    def after(self, delete: Callable[[], None]):
+        pass
+
+
+class CleanAfterWithContents(CleanAfter):
+    """Create the dataset and delete it along with its tables in a single call after its usage.
+       Only applies to isolated datasets created by this strategy, other datasets are managed as CleanAfter does.
+    """
+    def __init__(self) -> None:
+        self._deleted_with_contents = set()
+
+    def manage_before(self, bq_resource, create: Optional[Callable[[], None]] = None) -> None:
+        super().manage_before(bq_resource, create)
+        if bq_resource.is_isolated():
+            self._deleted_with_contents.add(bq_resource.fqdn())
+
+    def manage_after(self, bq_resource) -> None:
+        if self.deletes_contents_of(bq_resource):
+            bq_resource.delete(delete_contents=True)
+            self._deleted_with_contents.discard(bq_resource.fqdn())
+        else:
+            super().manage_after(bq_resource)
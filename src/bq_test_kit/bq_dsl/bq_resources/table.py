@@ -5,9 +5,12 @@
 
 # C0114 disabled because this module contains only one class
 # pylint: disable=C0114
+# W0212 disabled because resources of the same tree maintain each other's name index
+# pylint: disable=W0212
 
-from copy import deepcopy
-from typing import List, Optional, Union
+from copy import copy, deepcopy
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple, Union
 
 from google.cloud.bigquery import SchemaField
 from google.cloud.bigquery.client import Client
@@ -18,12 +21,15 @@ from bq_test_kit.bq_dsl.bq_resources.base_bq_resource import BaseBQResource
 from bq_test_kit.bq_dsl.bq_resources.clustering import Clustering
 from bq_test_kit.bq_dsl.bq_resources.data_loaders import (DsvDataLoader,
                                                           JsonDataLoader)
+from bq_test_kit.bq_dsl.bq_resources.ddl import create_table_statement
 from bq_test_kit.bq_dsl.bq_resources.partitions import (BasePartition,
                                                         NoPartition)
 from bq_test_kit.bq_dsl.bq_resources.resource_strategy import (
-    BaseResourceStrategy, CleanAfter, CleanBeforeAndKeepAfter, Noop)
+    BaseResourceStrategy, CleanAfter, CleanBeforeAndKeepAfter, ExpireAfter,
+    Noop)
 from bq_test_kit.bq_dsl.schema_mixin import SchemaMixin
 from bq_test_kit.bq_test_kit_config import BQTestKitConfig
+from bq_test_kit.constants import DEFAULT_JOB_ID_PREFIX, DEFAULT_RESOURCE_TTL
 from bq_test_kit.exceptions import InvalidInstanceException
 from bq_test_kit.resource_loaders import BaseResourceLoader, PackageFileLoader
 
@@ -80,12 +86,15 @@ class Table(BaseBQResource, SchemaMixin):
 
     def __enter__(self):
         table_strategy = self.resource_strategy
-        table_strategy.before(self.delete, self.create)
+        table_strategy.manage_before(self)
         return self
 
     def __exit__(self, exception_type, exception_value, traceback) -> None:
+        if self.dataset.resource_strategy.deletes_contents_of(self.dataset):
+            logger.info("Table %s is left to the deletion of its dataset.", self.fqdn())
+            return
         table_strategy = self.resource_strategy
-        table_strategy.after(self.delete)
+        table_strategy.manage_after(self)
 
     def fqdn(self) -> str:
         dataset_fqdn = self.dataset.fqdn()
@@ -101,7 +110,7 @@ class Table(BaseBQResource, SchemaMixin):
         Returns:
             Table: new instance of Table with alias set.
         """
-        table = deepcopy(self)
+        table = self._copy()
         table.alias = alias
         return table
 
@@ -118,7 +127,7 @@ class Table(BaseBQResource, SchemaMixin):
         """
         if not with_:
             with_ = self.isolate_with_context()
-        table = deepcopy(self)
+        table = self._copy()
         table.isolate_func = with_
         return table
 
@@ -128,18 +137,36 @@ class Table(BaseBQResource, SchemaMixin):
         Returns:
             Table: new instance of Table with noop strategy.
         """
-        table = deepcopy(self)
+        table = self._copy()
         table.resource_strategy = Noop()
         return table
 
-    def clean_and_keep(self):
+    def clean_and_keep(self, *, keep_loaded: bool = False):
         """Clean before its usage and keep after.
 
+        Args:
+            keep_loaded (bool, optional): keep the table instead of cleaning it when its definition and its loads
+                are unchanged, see BaseDataLoader.skip_if_unchanged. Defaults to False.
+
         Returns:
             Table: new instance of Table with CleanBeforeAndKeepAfter strategy.
         """
-        table = deepcopy(self)
-        table.resource_strategy = CleanBeforeAndKeepAfter()
+        table = self._copy()
+        table.resource_strategy = CleanBeforeAndKeepAfter(keep_loaded)
+        return table
+
+    def expire_after(self, ttl: timedelta = timedelta(seconds=DEFAULT_RESOURCE_TTL)):
+        """Create with an expiration and let BigQuery delete it instead of deleting it after its usage.
+
+        Args:
+            ttl (timedelta, optional): time to live from its creation.
+                Defaults to bq_test_kit.constants.DEFAULT_RESOURCE_TTL seconds.
+
+        Returns:
+            Table: new instance of Table with ExpireAfter strategy.
+        """
+        table = self._copy()
+        table.resource_strategy = ExpireAfter(ttl)
         return table
 
     def with_resource_strategy(self, resource_strategy: BaseResourceStrategy):
@@ -151,7 +178,7 @@ class Table(BaseBQResource, SchemaMixin):
         Returns:
             Table: new instance of Table with the resource_strategy
         """
-        table = deepcopy(self)
+        table = self._copy()
         table.resource_strategy = resource_strategy
         return table
 
@@ -164,7 +191,7 @@ class Table(BaseBQResource, SchemaMixin):
         Returns:
             Table: new instance of Table with create options.
         """
-        table = deepcopy(self)
+        table = self._copy()
         table.create_options = create_options
         return table
 
@@ -180,7 +207,7 @@ class Table(BaseBQResource, SchemaMixin):
         if not isinstance(partition_type, BasePartition):
             raise InvalidInstanceException(type(partition_type),
                                            expected_instances=[BasePartition])
-        table = deepcopy(self)
+        table = self._copy()
         table.partition_type = partition_type
         return table
 
@@ -194,7 +221,7 @@ class Table(BaseBQResource, SchemaMixin):
         Returns:
             Table: new instance of Table with the clustering set.
         """
-        table = deepcopy(self)
+        table = self._copy()
         table.clustering = clustering
         return table
 
@@ -211,7 +238,7 @@ class Table(BaseBQResource, SchemaMixin):
         Returns:
             Table: new instance of Table with schema set.
         """
-        table = deepcopy(self)
+        table = self._copy()
         table.schema = from_
         return table
 
@@ -253,20 +280,67 @@ class Table(BaseBQResource, SchemaMixin):
 
     def create(self) -> None:
         """Create table with the computed fqdn and the specified create options.
+           The table expires after the expiration of its resource strategy, if any.
         """
         fqdn = self.fqdn()
         logger.info("Creating table %s", fqdn)
         try:
-            bqtable: BQTable = BQTable(fqdn, schema=self.schema)
-            bqtable = self.partition_type.apply(bqtable)
-            bqtable = self.clustering.apply(bqtable)
-            self._bq_client.create_table(bqtable, **self.create_options)
+            self._bq_client.create_table(self._to_bq_table(), **self.create_options)
         except Exception:
             logger.error("Failed to create table %s with options %s.", fqdn, self.create_options)
             raise
         else:
             logger.info("Table %s has been created.", fqdn)
 
+    def ddl(self) -> str:
+        """Render the CREATE TABLE statement equivalent to create.
+           Only exists_ok is taken into account among create options.
+
+        Returns:
+            str: CREATE TABLE statement.
+        """
+        return create_table_statement(self._to_bq_table(),
+                                      if_not_exists=self.create_options.get("exists_ok", False))
+
+    @staticmethod
+    def create_in_batch(tables: List['Table']) -> None:
+        """Create tables with a single script per client and location instead of one call per table.
+           Tables without schema can't be rendered as DDL and are created one by one.
+
+        Args:
+            tables (List[Table]): tables to create.
+        """
+        scripts: Dict[Tuple[int, str], List[Tuple[Table, str]]] = {}
+        for table in tables:
+            if not table.schema:
+                table.create()
+                continue
+            batch_key = (id(table._bq_client), table.dataset.location)
+            scripts.setdefault(batch_key, []).append((table, table.ddl()))
+        for statements in scripts.values():
+            first_table = statements[0][0]
+            fqdns = ", ".join(table.fqdn() for table, _ in statements)
+            logger.info("Creating tables %s in batch", fqdns)
+            try:
+                script = ";\n".join(ddl for _, ddl in statements)
+                logger.debug("Tables rendered as :\n%s", script)
+                first_table._bq_client.query(script,
+                                             job_id_prefix=DEFAULT_JOB_ID_PREFIX,
+                                             location=first_table.dataset.location).result()
+            except Exception:
+                logger.error("Failed to create tables %s in batch.", fqdns)
+                raise
+            logger.info("Tables %s have been created.", fqdns)
+
+    def _to_bq_table(self) -> BQTable:
+        bqtable: BQTable = BQTable(self.fqdn(), schema=self.schema)
+        bqtable = self.partition_type.apply(bqtable)
+        bqtable = self.clustering.apply(bqtable)
+        expiration = self.resource_strategy.expiration
+        if expiration is not None:
+            bqtable.expires = datetime.now(timezone.utc) + expiration
+        return bqtable
+
     def show(self) -> BQTable:
         """Retrieve table infos from BigQuery.
            Throw exceptions if table doesn't exist.
@@ -312,10 +386,31 @@ class Table(BaseBQResource, SchemaMixin):
         self.project = target_dataset.project
         self.table = target_dataset.table
 
+    def _copy(self) -> 'Table':
+        """Copy sharing attributes with the current instance, see Project._copy.
+
+        Returns:
+            Table: new instance of Table, registered in a new instance of its dataset.
+        """
+        dataset = self.dataset._copy()
+        table = self._rebind(dataset)
+        if self.name in dataset._tables:
+            dataset._tables[self.name] = table
+        return table
+
+    def _rebind(self, dataset) -> 'Table':
+        table = copy(self)
+        table.dataset = dataset
+        return table
+
     def __deepcopy__(self, memo):
+        dataset = deepcopy(self.dataset, memo)
+        if id(self) in memo:
+            # already copied along with its dataset
+            return memo[id(self)]
         table = Table(
             deepcopy(self.name, memo),
-            from_dataset=deepcopy(self.dataset, memo),
+            from_dataset=dataset,
             alias=deepcopy(self.alias, memo),
             # copy is not done because bq client have non-trivial state
             # that is local and unpickleable
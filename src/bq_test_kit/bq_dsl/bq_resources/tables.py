@@ -7,8 +7,9 @@
 # pylint: disable=C0114
 
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import ExitStack
-from typing import List, NoReturn, Tuple
+from typing import Any, Callable, List, NoReturn, Optional, Tuple
 
 from logzero import logger
 
@@ -16,6 +17,7 @@ from bq_test_kit.bq_dsl.bq_resources.base_bq_resource import BaseBQResource
 from bq_test_kit.bq_dsl.bq_resources.dataset import Dataset
 from bq_test_kit.bq_dsl.bq_resources.project import Project
 from bq_test_kit.bq_dsl.bq_resources.table import Table
+from bq_test_kit.constants import DEFAULT_PROVISIONING_WORKERS
 from bq_test_kit.exceptions import InvalidInstanceException
 
 
@@ -31,12 +33,25 @@ class Tables:
        Tuples will be T1, T2, T3, T4.
 
        This Resource manager ease sharing of datasets and tables definitions with fixtures.
+
+       In parallel mode, resources are created level by level, all datasets first then all tables,
+       each level being created concurrently. They are deleted the same way, in reverse.
+
+       In batch mode, resources are created level by level as well and tables are created by a single DDL script.
     """
 
-    def __init__(self, *bq_resources: BaseBQResource) -> None:
+    def __init__(self, *bq_resources: BaseBQResource, max_workers: int = 1, batch: bool = False) -> None:
         """List of BaseBQResource to create.
+
+        Args:
+            max_workers (int, optional): number of resources created or deleted at the same time.
+                Defaults to 1, that is to say sequentially.
+            batch (bool, optional): create tables with a single DDL script, see Table.create_in_batch.
+                Defaults to False.
         """
         self.bq_resources = bq_resources
+        self.max_workers = max_workers
+        self.batch = batch
         self._close = None
 
     @staticmethod
@@ -48,10 +63,33 @@ class Tables:
         """
         return Tables(*bq_resources)
 
+    def parallel(self, max_workers: int = DEFAULT_PROVISIONING_WORKERS) -> 'Tables':
+        """Create and delete resources of the same level concurrently.
+
+        Args:
+            max_workers (int, optional): number of resources created or deleted at the same time.
+                Defaults to bq_test_kit.constants.DEFAULT_PROVISIONING_WORKERS.
+
+        Returns:
+            Tables: new resource manager in parallel mode.
+        """
+        return Tables(*self.bq_resources, max_workers=max_workers, batch=self.batch)
+
+    def in_batch(self) -> 'Tables':
+        """Create tables with a single DDL script instead of one call per table.
+           Resource strategies of tables still apply, their creation only is batched.
+
+        Returns:
+            Tables: new resource manager in batch mode.
+        """
+        return Tables(*self.bq_resources, max_workers=self.max_workers, batch=True)
+
     def __enter__(self) -> Tuple[Table, ...]:
         flattened_bq_resources = self._flatten_bq_resources()
         bqr_str = ", ".join([bqr.fqdn() for bqr in flattened_bq_resources])
         logger.info("Creating the following resources %s", bqr_str)
+        if self.max_workers > 1 or self.batch:
+            return self._enter_levels(flattened_bq_resources)
         with ExitStack() as stack:
 
             def stack_and_append_table(bq_resource):
@@ -67,6 +105,80 @@ class Tables:
             self._close()
             self._close = None
 
+    def _enter_levels(self, flattened_bq_resources: List[BaseBQResource]) -> Tuple[Table, ...]:
+        entered_levels = []
+        for resource_type in [Project, Dataset, Table]:
+            level = [bqr for bqr in flattened_bq_resources if isinstance(bqr, resource_type)]
+            if self.batch and resource_type is Table:
+                entered_level, failure = self._enter_tables_in_batch(level)
+            else:
+                errors = self._run_concurrently([bqr.__enter__ for bqr in level])
+                entered_level = [bqr for bqr, error in zip(level, errors) if error is None]
+                failure = next((error for error in errors if error is not None), None)
+            entered_levels.append(entered_level)
+            if failure is not None:
+                logger.error("Failed to create resources, deleting the ones already created.")
+                # Creation failure is the one to raise, deletion failure is only logged.
+                # pylint: disable=W0718
+                try:
+                    self._exit_levels(entered_levels, type(failure), failure, failure.__traceback__)
+                except Exception:
+                    logger.exception("Failed to delete resources after a creation failure.")
+                raise failure
+        self._close = lambda: self._exit_levels(entered_levels, None, None, None)
+        return tuple(bqr for bqr in flattened_bq_resources if isinstance(bqr, Table))
+
+    def _enter_tables_in_batch(self, tables: List[Table]) -> Tuple[List[Table], Optional[BaseException]]:
+        """Apply resource strategies of tables, recording their creation instead of running it.
+           Recorded creations are then run by a single script.
+
+        Returns:
+            Tuple[List[Table], Optional[BaseException]]: tables to exit and the first failure if any.
+        """
+        creations = []
+
+        def _before(table: Table) -> None:
+            table.resource_strategy.manage_before(table, lambda: creations.append(table))
+        errors = self._run_concurrently([lambda table=table: _before(table) for table in tables])
+        entered_tables = [table for table, error in zip(tables, errors) if error is None]
+        failure = next((error for error in errors if error is not None), None)
+        if failure is None and creations:
+            # Tables of a failed script may have been partially created, they are all exited.
+            # pylint: disable=W0718
+            try:
+                Table.create_in_batch(creations)
+            except BaseException as error:
+                failure = error
+        return entered_tables, failure
+
+    def _exit_levels(self, entered_levels: List[List[BaseBQResource]], *exception_details: Any) -> None:
+        failure = None
+        for level in reversed(entered_levels):
+            errors = self._run_concurrently([lambda bqr=bqr: bqr.__exit__(*exception_details) for bqr in level])
+            failure = failure or next((error for error in errors if error is not None), None)
+        if failure is not None:
+            raise failure
+
+    def _run_concurrently(self, calls: List[Callable[[], Any]]) -> List[Optional[BaseException]]:
+        """Run all calls, even if some of them fail, so that resources already handled can be rolled back
+           as the sequential mode does.
+
+        Returns:
+            List[Optional[BaseException]]: exception raised by each call, None if it succeeded.
+        """
+        def _run(call: Callable[[], Any]) -> Optional[BaseException]:
+            # Catch all kind of exception in order to raise them once every call is done.
+            # pylint: disable=W0718
+            try:
+                call()
+                return None
+            except BaseException as error:
+                return error
+        if not calls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(calls))) as executor:
+            return list(executor.map(_run, calls))
+
     def _flatten_bq_resources(self) -> List[BaseBQResource]:
 
         def _flatten(bq_resource: BaseBQResource) -> List[BaseBQResource]:
@@ -0,0 +1,148 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+    Cache of query results, addressed by the hash of the rendered query and of its job configuration.
+"""
+
+import gzip
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from logzero import logger
+
+from bq_test_kit.bq_dsl.bq_query_results import BQQueryResult
+from bq_test_kit.constants import DEFAULT_QUERY_RESULT_CACHE_ENTRIES
+from bq_test_kit.recorded_rows import RecordedRows
+
+
+class QueryResultCacheStats(NamedTuple):
+    """Counters of a QueryResultCache since its creation or its last reset.
+       disk_hits are hits missing in memory but read from the directory.
+    """
+    hits: int
+    disk_hits: int
+    misses: int
+
+
+class QueryResultCache():
+    """Keep the results of the last max_entries queries in memory, and optionally all of them in a directory,
+       one gzipped JSON file per key. Cached results don't reflect later changes of the tables
+       the queries read, only data literals being part of the key.
+    """
+
+    SUFFIX = ".json.gz"
+
+    def __init__(self, max_entries: int = DEFAULT_QUERY_RESULT_CACHE_ENTRIES,
+                 directory: Optional[str] = None) -> None:
+        """Constructor of QueryResultCache.
+
+        Args:
+            max_entries (int, optional): maximum number of results kept in memory.
+                Defaults to bq_test_kit.constants.DEFAULT_QUERY_RESULT_CACHE_ENTRIES.
+            directory (Optional[str], optional): directory holding results across runs,
+                created if it does not exist. Defaults to None, results being kept in memory only.
+        """
+        self.max_entries = max_entries
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, RecordedRows]' = OrderedDict()
+        self.reset_stats()
+
+    def get(self, key: str) -> Optional[BQQueryResult]:
+        """Read a query result.
+
+        Args:
+            key (str): hexadecimal hash of the query.
+
+        Returns:
+            Optional[BQQueryResult]: cached result or None if missing.
+        """
+        with self._lock:
+            rows = self._entries.get(key)
+            if rows is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return BQQueryResult(rows)
+        rows = self._read(key)
+        with self._lock:
+            if rows is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            self._remember(key, rows)
+        logger.info("Result of query %s read from %s.", key, self.directory)
+        return BQQueryResult(rows)
+
+    def put(self, key: str, result: BQQueryResult) -> None:
+        """Store a query result, evicting the least recently used one from memory if needed.
+
+        Args:
+            key (str): hexadecimal hash of the query.
+            result (BQQueryResult): result to store.
+        """
+        rows = RecordedRows(list(result.schema or []), [list(row.values()) for row in result.rows_bq],
+                            result.total_rows)
+        with self._lock:
+            self._remember(key, rows)
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(temp_path, "wt", encoding="utf-8") as cached_file:
+                json.dump(rows.to_record(), cached_file)
+            # atomic, concurrent writers of the same key write the same content anyway.
+            os.replace(temp_path, path)
+
+    def stats(self) -> QueryResultCacheStats:
+        """
+        Returns:
+            QueryResultCacheStats: hits in memory, hits on disk and misses.
+        """
+        with self._lock:
+            return QueryResultCacheStats(self._hits, self._disk_hits, self._misses)
+
+    def reset_stats(self) -> None:
+        """Reset counters returned by stats.
+        """
+        with self._lock:
+            self._hits = 0
+            self._disk_hits = 0
+            self._misses = 0
+
+    def clear(self) -> None:
+        """Remove all cached results, from memory and directory.
+        """
+        with self._lock:
+            self._entries.clear()
+        if self.directory is not None and os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.endswith(self.SUFFIX):
+                    os.remove(entry.path)
+
+    def _remember(self, key: str, rows: RecordedRows) -> None:
+        self._entries[key] = rows
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read(self, key: str) -> Optional[RecordedRows]:
+        if self.directory is None:
+            return None
+        try:
+            with gzip.open(self._path(key), "rt", encoding="utf-8") as cached_file:
+                return RecordedRows.from_record(json.load(cached_file))
+        except FileNotFoundError:
+            return None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def __deepcopy__(self, memo) -> 'QueryResultCache':
+        # a cache is a shared resource, copies of a query template keep using it.
+        return self
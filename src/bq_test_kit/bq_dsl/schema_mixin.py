@@ -7,11 +7,13 @@
 # pylint: disable=C0114
 
 import json
-from typing import List, Union
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple, Union
 
 from google.cloud.bigquery.schema import SchemaField
 from logzero import logger
 
+from bq_test_kit.constants import DEFAULT_DATA_TYPE_CACHE_SIZE
 from bq_test_kit.exceptions import (InvalidInstanceException,
                                     UnexpectedTypeException)
 from bq_test_kit.resource_loaders.base_resource_loader import \
@@ -62,58 +64,107 @@ class SchemaMixin():
         return schema_fields
 
     @staticmethod
-    def generate_data_type(schema: Union[List[SchemaField], SchemaField]):
+    def generate_data_type(schema: Union[List[SchemaField], SchemaField]) -> str:
         """
             Generate fields data type matching the given schema.
             Usefull when data is null and we would like to keep the structure.
+            Generated types are memoized in a bounded LRU cache keyed by the schema fingerprint,
+            see data_type_cache_info.
 
         Args:
             schema (Union[List[SchemaField], SchemaField]): schema of a record or a field.
         """
-        def _generate_repeated_field_literal_type(schema_field: SchemaField):
-            nested_field_type = None
-            if str.upper(schema_field.field_type) == "RECORD":
-                nested_field_type = _generate_struct_literal_type(schema_field.fields)
-            else:
-                nested_field_type = _generate_field_literal_type(schema_field)
-            field_type = f"ARRAY<{nested_field_type}>"
-            return field_type
-
-        def _generate_field_literal_type(schema_field: SchemaField):
-            field_type = None
-            if str.upper(schema_field.field_type) in ["GEOGRAPHY", "STRING", "BYTES", "NUMERIC", "BOOLEAN", "BOOL",
-                                                      "TIMESTAMP", "DATE", "DATETIME", "TIME"]:
-                field_type = str.upper(schema_field.field_type)
-            elif str.upper(schema_field.field_type) in ["INTEGER", "INT64"]:
-                field_type = "INT64"
-            elif str.upper(schema_field.field_type) in ["FLOAT", "FLOAT64"]:
-                field_type = "FLOAT64"
-            else:
-                raise UnexpectedTypeException(schema_field.field_type)
-            return field_type
-
-        def _generate_struct_literal_type(schema: List[SchemaField]):
-            struct_fields_type_list = []
-            for schema_field in schema:
-                field_type = None
-                if str.upper(schema_field.mode) == "REPEATED":
-                    field_type = _generate_repeated_field_literal_type(schema_field)
-                elif str.upper(schema_field.field_type) == "RECORD":
-                    field_type = _generate_struct_literal_type(schema_field.fields)
-                else:
-                    field_type = _generate_field_literal_type(schema_field)
-                struct_fields_type_list.append(f"{schema_field.name} {field_type}")
-            struct_fields_type = ", ".join(struct_fields_type_list)
-            return f"STRUCT<{struct_fields_type}>"
+        if isinstance(schema, SchemaField):
+            return _cached_data_type(_fingerprint(schema))
+        return _cached_data_type((None, "RECORD", "NULLABLE", tuple(_fingerprint(field) for field in schema)))
 
+    @staticmethod
+    def schema_fingerprint(schema: List[SchemaField]) -> Tuple[Any, ...]:
+        """Hashable summary of a schema, made of names, types and modes of all fields, nested ones included.
+
+        Args:
+            schema (List[SchemaField]): schema to summarize.
+
+        Returns:
+            Tuple[Any, ...]: fingerprint of each field, in order.
+        """
+        return tuple(_fingerprint(field) for field in schema)
+
+    @staticmethod
+    def data_type_cache_info() -> Tuple[int, int, Optional[int], int]:
+        """Statistics of the generate_data_type cache, useful in order to tune its size.
+
+        Returns:
+            Tuple[int, int, Optional[int], int]: named tuple of hits, misses, maxsize and currsize.
+        """
+        return _cached_data_type.cache_info()
+
+    @staticmethod
+    def resize_data_type_cache(maxsize: Optional[int] = DEFAULT_DATA_TYPE_CACHE_SIZE) -> None:
+        """Change the size of the generate_data_type cache. Cache and its statistics are reset.
+
+        Args:
+            maxsize (Optional[int], optional): maximum number of data types to keep, None means unbounded.
+                Defaults to DEFAULT_DATA_TYPE_CACHE_SIZE.
+        """
+        # pylint: disable=W0603
+        global _cached_data_type
+        _cached_data_type = lru_cache(maxsize=maxsize)(_render_data_type)
+
+    @staticmethod
+    def clear_data_type_cache() -> None:
+        """Empty the generate_data_type cache and reset its statistics.
+        """
+        _cached_data_type.cache_clear()
+
+
+SchemaFingerprint = Tuple[Optional[str], str, str, Tuple[Any, ...]]
+
+
+def _fingerprint(schema_field: SchemaField) -> SchemaFingerprint:
+    return (schema_field.name, str.upper(schema_field.field_type), str.upper(schema_field.mode),
+            tuple(_fingerprint(field) for field in schema_field.fields))
+
+
+def _render_data_type(fingerprint: SchemaFingerprint) -> str:
+    def _generate_repeated_field_literal_type(field: SchemaFingerprint):
+        nested_field_type = None
+        if field[1] == "RECORD":
+            nested_field_type = _generate_struct_literal_type(field[3])
+        else:
+            nested_field_type = _generate_field_literal_type(field)
+        field_type = f"ARRAY<{nested_field_type}>"
+        return field_type
+
+    def _generate_field_literal_type(field: SchemaFingerprint):
         field_type = None
-        if isinstance(schema, SchemaField):
-            if str.upper(schema.mode) == "REPEATED":
-                field_type = _generate_repeated_field_literal_type(schema)
-            elif str.upper(schema.field_type) == "RECORD":
-                field_type = _generate_struct_literal_type(schema.fields)
-            else:
-                field_type = _generate_field_literal_type(schema)
+        if field[1] in ["GEOGRAPHY", "STRING", "BYTES", "NUMERIC", "BOOLEAN", "BOOL",
+                        "TIMESTAMP", "DATE", "DATETIME", "TIME"]:
+            field_type = field[1]
+        elif field[1] in ["INTEGER", "INT64"]:
+            field_type = "INT64"
+        elif field[1] in ["FLOAT", "FLOAT64"]:
+            field_type = "FLOAT64"
+        else:
+            raise UnexpectedTypeException(field[1])
+        return field_type
+
+    def _generate_struct_literal_type(fields: Tuple[SchemaFingerprint, ...]):
+        struct_fields_type_list = [f"{field[0]} {_generate_type(field)}" for field in fields]
+        struct_fields_type = ", ".join(struct_fields_type_list)
+        return f"STRUCT<{struct_fields_type}>"
+
+    def _generate_type(field: SchemaFingerprint):
+        field_type = None
+        if field[2] == "REPEATED":
+            field_type = _generate_repeated_field_literal_type(field)
+        elif field[1] == "RECORD":
+            field_type = _generate_struct_literal_type(field[3])
         else:
-            field_type = _generate_struct_literal_type(schema)
+            field_type = _generate_field_literal_type(field)
         return field_type
+
+    return _generate_type(fingerprint)
+
+
+_cached_data_type = lru_cache(maxsize=DEFAULT_DATA_TYPE_CACHE_SIZE)(_render_data_type)
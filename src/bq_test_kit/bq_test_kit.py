@@ -7,15 +7,17 @@
 # pylint: disable=C0114
 
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Union
 
 from google.cloud.bigquery.client import Client
 from logzero import logger
 
-from bq_test_kit.bq_dsl import BQQueryTemplate
+from bq_test_kit.bq_dsl import BQQueryDryRun, BQQueryRun, BQQueryTemplate
 from bq_test_kit.bq_dsl.bq_resources.project import Project
 from bq_test_kit.bq_test_kit_config import BQTestKitConfig
-from bq_test_kit.constants import GOOGLE_CLOUD_PROJECT
+from bq_test_kit.constants import DEFAULT_MAX_CONCURRENCY, GOOGLE_CLOUD_PROJECT
 from bq_test_kit.exceptions import (ProjectNotDefinedException,
                                     RequirementsException)
 from bq_test_kit.interpolators.base_interpolator import BaseInterpolator
@@ -73,6 +75,62 @@ class BQTestKit():
         return BQQueryTemplate(from_=from_, bqtk_config=self.bqtk_config,
                                bq_client=self._bq_client, interpolators=interpolators)
 
+    @staticmethod
+    def run_many(query_templates: List[BQQueryTemplate],
+                 *, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> List[BQQueryRun]:
+        """Run query templates concurrently, at most max_concurrency at a time.
+           Query templates keep their own bq_client, which is thread safe and usually shared.
+           A failing query template does not stop the others, its error is reported in its run.
+
+        Args:
+            query_templates (List[BQQueryTemplate]): query templates to run.
+            max_concurrency (int, optional): maximum number of queries running at the same time.
+                Defaults to bq_test_kit.constants.DEFAULT_MAX_CONCURRENCY.
+
+        Returns:
+            List[BQQueryRun]: result or error along with duration of each query template, in the same order.
+        """
+        def _run(query_template: BQQueryTemplate) -> BQQueryRun:
+            start = time.perf_counter()
+            # Catch all kind of exception in order to report them along with the result of other query templates.
+            # pylint: disable=W0718
+            try:
+                return BQQueryRun(query_template.run(), None, time.perf_counter() - start)
+            except Exception as error:
+                logger.warning("Query template failed : %s", error)
+                return BQQueryRun(None, error, time.perf_counter() - start)
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            return list(executor.map(_run, query_templates))
+
+    @staticmethod
+    def dry_run_many(query_templates: List[BQQueryTemplate],
+                     *, max_bytes: Optional[int] = None,
+                     max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> List[BQQueryDryRun]:
+        """Dry run query templates concurrently, at most max_concurrency at a time, see BQQueryTemplate.dry_run.
+           An invalid query template, or one exceeding its budget, does not stop the others.
+
+        Args:
+            query_templates (List[BQQueryTemplate]): query templates to validate.
+            max_bytes (Optional[int], optional): maximum bytes each query template may process.
+                Defaults to None, no budget.
+            max_concurrency (int, optional): maximum number of dry runs at the same time.
+                Defaults to bq_test_kit.constants.DEFAULT_MAX_CONCURRENCY.
+
+        Returns:
+            List[BQQueryDryRun]: estimate or error along with duration of each query template, in the same order.
+        """
+        def _dry_run(query_template: BQQueryTemplate) -> BQQueryDryRun:
+            start = time.perf_counter()
+            # Catch all kind of exception in order to report them along with the result of other query templates.
+            # pylint: disable=W0718
+            try:
+                return BQQueryDryRun(query_template.dry_run(max_bytes=max_bytes), None, time.perf_counter() - start)
+            except Exception as error:
+                logger.warning("Dry run of query template failed : %s", error)
+                return BQQueryDryRun(None, error, time.perf_counter() - start)
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            return list(executor.map(_dry_run, query_templates))
+
     def _get_project_id(self, name: Optional[str] = None,
                         *, env_var_name: str = GOOGLE_CLOUD_PROJECT) -> Optional[str]:
         project_id = None
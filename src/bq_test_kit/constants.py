@@ -13,3 +13,18 @@ DEFAULT_LOCATION = "default_location"
 DEFAULT_JOB_ID_PREFIX = "BQTK_"
 GOOGLE_CLOUD_PROJECT = "GOOGLE_CLOUD_PROJECT"
 DEFAULT_TECHNICAL_COLUMN_PREFIX = "_BQTK"
+DEFAULT_DATA_TYPE_CACHE_SIZE = 1024
+DEFAULT_TRANSFORM_CHUNK_SIZE = 1000
+DEFAULT_LITERAL_CACHE_SIZE = 256 * 1024 * 1024
+DEFAULT_POLL_INITIAL_DELAY = 0.1
+DEFAULT_POLL_MAX_DELAY = 2.0
+DEFAULT_POLL_MULTIPLIER = 2.0
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_PROVISIONING_WORKERS = 8
+DEFAULT_DATASET_POOL_SIZE = 16
+DEFAULT_DATASET_POOL_LEASE_TIMEOUT = 300.0
+DEFAULT_DATASET_POOL_POLL_INTERVAL = 1.0
+DEFAULT_CLEANUP_DRAIN_TIMEOUT = 300.0
+DEFAULT_RESOURCE_TTL = 3600
+DEFAULT_QUERY_RESULT_CACHE_ENTRIES = 128
+DEFAULT_SCHEMA_PLAN_CACHE_SIZE = 128
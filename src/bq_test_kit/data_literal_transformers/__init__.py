@@ -12,9 +12,15 @@ from bq_test_kit.data_literal_transformers.dsv_data_literal_transformer import \
     DsvDataLiteralTransformer
 from bq_test_kit.data_literal_transformers.json_data_literal_transformer import \
     JsonDataLiteralTransformer
+from bq_test_kit.data_literal_transformers.literal_cache import (
+    LiteralCache, LiteralCacheStats)
+from bq_test_kit.data_literal_transformers.literal_format import LiteralFormat
 
 __all__ = [
     "BaseDataLiteralTransformer",
     "DsvDataLiteralTransformer",
-    "JsonDataLiteralTransformer"
+    "JsonDataLiteralTransformer",
+    "LiteralCache",
+    "LiteralCacheStats",
+    "LiteralFormat"
 ]
@@ -6,15 +6,28 @@
 # C0114 disabled because this module contains only one class
 # pylint: disable=C0114
 
-import re
-from collections import OrderedDict
+import hashlib
+import json
+import os
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
-from typing import Any, Callable, Dict, List, Optional
+from io import StringIO
+from itertools import islice
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    TextIO, Tuple)
 
 from google.cloud.bigquery.schema import SchemaField
 from logzero import logger
 
 from bq_test_kit.bq_dsl.schema_mixin import SchemaMixin
+from bq_test_kit.constants import (DEFAULT_SCHEMA_PLAN_CACHE_SIZE,
+                                   DEFAULT_TRANSFORM_CHUNK_SIZE)
+from bq_test_kit.data_literal_transformers.literal_cache import LiteralCache
+from bq_test_kit.data_literal_transformers.literal_format import LiteralFormat
+from bq_test_kit.data_literal_transformers.schema_plan import (GEOGRAPHY_RE,
+                                                               Projection,
+                                                               SchemaPlan)
 from bq_test_kit.exceptions import (DataLiteralTransformException,
                                     InvalidInstanceException)
 from bq_test_kit.resource_loaders.base_resource_loader import \
@@ -27,8 +40,7 @@ class BaseDataLiteralTransformer(SchemaMixin):
         Base of all data literal transformer.
         All data literal transformer must implement load method.
     """
-    GEOGRAPHY_RE = re.compile("^POINT\\(\\s*([-+]?\\d+\\.?\\d*)\\s+([-+]?\\d+\\.?\\d*)\\s*\\)\\s*$",
-                              flags=re.S | re.IGNORECASE)
+    GEOGRAPHY_RE = GEOGRAPHY_RE
     # REGEX that identifies geography point
 
     def __init__(self) -> None:
@@ -36,10 +48,19 @@ class BaseDataLiteralTransformer(SchemaMixin):
             Constructor of a data literal transformer.
             Set cast_string_to_bytes as False and cast_datetime_like as False and ignore_unknown_values_flag as False.
             This means that data loading is in strict mode.
+            Rows are assembled with union all, see with_literal_format.
+            Rows are transformed in the current process, see use_process_pool.
+            Data literals are rendered on each load, see with_literal_cache.
         """
         self.cast_string_to_bytes = False
         self.cast_datetime_like = False
         self.ignore_unknown_values_flag = False
+        self.literal_format = LiteralFormat.UNION_ALL
+        self.max_workers = 1
+        self.chunk_size = DEFAULT_TRANSFORM_CHUNK_SIZE
+        self.literal_cache: Optional[LiteralCache] = None
+        self._schema_plans: 'OrderedDict[Tuple[Any, ...], SchemaPlan]' = OrderedDict()
+        self._last_plan: Optional[Tuple[Any, ...]] = None
 
     def load(self, datum: DatumResource, schema: SchemaResource,
              transform_field_name: Optional[Callable[[str], str]] = None) -> str:
@@ -49,6 +70,8 @@ class BaseDataLiteralTransformer(SchemaMixin):
 
             If datum is empty as the python way, then an empty line is generated.
             This means that BaseResourceLoader is not considered as empty.
+            Rows are read lazily but the whole data literal is returned as a string,
+            use load_to in order to write it to a stream instead.
 
         Args:
             datum (Union[BaseResourceLoader, str, List[str], None]):
@@ -65,17 +88,96 @@ class BaseDataLiteralTransformer(SchemaMixin):
             str: data literal
         """
         schema_fields = self.to_schema_field_list(schema)
+        if self.literal_cache is not None:
+            key = self._literal_cache_key(datum, schema_fields, transform_field_name)
+            return self.literal_cache.get_or_render(
+                key, lambda: self._render(datum, schema_fields, transform_field_name)
+            )
+        return self._render(datum, schema_fields, transform_field_name)
+
+    def _render(self, datum: DatumResource, schema_fields: List[SchemaField],
+                transform_field_name: Optional[Callable[[str], str]]) -> str:
         return (self._load(datum, schema_fields, transform_field_name)
                 if datum else
                 self._empty_literal(schema_fields, transform_field_name))
 
+    def load_to(self, sink: TextIO, datum: DatumResource, schema: SchemaResource,
+                transform_field_name: Optional[Callable[[str], str]] = None) -> None:
+        """
+            Same as load but the data literal is written incrementally to the given sink.
+            Lines are read lazily, therefore memory is bounded by one row and the sink itself.
+            If an exception is raised, content written to the sink is incomplete and must be discarded.
+
+        Args:
+            sink (TextIO): text stream to write the data literal to, such as io.StringIO or a file.
+            datum (Union[BaseResourceLoader, str, List[str], None]):
+                datum in a file or a string containing lines of datum or a list of data or None.
+            schema (Union[BaseResourceLoader, str, List[SchemaField]]):
+                schema to match with while transforming data to literal.
+            transform_field_name (Optional[Callable[[str], str]]):
+                function to change field name. See load.
+        """
+        schema_fields = self.to_schema_field_list(schema)
+        if datum:
+            self._stream(datum, schema_fields, transform_field_name, sink)
+        else:
+            sink.write(self._empty_literal(schema_fields, transform_field_name))
+
+    def load_chunks(self, datum: DatumResource, schema: SchemaResource,
+                    transform_field_name: Optional[Callable[[str], str]] = None,
+                    max_size: Optional[int] = None) -> List[str]:
+        """
+            Same as load but rows are split into several data literals of at most max_size characters each.
+            Every data literal has the same columns, therefore they can be inserted one after the other
+            into the same table.
+            A row that does not fit in max_size on its own is kept alone in its data literal.
+            Transformers that do not implement _iter_rows return a single data literal.
+
+        Args:
+            datum (Union[BaseResourceLoader, str, List[str], None]):
+                datum in a file or a string containing lines of datum or a list of data or None.
+            schema (Union[BaseResourceLoader, str, List[SchemaField]]):
+                schema to match with while transforming data to literal.
+            transform_field_name (Optional[Callable[[str], str]]):
+                function to change field name. See load.
+            max_size (Optional[int], optional): maximum size of a data literal, in characters.
+                Defaults to None, which means no split at all.
+
+        Returns:
+            List[str]: data literals, at least one.
+        """
+        if max_size is None:
+            return [self.load(datum, schema, transform_field_name)]
+        schema_fields = self.to_schema_field_list(schema)
+        if self.literal_cache is not None:
+            key = self._literal_cache_key(datum, schema_fields, transform_field_name, max_size)
+            return json.loads(self.literal_cache.get_or_render(
+                key, lambda: json.dumps(self._render_chunks(datum, schema_fields, transform_field_name, max_size))
+            ))
+        return self._render_chunks(datum, schema_fields, transform_field_name, max_size)
+
+    def _render_chunks(self, datum: DatumResource, schema_fields: List[SchemaField],
+                       transform_field_name: Optional[Callable[[str], str]], max_size: int) -> List[str]:
+        if not datum:
+            return [self._empty_literal(schema_fields, transform_field_name)]
+        try:
+            rows = self._iter_rows(datum, schema_fields)
+        except NotImplementedError:
+            return [self._load(datum, schema_fields, transform_field_name)]
+        literals = self._write_data_literal_chunks(rows, schema_fields, transform_field_name, max_size)
+        return literals if literals else [self._empty_literal(schema_fields, transform_field_name)]
+
     def _empty_literal(self, schema_fields: List[SchemaField],
                        transform_field_name: Optional[Callable[[str], str]]) -> str:
-        query, transform_errors = self.transform_to_literal({}, schema_fields, transform_field_name)
+        plan = self.schema_plan(schema_fields, transform_field_name)
+        query, transform_errors = plan.transform({})
         if transform_errors:
             errors_str = ",\n".join(["\t" + error for error in transform_errors])
             raise DataLiteralTransformException(f"Exception happened with the following errors :\n{errors_str}")
-        query = f"(select * from ({query}) limit 0)"
+        if self.literal_format == LiteralFormat.ARRAY_OF_STRUCTS:
+            query = f"(select * from unnest(ARRAY<{plan.row_type}>[]))"
+        else:
+            query = f"(select * from ({query}) limit 0)"
         logger.info("Empty literal generated.")
         logger.debug("Empty literal generated as :\n%s", query)
         return query
@@ -85,6 +187,7 @@ class BaseDataLiteralTransformer(SchemaMixin):
         """
             Load inputs and transform them as data literal, preserving target schema with a fullfilled line.
             This fullfilled line is, of course, discarded from the literal datum.
+            Rows are given by _iter_rows.
 
         Args:
             datum (Union[BaseResourceLoader, str, List[str]]):
@@ -100,25 +203,148 @@ class BaseDataLiteralTransformer(SchemaMixin):
         Returns:
             str: data literal
         """
+        sink = StringIO()
+        self._stream(datum, schema_fields, transform_field_name, sink)
+        query_result = sink.getvalue()
+        logger.debug("Datum has been transformed to \n%s", query_result)
+        return query_result
+
+    def _iter_rows(self, datum: DatumResource, schema_fields: List[SchemaField]) -> Iterator[Any]:
+        """
+            Parse datum lazily, one row at a time.
+
+        Args:
+            datum (Union[BaseResourceLoader, str, List[str]]):
+                datum in a file or a string containing lines of datum or a list of data.
+            schema_fields (List[SchemaField]):
+                schema to match with while transforming data to literal.
+
+        Raises:
+            NotImplementedError: All data literal transformer must implement this method or override _load.
+
+        Returns:
+            Iterator[Any]: rows, expected to be dictionaries.
+        """
         raise NotImplementedError("Must implement load method")
 
-    def _to_data_literal(self, rows: List[Dict[str, Any]], schema_fields: List[SchemaField],
+    def _stream(self, datum: DatumResource, schema_fields: List[SchemaField],
+                transform_field_name: Optional[Callable[[str], str]], sink: TextIO) -> None:
+        rows = self._iter_rows(datum, schema_fields)
+        if not self._write_data_literal(rows, schema_fields, transform_field_name, sink):
+            sink.write(self._empty_literal(schema_fields, transform_field_name))
+
+    def _to_data_literal(self, rows: Iterable[Dict[str, Any]], schema_fields: List[SchemaField],
                          transform_field_name: Optional[Callable[[str], str]]) -> str:
-        queries = []
+        sink = StringIO()
+        if not self._write_data_literal(rows, schema_fields, transform_field_name, sink):
+            return self._empty_literal(schema_fields, transform_field_name)
+        query_result = sink.getvalue()
+        logger.debug("Datum has been transformed to \n%s", query_result)
+        return query_result
+
+    def _write_data_literal(self, rows: Iterable[Dict[str, Any]], schema_fields: List[SchemaField],
+                            transform_field_name: Optional[Callable[[str], str]], sink: TextIO) -> bool:
+        """Transform rows one by one and write them to the sink.
+           Errors are aggregated by line and raised once all rows are consumed.
+
+        Returns:
+            bool: False if there was no row at all, in which case nothing is written.
+        """
         errors = []
-        for i, row in enumerate(rows):
-            query, transform_errors = self.transform_to_literal(row, schema_fields, transform_field_name)
+        prefix, separator, suffix = self._literal_delimiters(schema_fields, transform_field_name)
+        nb_rows = 0
+        for i, (query, transform_errors) in enumerate(self._transform_rows(rows, schema_fields,
+                                                                           transform_field_name)):
             if transform_errors:
-                errors_str = ",\n".join(["\t" + error for error in transform_errors])
-                errors.append(f"Exception happened in line {i+1} with the following errors :\n{errors_str}")
-            else:
+                errors.append(self._line_errors(i, transform_errors))
+            elif not errors:
+                sink.write(separator if nb_rows else prefix)
+                sink.write(query)
+            nb_rows += 1
+        if errors:
+            raise DataLiteralTransformException("\n\n".join(errors))
+        if nb_rows:
+            sink.write(suffix)
+            logger.info("Datum has been transformed.")
+        return nb_rows > 0
+
+    def _write_data_literal_chunks(self, rows: Iterable[Dict[str, Any]], schema_fields: List[SchemaField],
+                                   transform_field_name: Optional[Callable[[str], str]],
+                                   max_size: int) -> List[str]:
+        """Transform rows one by one and group them into data literals of at most max_size characters.
+           A row that does not fit in max_size on its own is kept alone in its data literal.
+           Errors are aggregated by line and raised once all rows are consumed.
+
+        Returns:
+            List[str]: data literals, empty if there was no row at all.
+        """
+        # Disable too many locals since rows are transformed and grouped in a single pass.
+        # pylint: disable=R0914
+        errors = []
+        prefix, separator, suffix = self._literal_delimiters(schema_fields, transform_field_name)
+        literals = []
+        queries = []
+        size = 0
+        for i, (query, transform_errors) in enumerate(self._transform_rows(rows, schema_fields,
+                                                                           transform_field_name)):
+            if transform_errors:
+                errors.append(self._line_errors(i, transform_errors))
+            elif not errors:
+                query_size = len(query) + (len(separator) if queries else len(prefix) + len(suffix))
+                if queries and size + query_size > max_size:
+                    literals.append(prefix + separator.join(queries) + suffix)
+                    queries = []
+                    query_size = len(query) + len(prefix) + len(suffix)
+                    size = 0
+                if query_size > max_size:
+                    logger.warning("Line %s is bigger than %s characters once transformed.", i + 1, max_size)
                 queries.append(query)
+                size += query_size
         if errors:
             raise DataLiteralTransformException("\n\n".join(errors))
-        query_result = "(" + "\nunion all\n".join(queries) + ")"
-        logger.info("Datum has been transformed.")
-        logger.debug("Datum has been transformed to \n%s", query_result)
-        return query_result
+        if queries:
+            literals.append(prefix + separator.join(queries) + suffix)
+            logger.info("Datum has been transformed into %s data literals.", len(literals))
+        return literals
+
+    def _literal_delimiters(self, schema_fields: List[SchemaField],
+                            transform_field_name: Optional[Callable[[str], str]]) -> Tuple[str, str, str]:
+        if self.literal_format == LiteralFormat.ARRAY_OF_STRUCTS:
+            plan = self.schema_plan(schema_fields, transform_field_name)
+            return f"(select * from unnest(ARRAY<{plan.row_type}>[\n", ",\n", "\n]))"
+        return "(", "\nunion all\n", ")"
+
+    @staticmethod
+    def _line_errors(line_index: int, transform_errors: List[str]) -> str:
+        errors_str = ",\n".join(["\t" + error for error in transform_errors])
+        return f"Exception happened in line {line_index+1} with the following errors :\n{errors_str}"
+
+    def _transform_rows(self, rows: Iterable[Dict[str, Any]], schema_fields: List[SchemaField],
+                        transform_field_name: Optional[Callable[[str], str]]) -> Iterator[Projection]:
+        """Transform rows in order, either in the current process or in a process pool.
+
+        Returns:
+            Iterator[Projection]: query or errors of each row.
+        """
+        if self.max_workers <= 1:
+            plan = self.schema_plan(schema_fields, transform_field_name)
+            for row in rows:
+                yield plan.transform(row)
+            return
+        # transform_field_name may not be picklable, such as a bound method, hence names are resolved here.
+        field_names = (None if transform_field_name is None else
+                       {name: transform_field_name(name) for name in _all_field_names(schema_fields)})
+        rows_iterator = iter(rows)
+        chunks = iter(lambda: list(islice(rows_iterator, self.chunk_size)), [])
+        pending_chunks = deque()
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            for chunk in chunks:
+                pending_chunks.append(executor.submit(_transform_chunk, self, schema_fields, field_names, chunk))
+                # bound the number of chunks in memory
+                if len(pending_chunks) >= 2 * self.max_workers:
+                    yield from pending_chunks.popleft().result()
+            while pending_chunks:
+                yield from pending_chunks.popleft().result()
 
     def load_as(self, datums: Dict[str, TypedDatum]) -> Dict[str, str]:
         """
@@ -179,6 +405,53 @@ class BaseDataLiteralTransformer(SchemaMixin):
         transformer.ignore_unknown_values_flag = ignore
         return transformer
 
+    def use_process_pool(self, max_workers: Optional[int] = None,
+                         chunk_size: int = DEFAULT_TRANSFORM_CHUNK_SIZE):
+        """Transform rows in parallel, by chunks, with a process pool. Rows order and errors are preserved.
+           Worth it for large datum only since rows are sent to worker processes.
+
+        Args:
+            max_workers (Optional[int], optional): number of processes, 1 disables the process pool.
+                Defaults to the number of CPUs.
+            chunk_size (int, optional): number of rows sent at once to a worker.
+                Defaults to DEFAULT_TRANSFORM_CHUNK_SIZE.
+
+        Returns:
+            BaseDataLiteralTransformer: A new instance of the current implementation.
+        """
+        transformer = deepcopy(self)
+        transformer.max_workers = max_workers if max_workers else os.cpu_count()
+        transformer.chunk_size = chunk_size
+        return transformer
+
+    def with_literal_format(self, literal_format: LiteralFormat):
+        """Change how rows are assembled into a data literal.
+
+        Args:
+            literal_format (LiteralFormat): Choose one of the enum value.
+
+        Returns:
+            BaseDataLiteralTransformer: A new instance of the current implementation.
+        """
+        transformer = deepcopy(self)
+        transformer.literal_format = literal_format
+        return transformer
+
+    def with_literal_cache(self, literal_cache: Optional[LiteralCache]):
+        """Read data literals from a persistent cache instead of rendering them again.
+           Entries are addressed by the hash of datum content, schema, transformer options
+           and field names given by transform_field_name. The cache is shared across copies.
+
+        Args:
+            literal_cache (Optional[LiteralCache]): cache to use, None disables it.
+
+        Returns:
+            BaseDataLiteralTransformer: A new instance of the current implementation.
+        """
+        transformer = deepcopy(self)
+        transformer.literal_cache = literal_cache
+        return transformer
+
     def transform_to_literal(self, data_line: Dict[str, Any], schema: List[SchemaField],
                              transform_field_name: Optional[Callable[[str], str]]) -> str:
         """Transform dictionary to a data literal matching the given schema.
@@ -192,185 +465,121 @@ class BaseDataLiteralTransformer(SchemaMixin):
                 Given a column _PARTITIONDATE in the schema, output name may look like _BQTK_PARTITIONDATE.
                 This allows storing technical columns into a table by renaming them on the fly.
         """
+        return self.schema_plan(schema, transform_field_name).transform(data_line)
 
-        # Disabling too many statements since this is related to nested functions.
-        # Function scope is only for _transform_to_literal
-        # pylint: disable=R0915
-
-        effective_transform_field_name = transform_field_name if transform_field_name else lambda x: x
-
-        def _transform_repeated_field_to_literal(data_element: Any, schema_field: SchemaField, parent_path: str):
-            current_projection = None
-            errors = []
-            if isinstance(data_element[schema_field.name], list):
-                target_name = effective_transform_field_name(schema_field.name)
-                if len(data_element[schema_field.name]) == 0:
-                    field_type = self.generate_data_type(schema_field)
-                    current_projection = f"cast([] as {field_type}) as {target_name}"
-                else:
-                    nested_result = None
-                    if str.upper(schema_field.field_type) == "RECORD":
-                        nested_result = [_transform_struct_to_literal(element, schema_field.fields,
-                                                                      f"{parent_path}.{schema_field.name}[{i}]", None)
-                                         for i, element in enumerate(data_element[schema_field.name])]
-                    else:
-                        nested_result = [_transform_field_to_literal(element, schema_field,
-                                                                     f"{parent_path}.{schema_field.name}[{i}]")
-                                         for i, element in enumerate(data_element[schema_field.name])]
-                    nested_errors = [nested_error
-                                     for _, nested_errors in nested_result if nested_errors
-                                     for nested_error in nested_errors if nested_error]
-                    if nested_errors:
-                        errors.extend(nested_errors)
-                    else:
-                        nested_queries = ", ".join([nested_query for nested_query, _ in nested_result])
-                        current_projection = f"[{nested_queries}] as {target_name}"
-            else:
-                errors.append(f"{parent_path}.{schema_field.name} is not a list while schema is of type "
-                              f"{str.upper(schema_field.field_type)} and has mode {schema_field.mode}")
-            if errors:
-                return None, errors
-            return current_projection, None
-
-        def _check_required_field(data_element: Any, schema_field: SchemaField, parent_path: str) -> Optional[str]:
-            error = None
-            key = schema_field.name
-            if str.upper(schema_field.mode) == "REQUIRED" and (key not in data_element or not data_element[key]):
-                error = f"{parent_path}.{key} is required"
-            return error
-
-        def _transform_field_to_literal(data_element: Any, schema_field: SchemaField, attribute_path: str):
-            # we are handling all the kind of BQ types, that is why we have so many branches.
-            # pylint: disable=R0912
-            errors = []
-            field_projection = None
-            if data_element is None:
-                field_type = self.generate_data_type(SchemaField(schema_field.name, schema_field.field_type))
-                field_projection = f"cast(null as {field_type})"
-            elif str.upper(schema_field.field_type) == "GEOGRAPHY":
-                if isinstance(data_element, str) and BaseDataLiteralTransformer.GEOGRAPHY_RE.fullmatch(data_element):
-                    matches = BaseDataLiteralTransformer.GEOGRAPHY_RE.fullmatch(data_element)
-                    x_pos = matches.group(1)
-                    y_pos = matches.group(2)
-                    field_projection = f"ST_GEOGPOINT({x_pos}, {y_pos})"
-                else:
-                    errors.append(f"{attribute_path} is a GEOGRAPHY type. "
-                                  "It is expected to match POINT(x y) where x and y are FLOAT64. "
-                                  f"Instead get {data_element}. "
-                                  "POINT is case insensitive.")
-            elif str.upper(schema_field.field_type) == "STRING":
-                value = str(data_element).replace("\\", "\\\\")
-                value = value.replace("'", "\\'")
-                field_projection = f"'{value}'"
-            elif str.upper(schema_field.field_type) == "BYTES" and not self.cast_string_to_bytes:
-                field_projection = f"from_base64('{data_element}')"
-            elif str.upper(schema_field.field_type) == "TIMESTAMP" and not self.cast_datetime_like:
-                field_projection = f"timestamp '{data_element}'"
-            elif str.upper(schema_field.field_type) == "DATE" and not self.cast_datetime_like:
-                field_projection = f"date '{data_element}'"
-            elif str.upper(schema_field.field_type) == "TIME" and not self.cast_datetime_like:
-                field_projection = f"time '{data_element}'"
-            elif str.upper(schema_field.field_type) == "DATETIME" and not self.cast_datetime_like:
-                field_projection = f"datetime '{data_element}'"
-            elif str.upper(schema_field.field_type) in ["BOOLEAN", "BOOL"]:
-                field_projection = (f"{str.lower(str(data_element))}")
-            elif str.upper(schema_field.field_type) in ["INTEGER", "INT64"]:
-                field_projection = (f"cast({data_element} as INT64)")
-            elif str.upper(schema_field.field_type) in ["FLOAT", "FLOAT64"]:
-                field_projection = (f"cast({data_element} as FLOAT64)")
-            else:
-                value = data_element
-                if str.upper(schema_field.field_type) in ["TIMESTAMP", "DATE", "TIME", "DATETIME", "BYTES"]:
-                    value = str(data_element).replace("\\", "\\\\")
-                    value = value.replace("'", "\\'")
-                    value = f"'{value}'"
-                field_projection = f"cast({value} as {str.upper(schema_field.field_type)})"
-            if errors:
-                return None, errors
-            field_projection = (field_projection if schema_field.mode == "REPEATED"
-                                else f"{field_projection} as {effective_transform_field_name(schema_field.name)}")
-            return field_projection, None
-
-        def _transform_struct_to_literal(data_element: Dict[str, Any], schema: List[SchemaField], parent_path: str,
-                                         key: Optional[str], parent_schema: SchemaField = None):
-            # Disable this too many local variable. Didn't find a way to simplify this.
-            # pylint: disable=R0914
-            # Disable too many branches since rework may make it less readable (dispatch of functions)
-            # pylint: disable=R0912
-            current_projection = []
-            errors = []
-            result = (None, None)
-            if isinstance(data_element, dict):
-                schema_fields_name = [field.name for field in schema]
-                all_keys = list(OrderedDict.fromkeys(schema_fields_name + list(data_element.keys())))
-                for child_key in all_keys:
-                    if child_key not in schema_fields_name:
-                        if not self.ignore_unknown_values_flag:
-                            errors.append(f"Key {child_key} @ .{parent_path} not in schema")
-                    else:
-                        schema_field = next(field for field in schema if field.name == child_key)
-                        error = _check_required_field(data_element, schema_field, parent_path)
-                        if error:
-                            errors.append(error)
-                        elif child_key not in data_element or data_element[child_key] is None:
-                            field_type = self.generate_data_type(schema_field)
-                            projection = f"cast(null as {field_type}) as {effective_transform_field_name(child_key)}"
-                            current_projection.append(projection)
-                        else:
-                            field_projection, field_errors = None, None
-                            if str.upper(schema_field.mode) == "REPEATED":
-                                field_projection, field_errors = _transform_repeated_field_to_literal(data_element,
-                                                                                                      schema_field,
-                                                                                                      parent_path)
-                            elif str.upper(schema_field.field_type) == "RECORD":
-                                child_path = f"{parent_path}.{child_key}"
-                                field_projection, field_errors = _transform_struct_to_literal(data_element[child_key],
-                                                                                              schema_field.fields,
-                                                                                              child_path,
-                                                                                              child_key,
-                                                                                              schema_field)
-                            else:
-                                child_path = f"{parent_path}.{child_key}"
-                                field_projection, field_errors = _transform_field_to_literal(data_element[child_key],
-                                                                                             schema_field,
-                                                                                             child_path)
-                            if field_errors:
-                                errors.extend(field_errors)
-                            else:
-                                current_projection.append(field_projection)
-            elif data_element:
-                parent_schema_type = parent_schema.field_type if parent_schema else "RECORD"
-                errors.append(f"{parent_path} is not a dictionary while schema is of type {parent_schema_type}")
-            if errors:
-                result = (None, errors)
-            elif current_projection:
-                nested_query = ", ".join(current_projection)
-                alias = f" as {effective_transform_field_name(key)}" if key else ""
-                final_projection = f"struct({nested_query}){alias}" if parent_path else nested_query
-                result = (final_projection, None)
+    def schema_plan(self, schema: List[SchemaField],
+                    transform_field_name: Optional[Callable[[str], str]] = None) -> SchemaPlan:
+        """Compile the schema with the current options. The last DEFAULT_SCHEMA_PLAN_CACHE_SIZE compiled plans
+           are cached by schema fingerprint, field names given by transform_field_name and options.
+           Calls with the same fields and field names as the previous call reuse its plan without any lookup,
+           even if the schema list has been changed in place since fields are compared one by one.
+
+        Args:
+            schema (List[SchemaField]): schema to compile.
+            transform_field_name (Optional[Callable[[str], str]]): function to change field name.
+
+        Returns:
+            SchemaPlan: plan used to transform rows into data literals.
+        """
+        options = (self.cast_string_to_bytes, self.cast_datetime_like,
+                   self.ignore_unknown_values_flag, self.literal_format)
+        field_names = (tuple((name, transform_field_name(name)) for name in _all_field_names(schema))
+                       if transform_field_name else None)
+        fields = tuple(schema)
+        last_plan = self._last_plan
+        # fields are immutable, thus the same fields have the same fingerprint.
+        if (last_plan is not None and len(last_plan[0]) == len(fields) and
+                all(last_field is field for last_field, field in zip(last_plan[0], fields)) and
+                last_plan[1] == field_names and last_plan[2] == options):
+            return last_plan[3]
+        key = (self.schema_fingerprint(schema), field_names) + options
+        plan = self._schema_plans.get(key)
+        if plan is None:
+            plan = SchemaPlan(schema,
+                              cast_string_to_bytes=self.cast_string_to_bytes,
+                              cast_datetime_like=self.cast_datetime_like,
+                              ignore_unknown_values=self.ignore_unknown_values_flag,
+                              transform_field_name=transform_field_name,
+                              positional=self.literal_format == LiteralFormat.ARRAY_OF_STRUCTS)
+            self._schema_plans[key] = plan
+            while len(self._schema_plans) > DEFAULT_SCHEMA_PLAN_CACHE_SIZE:
+                self._schema_plans.popitem(last=False)
+        else:
+            self._schema_plans.move_to_end(key)
+        self._last_plan = (fields, field_names, options, plan)
+        return plan
+
+    def __deepcopy__(self, memo):
+        transformer = self.__class__.__new__(self.__class__)
+        memo[id(self)] = transformer
+        for name, value in self.__dict__.items():
+            # compiled plans are bound to the options of this instance, hence they are not shared.
+            if name == "_schema_plans":
+                setattr(transformer, name, OrderedDict())
+            elif name == "_last_plan":
+                setattr(transformer, name, None)
             else:
-                # if there is no projection, this means that we have a null struct.
-                field_type = self.generate_data_type(schema)
-                alias = f" as {effective_transform_field_name(key)}" if key else ""
-                final_projection = f"cast(null as {field_type}){alias}"
-                result = (final_projection, None)
-            return result
-        query, errors = _transform_struct_to_literal(data_line, schema, "", None)
-        if query:
-            query = f"select {query}"
-        return query, errors
+                setattr(transformer, name, deepcopy(value, memo))
+        return transformer
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # compiled plans hold lambdas, they are compiled again once unpickled.
+        state["_schema_plans"] = OrderedDict()
+        state["_last_plan"] = None
+        # workers only transform rows, cache is used by the parent process.
+        state["literal_cache"] = None
+        return state
+
+    def _literal_cache_key(self, datum: DatumResource, schema_fields: List[SchemaField],
+                           transform_field_name: Optional[Callable[[str], str]], *extra: Any) -> str:
+        digest = hashlib.sha256()
+
+        def _update(part: str) -> None:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        options = {name: repr(value) for name, value in self.__dict__.items()
+                   if name not in _LITERAL_CACHE_IGNORED_OPTIONS}
+        field_names = ({name: transform_field_name(name) for name in _all_field_names(schema_fields)}
+                       if transform_field_name else None)
+        _update(f"{self.__class__.__module__}.{self.__class__.__qualname__}")
+        _update(json.dumps(options, sort_keys=True))
+        _update(json.dumps([field.to_api_repr() for field in schema_fields], sort_keys=True))
+        _update(json.dumps(field_names, sort_keys=True))
+        _update(json.dumps(extra))
+        if isinstance(datum, str):
+            _update(datum)
+        elif datum:
+            for line in self._iter_lines(datum):
+                _update(line)
+        return digest.hexdigest()
 
     @staticmethod
-    def _load_lines_as_array(datum: DatumResource) -> List[Any]:
-        datum_lines = None
+    def _iter_lines(datum: DatumResource) -> Iterator[str]:
         if isinstance(datum, BaseResourceLoader):
-            datum_lines = datum.load().splitlines(keepends=False)
+            yield from datum.iter_lines()
         elif isinstance(datum, str):
-            datum_lines = datum.splitlines(keepends=False)
+            yield from datum.splitlines(keepends=False)
         elif isinstance(datum, list) and (len(datum) == 0 or isinstance(datum[0], str)):
-            datum_lines = datum
+            yield from datum
         else:
             raise InvalidInstanceException(type(datum),
                                            expected_list_instances=[str],
                                            expected_instances=[BaseResourceLoader, str])
-        return datum_lines
+
+
+# options that change how a data literal is computed, not what it is.
+_LITERAL_CACHE_IGNORED_OPTIONS = {"_schema_plans", "_last_plan", "literal_cache", "max_workers", "chunk_size"}
+
+
+def _all_field_names(schema_fields: List[SchemaField]) -> Iterator[str]:
+    for schema_field in schema_fields:
+        yield schema_field.name
+        yield from _all_field_names(schema_field.fields)
+
+
+def _transform_chunk(transformer: BaseDataLiteralTransformer, schema_fields: List[SchemaField],
+                     field_names: Optional[Dict[str, str]], rows: List[Dict[str, Any]]) -> List[Projection]:
+    transform_field_name = field_names.__getitem__ if field_names is not None else None
+    plan = transformer.schema_plan(schema_fields, transform_field_name)
+    return [plan.transform(row) for row in rows]
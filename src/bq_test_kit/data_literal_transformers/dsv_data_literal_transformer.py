@@ -8,7 +8,8 @@
 
 import csv
 from copy import deepcopy
-from typing import Callable, List, Optional, Union
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Union
 
 from google.cloud.bigquery.schema import SchemaField
 
@@ -85,12 +86,10 @@ class DsvDataLiteralTransformer(BaseDataLiteralTransformer):
         new_ddlt.leading_rows_to_skip = nb_lines
         return new_ddlt
 
-    def _load(self, datum: Union[BaseResourceLoader, str, List[str]],
-              schema_fields: List[SchemaField],
-              transform_field_name: Optional[Callable[[str], str]]) -> str:
+    def _iter_rows(self, datum: Union[BaseResourceLoader, str, List[str]],
+                   schema_fields: List[SchemaField]) -> Iterator[Dict[str, Any]]:
         """
-            Load a dvs inputs and transform them as data literal, preserving target schema with a fullfilled line.
-            This fullfilled line is, of course, discarded from the literal datum.
+            Parse dsv inputs lazily. Literal generation is handled by BaseDataLiteralTransformer.
 
             Extra columns are put in another column named __extra-columns__.
 
@@ -100,28 +99,19 @@ class DsvDataLiteralTransformer(BaseDataLiteralTransformer):
             schema List[SchemaField]:
                 schema to match with while transforming data to literal.
 
-        Raises:
-            DataLiteralTransformException:
-                raised when an input data could not be transformed
-                as data literal with schema match.
-
         Returns:
-            str: data literal
+            Iterator[Dict[str, Any]]: dsv rows as dictionaries.
         """
-        csv_lines = self._load_lines_as_array(datum)
-        data_csv_lines = csv_lines[self.leading_rows_to_skip:]
-        if data_csv_lines:
-            rows = csv.DictReader(
-                data_csv_lines,
-                fieldnames=[f.name for f in schema_fields],
-                delimiter=self.field_delimiter,
-                quotechar=self.quote_character,
-                escapechar=self.escape_character,
-                doublequote=False,
-                skipinitialspace=False,
-                quoting=csv.QUOTE_MINIMAL,
-                strict=True,
-                restkey="__extra-columns__"
-            )
-            return self._to_data_literal(rows, schema_fields, transform_field_name)
-        return self.load([], schema_fields)
+        data_csv_lines = islice(self._iter_lines(datum), self.leading_rows_to_skip, None)
+        return csv.DictReader(
+            data_csv_lines,
+            fieldnames=[f.name for f in schema_fields],
+            delimiter=self.field_delimiter,
+            quotechar=self.quote_character,
+            escapechar=self.escape_character,
+            doublequote=False,
+            skipinitialspace=False,
+            quoting=csv.QUOTE_MINIMAL,
+            strict=True,
+            restkey="__extra-columns__"
+        )
@@ -9,7 +9,7 @@
 import json
 from copy import deepcopy
 from json.decoder import JSONDecodeError
-from typing import Any, Callable, List, Optional, Union
+from typing import Any, Iterator, List, Optional, Union
 
 from google.cloud.bigquery.schema import SchemaField
 from logzero import logger
@@ -47,12 +47,10 @@ class JsonDataLiteralTransformer(BaseDataLiteralTransformer):
         new_jdlt.json_format = json_format
         return new_jdlt
 
-    def _load(self, datum: Union[BaseResourceLoader, str, List[str]],
-              schema_fields: List[SchemaField],
-              transform_field_name: Optional[Callable[[str], str]]) -> str:
+    def _iter_rows(self, datum: Union[BaseResourceLoader, str, List[str]],
+                   schema_fields: List[SchemaField]) -> Iterator[Any]:
         """
-            Load a json inputs and transform them as data literal, preserving target schema with a fullfilled line.
-            This fullfilled line is, of course, discarded from the literal datum.
+            Parse json inputs lazily. Literal generation is handled by BaseDataLiteralTransformer.
 
         Args:
             datum (Union[BaseResourceLoader, str, List[str]]):
@@ -63,22 +61,14 @@ class JsonDataLiteralTransformer(BaseDataLiteralTransformer):
                 schema to match with while transforming data to literal.
 
         Raises:
-            RowParsingException: raised when a line could not be parsed.
-            DataLiteralTransformException:
-                raised when an input data could not be transformed
-                as data literal with schema match.
+            RowParsingException: raised once all lines are consumed, when at least one line could not be parsed.
 
         Returns:
-            str: data literal
+            Iterator[Any]: json rows.
         """
-        json_lines = None
         if self.json_format == JsonFormat.JSON_ARRAY and not isinstance(datum, list):
-            json_lines = self._load_json_array(datum)
-        else:
-            json_lines = self._load_json_lines(datum)
-        if json_lines:
-            return self._to_data_literal(json_lines, schema_fields, transform_field_name)
-        return self._empty_literal(schema_fields, transform_field_name)
+            return iter(self._load_json_array(datum))
+        return self._iter_json_lines(datum)
 
     @staticmethod
     def _load_json_array(datum: Union[BaseResourceLoader, str]) -> List[Any]:
@@ -95,12 +85,16 @@ class JsonDataLiteralTransformer(BaseDataLiteralTransformer):
         assert isinstance(json_array, list), 'Given json must be an array'
         return json_array
 
-    def _load_json_lines(self, datum: Union[BaseResourceLoader, str, List[str]]) -> List[Any]:
-        datum_lines = self._load_lines_as_array(datum)
-        json_lines = [self._load_json_line(i, line) for i, line in enumerate(datum_lines)]
-        if any([json_line is None for json_line in json_lines]):
+    def _iter_json_lines(self, datum: Union[BaseResourceLoader, str, List[str]]) -> Iterator[Any]:
+        has_parsing_error = False
+        for i, line in enumerate(self._iter_lines(datum)):
+            json_line = self._load_json_line(i, line)
+            if json_line is None:
+                has_parsing_error = True
+            elif not has_parsing_error:
+                yield json_line
+        if has_parsing_error:
             raise RowParsingException()
-        return json_lines
 
     @staticmethod
     def _load_json_line(line_number: int, line: str) -> Optional[Any]:
@@ -0,0 +1,187 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+    Persistent cache of rendered data literals, addressed by the hash of what they are rendered from.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+from logzero import logger
+
+from bq_test_kit.constants import DEFAULT_LITERAL_CACHE_SIZE
+
+
+class LiteralCacheStats(NamedTuple):
+    """Counters of a LiteralCache since its creation or its last reset.
+       cold_seconds is the time spent rendering and storing missing entries,
+       warm_seconds is the time spent reading hit entries.
+    """
+    hits: int
+    misses: int
+    cold_seconds: float
+    warm_seconds: float
+
+
+class LiteralCache():
+    """Store rendered data literals in a directory, one file per key.
+       Least recently used files are evicted once the directory exceeds max_size bytes.
+    """
+
+    SUFFIX = ".sql"
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_LITERAL_CACHE_SIZE) -> None:
+        """Constructor of LiteralCache.
+
+        Args:
+            directory (str): directory holding cached data literals, created if it does not exist.
+            max_size (int, optional): maximum size of the directory in bytes.
+                Defaults to bq_test_kit.constants.DEFAULT_LITERAL_CACHE_SIZE.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def get(self, key: str) -> Optional[str]:
+        """Read a data literal.
+
+        Args:
+            key (str): hexadecimal hash of the data literal.
+
+        Returns:
+            Optional[str]: cached data literal or None if missing.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as cached_file:
+                literal = cached_file.read()
+        except FileNotFoundError:
+            return None
+        # mtime tracks the last usage of the entry, see _evict.
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # evicted by another process since it has been read.
+            pass
+        return literal
+
+    def put(self, key: str, literal: str) -> None:
+        """Store a data literal and evict least recently used ones if needed.
+
+        Args:
+            key (str): hexadecimal hash of the data literal.
+            literal (str): data literal to store.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as cached_file:
+            cached_file.write(literal)
+        # atomic, concurrent writers of the same key write the same content anyway.
+        os.replace(temp_path, path)
+        self._evict()
+
+    def get_or_render(self, key: str, render: Callable[[], str]) -> str:
+        """Read a data literal or render and store it if it is missing.
+
+        Args:
+            key (str): hexadecimal hash of the data literal.
+            render (Callable[[], str]): render the data literal on miss.
+
+        Returns:
+            str: data literal.
+        """
+        start = time.perf_counter()
+        literal = self.get(key)
+        if literal is not None:
+            logger.info("Data literal %s read from cache.", key)
+            self._record(hit=True, seconds=time.perf_counter() - start)
+            return literal
+        literal = render()
+        self.put(key, literal)
+        self._record(hit=False, seconds=time.perf_counter() - start)
+        return literal
+
+    def stats(self) -> LiteralCacheStats:
+        """
+        Returns:
+            LiteralCacheStats: hits, misses and time spent on both.
+        """
+        with self._lock:
+            return LiteralCacheStats(self._hits, self._misses, self._cold_seconds, self._warm_seconds)
+
+    def reset_stats(self) -> None:
+        """Reset counters returned by stats.
+        """
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._cold_seconds = 0.0
+            self._warm_seconds = 0.0
+
+    def clear(self) -> None:
+        """Remove all cached data literals.
+        """
+        for entry in self._entries():
+            self._remove(entry.path)
+
+    def _record(self, *, hit: bool, seconds: float) -> None:
+        with self._lock:
+            if hit:
+                self._hits += 1
+                self._warm_seconds += seconds
+            else:
+                self._misses += 1
+                self._cold_seconds += seconds
+
+    def _evict(self) -> None:
+        entries = []
+        size = 0
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            size += stat.st_size
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            logger.debug("Evicting %s from data literal cache.", path)
+            self._remove(path)
+            size -= entry_size
+
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [entry for entry in os.scandir(self.directory)
+                if entry.is_file() and entry.name.endswith(self.SUFFIX)]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def __deepcopy__(self, memo) -> 'LiteralCache':
+        # a cache is a shared resource, copies of a transformer keep using it.
+        return self
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,20 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+# C0114 disabled because this module contains only one class
+# pylint: disable=C0114
+
+from enum import Enum
+
+
+class LiteralFormat(Enum):
+    """
+        Specify how rows are assembled into a data literal.
+        UNION_ALL means that each row is a select statement, all of them joined with union all.
+        ARRAY_OF_STRUCTS means that rows are positional structs of an array whose type is declared once,
+        the whole array being unnested. This keeps the query smaller and simpler to plan for BigQuery.
+    """
+    UNION_ALL = "UNION_ALL"
+    ARRAY_OF_STRUCTS = "ARRAY_OF_STRUCTS"
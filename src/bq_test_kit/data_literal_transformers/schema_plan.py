@@ -0,0 +1,360 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+    Compiled schema used by data literal transformers.
+    A SchemaPlan is built once per schema and reused for every row,
+    so that row transformation is only dispatch and string assembly.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from google.cloud.bigquery.schema import SchemaField
+
+from bq_test_kit.bq_dsl.schema_mixin import SchemaMixin
+
+Projection = Tuple[Optional[str], Optional[List[str]]]
+
+GEOGRAPHY_RE = re.compile("^POINT\\(\\s*([-+]?\\d+\\.?\\d*)\\s+([-+]?\\d+\\.?\\d*)\\s*\\)\\s*$",
+                          flags=re.S | re.IGNORECASE)
+# REGEX that identifies geography point
+
+DATETIME_LIKE_PREFIXES = {
+    "TIMESTAMP": "timestamp",
+    "DATE": "date",
+    "TIME": "time",
+    "DATETIME": "datetime"
+}
+
+
+def _escape(value: Any) -> str:
+    escaped_value = str(value).replace("\\", "\\\\")
+    return escaped_value.replace("'", "\\'")
+
+
+class FieldPlan():
+    """
+        Compiled field of a schema. Everything that only depends on the schema is computed once,
+        value dependent projection is delegated to the emitter bound at construction time.
+    """
+
+    def __init__(self, schema_field: SchemaField, plan: 'SchemaPlan') -> None:
+        """Constructor of FieldPlan
+
+        Args:
+            schema_field (SchemaField): field to compile.
+            plan (SchemaPlan): root plan holding transformer options.
+        """
+        self.schema_field = schema_field
+        self.name = schema_field.name
+        self.target_name = plan.transform_field_name(schema_field.name)
+        self.positional = plan.positional
+        self.alias = "" if plan.positional else f" as {self.target_name}"
+        self.field_type = str.upper(schema_field.field_type)
+        self.mode = schema_field.mode
+        self.is_repeated = str.upper(schema_field.mode) == "REPEATED"
+        self.is_record = self.field_type == "RECORD"
+        self.is_required = str.upper(schema_field.mode) == "REQUIRED"
+        self.record_plan = (SchemaPlan(schema_field.fields, parent=plan)
+                            if self.is_record else None)
+        self._value_to_literal = None if self.is_record else plan.value_emitter(self.field_type)
+        self._data_type = None
+        self._element_data_type = None
+        if self.is_repeated:
+            self.emit = self._emit_repeated
+        elif self.is_record:
+            self.emit = self._emit_record
+        else:
+            self.emit = self._emit_field
+
+    @property
+    def data_type(self) -> str:
+        """Data type of the field, computed once on first access.
+
+        Returns:
+            str: data type as generated by SchemaMixin.generate_data_type.
+        """
+        if self._data_type is None:
+            self._data_type = SchemaMixin.generate_data_type(self.schema_field)
+        return self._data_type
+
+    @property
+    def element_data_type(self) -> str:
+        """Data type of a single element of the field, regardless of its mode.
+
+        Returns:
+            str: data type as generated by SchemaMixin.generate_data_type.
+        """
+        if self._element_data_type is None:
+            self._element_data_type = SchemaMixin.generate_data_type(SchemaField(self.name,
+                                                                                 self.schema_field.field_type))
+        return self._element_data_type
+
+    @property
+    def target_data_type(self) -> str:
+        """Data type of the field where nested names are transformed with transform_field_name.
+
+        Returns:
+            str: data type used to declare rows of an array of structs.
+        """
+        element_type = self.record_plan.row_type if self.is_record else self.element_data_type
+        return f"ARRAY<{element_type}>" if self.is_repeated else element_type
+
+    def null_projection(self) -> str:
+        """
+        Returns:
+            str: projection of the field when its value is missing.
+        """
+        if self.positional:
+            return "null"
+        return f"cast(null as {self.data_type}) as {self.target_name}"
+
+    def check_required(self, data_element: Dict[str, Any], parent_path: str) -> Optional[str]:
+        """
+        Args:
+            data_element (Dict[str, Any]): record holding the field.
+            parent_path (str): path of the record.
+
+        Returns:
+            Optional[str]: error if the field is required and missing.
+        """
+        if self.is_required and (self.name not in data_element or not data_element[self.name]):
+            return f"{parent_path}.{self.name} is required"
+        return None
+
+    def _emit_record(self, data_element: Dict[str, Any], parent_path: str) -> Projection:
+        return self.record_plan.emit(data_element[self.name], f"{parent_path}.{self.name}",
+                                     self.target_name, self.field_type)
+
+    def _emit_field(self, data_element: Dict[str, Any], parent_path: str) -> Projection:
+        return self.emit_value(data_element[self.name], f"{parent_path}.{self.name}")
+
+    def emit_value(self, value: Any, attribute_path: str) -> Projection:
+        """Transform a single scalar value.
+
+        Args:
+            value (Any): value to transform.
+            attribute_path (str): path of the value, used in error messages.
+
+        Returns:
+            Projection: projection or errors.
+        """
+        if value is None:
+            projection = "null" if self.positional else f"cast(null as {self.element_data_type})"
+        else:
+            projection, error = self._value_to_literal(value, attribute_path)
+            if error:
+                return None, [error]
+        if self.mode == "REPEATED":
+            return projection, None
+        return f"{projection}{self.alias}", None
+
+    def _emit_repeated(self, data_element: Dict[str, Any], parent_path: str) -> Projection:
+        elements = data_element[self.name]
+        if not isinstance(elements, list):
+            return None, [f"{parent_path}.{self.name} is not a list while schema is of type "
+                          f"{self.field_type} and has mode {self.mode}"]
+        if len(elements) == 0:
+            return ("[]" if self.positional else f"cast([] as {self.data_type}) as {self.target_name}"), None
+        path_prefix = f"{parent_path}.{self.name}"
+        if self.is_record:
+            nested_result = [self.record_plan.emit(element, f"{path_prefix}[{i}]", None, None)
+                             for i, element in enumerate(elements)]
+        else:
+            nested_result = [self.emit_value(element, f"{path_prefix}[{i}]")
+                             for i, element in enumerate(elements)]
+        nested_errors = [nested_error
+                         for _, nested_errors in nested_result if nested_errors
+                         for nested_error in nested_errors if nested_error]
+        if nested_errors:
+            return None, nested_errors
+        nested_queries = ", ".join([nested_query for nested_query, _ in nested_result])
+        return f"[{nested_queries}]{self.alias}", None
+
+
+class SchemaPlan():
+    """
+        Compiled form of a record schema.
+        Fields are indexed by name and bound to their emitter once for all rows.
+    """
+
+    def __init__(self, schema: List[SchemaField],
+                 *, cast_string_to_bytes: bool = False, cast_datetime_like: bool = False,
+                 ignore_unknown_values: bool = False,
+                 transform_field_name: Optional[Callable[[str], str]] = None,
+                 positional: bool = False, parent: Optional['SchemaPlan'] = None) -> None:
+        """Constructor of SchemaPlan
+
+        Args:
+            schema (List[SchemaField]): schema of the record.
+            cast_string_to_bytes (bool, optional): use cast expression for bytes. Defaults to False.
+            cast_datetime_like (bool, optional): use cast expression for datetime like. Defaults to False.
+            ignore_unknown_values (bool, optional): ignore keys not in schema. Defaults to False.
+            transform_field_name (Optional[Callable[[str], str]], optional): function to change field name.
+                Defaults to None.
+            positional (bool, optional): emit rows as positional structs without aliases,
+                data type being declared once with row_type. Defaults to False.
+            parent (Optional[SchemaPlan], optional): plan of the parent record whose options are inherited.
+                Defaults to None.
+        """
+        # Options are keyword only and mirror the ones of the transformer.
+        # pylint: disable=R0913
+        if parent:
+            cast_string_to_bytes = parent.cast_string_to_bytes
+            cast_datetime_like = parent.cast_datetime_like
+            ignore_unknown_values = parent.ignore_unknown_values
+            transform_field_name = parent.transform_field_name
+            positional = parent.positional
+        self.schema = schema
+        self.cast_string_to_bytes = cast_string_to_bytes
+        self.cast_datetime_like = cast_datetime_like
+        self.ignore_unknown_values = ignore_unknown_values
+        self.transform_field_name = transform_field_name if transform_field_name else lambda x: x
+        self.positional = positional
+        self.fields = [FieldPlan(schema_field, self) for schema_field in schema]
+        self.index: Dict[str, FieldPlan] = {}
+        for field_plan in self.fields:
+            self.index.setdefault(field_plan.name, field_plan)
+        self._data_type = None
+        self._row_type = None
+
+    @property
+    def data_type(self) -> str:
+        """Data type of the record, computed once on first access.
+
+        Returns:
+            str: STRUCT data type as generated by SchemaMixin.generate_data_type.
+        """
+        if self._data_type is None:
+            self._data_type = SchemaMixin.generate_data_type(self.schema)
+        return self._data_type
+
+    @property
+    def row_type(self) -> str:
+        """Data type of the record where names are transformed with transform_field_name.
+
+        Returns:
+            str: STRUCT data type declaring rows emitted in positional mode.
+        """
+        if self._row_type is None:
+            fields_type = ", ".join([f"{field_plan.target_name} {field_plan.target_data_type}"
+                                     for field_plan in self.fields])
+            self._row_type = f"STRUCT<{fields_type}>"
+        return self._row_type
+
+    def transform(self, data_line: Dict[str, Any]) -> Projection:
+        """Transform a row into a select statement, or into a positional struct in positional mode.
+
+        Args:
+            data_line (Dict[str, Any]): row to transform.
+
+        Returns:
+            Projection: select statement or errors.
+        """
+        query, errors = self.emit(data_line, "", None, None)
+        if query and not self.positional:
+            query = f"select {query}"
+        return query, errors
+
+    def emit(self, data_element: Any, parent_path: str,
+             key: Optional[str], parent_schema_type: Optional[str]) -> Projection:
+        """Transform a record.
+
+        Args:
+            data_element (Any): record to transform, expected to be a dictionary.
+            parent_path (str): path of the record, empty for the root one.
+            key (Optional[str]): already transformed name used as alias, if any.
+            parent_schema_type (Optional[str]): type of the field holding the record.
+
+        Returns:
+            Projection: projection or errors.
+        """
+        current_projection = []
+        errors = []
+        if isinstance(data_element, dict):
+            current_projection, errors = self._emit_fields(data_element, parent_path)
+        elif data_element:
+            errors.append(f"{parent_path} is not a dictionary while schema is of type "
+                          f"{parent_schema_type if parent_schema_type else 'RECORD'}")
+        alias = f" as {key}" if key and not self.positional else ""
+        if errors:
+            return None, errors
+        if current_projection:
+            nested_query = ", ".join(current_projection)
+            if self.positional:
+                # tuple syntax needs at least two fields.
+                return (f"({nested_query})" if len(current_projection) > 1 else f"struct({nested_query})"), None
+            return (f"struct({nested_query}){alias}" if parent_path else nested_query), None
+        # if there is no projection, this means that we have a null struct.
+        if self.positional:
+            return "null", None
+        return f"cast(null as {self.data_type}){alias}", None
+
+    def _emit_fields(self, data_element: Dict[str, Any], parent_path: str) -> Tuple[List[str], List[str]]:
+        """Transform fields of a record, in the order of the schema.
+
+        Returns:
+            Tuple[List[str], List[str]]: projection of each field and errors.
+        """
+        projection = []
+        errors = []
+        for field_plan in self.fields:
+            error = field_plan.check_required(data_element, parent_path)
+            if error:
+                errors.append(error)
+            elif data_element.get(field_plan.name) is None:
+                projection.append(field_plan.null_projection())
+            else:
+                field_projection, field_errors = field_plan.emit(data_element, parent_path)
+                if field_errors:
+                    errors.extend(field_errors)
+                else:
+                    projection.append(field_projection)
+        if not self.ignore_unknown_values:
+            errors.extend([f"Key {child_key} @ .{parent_path} not in schema"
+                           for child_key in data_element if child_key not in self.index])
+        return projection, errors
+
+    def value_emitter(self, field_type: str) -> Callable[[Any, str], Tuple[Optional[str], Optional[str]]]:
+        """Select the function transforming a non null scalar value of the given type.
+
+        Args:
+            field_type (str): upper case BigQuery type.
+
+        Returns:
+            Callable[[Any, str], Tuple[Optional[str], Optional[str]]]:
+                function taking a value and its path and returning either a projection or an error.
+        """
+        # Dispatch of all BQ types, that is why we have so many returns.
+        # pylint: disable=R0911
+        if field_type == "GEOGRAPHY":
+            return self._geography_to_literal
+        if field_type == "STRING":
+            return lambda value, _: (f"'{_escape(value)}'", None)
+        if field_type == "BYTES" and not self.cast_string_to_bytes:
+            return lambda value, _: (f"from_base64('{value}')", None)
+        if field_type in DATETIME_LIKE_PREFIXES and not self.cast_datetime_like:
+            prefix = DATETIME_LIKE_PREFIXES[field_type]
+            return lambda value, _: (f"{prefix} '{value}'", None)
+        if field_type in ["BOOLEAN", "BOOL"]:
+            return lambda value, _: (str.lower(str(value)), None)
+        if field_type in ["INTEGER", "INT64"]:
+            return lambda value, _: (f"cast({value} as INT64)", None)
+        if field_type in ["FLOAT", "FLOAT64"]:
+            return lambda value, _: (f"cast({value} as FLOAT64)", None)
+        if field_type in ["TIMESTAMP", "DATE", "TIME", "DATETIME", "BYTES"]:
+            return lambda value, _: (f"cast('{_escape(value)}' as {field_type})", None)
+        return lambda value, _: (f"cast({value} as {field_type})", None)
+
+    @staticmethod
+    def _geography_to_literal(value: Any, attribute_path: str) -> Tuple[Optional[str], Optional[str]]:
+        matches = GEOGRAPHY_RE.fullmatch(value) if isinstance(value, str) else None
+        if matches:
+            return f"ST_GEOGPOINT({matches.group(1)}, {matches.group(2)})", None
+        return None, (f"{attribute_path} is a GEOGRAPHY type. "
+                      "It is expected to match POINT(x y) where x and y are FLOAT64. "
+                      f"Instead get {value}. "
+                      "POINT is case insensitive.")
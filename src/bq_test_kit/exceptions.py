@@ -58,3 +58,43 @@ class UnexpectedTypeException(Exception):
     """
     def __init__(self, field_type: str) -> None:
         super().__init__(f"Type {field_type} is not handled.")
+
+
+class DatasetPoolExhaustedException(Exception):
+    """
+        Raised when no dataset of a pool could be leased in time.
+    """
+    def __init__(self, name: str, max_size: int, timeout: float) -> None:
+        super().__init__(f"All {max_size} datasets of the pool {name} are leased, "
+                         f"none has been returned within {timeout} seconds.")
+
+
+class DataLoadException(Exception):
+    """
+        Raised when some data loads among many others failed, see BaseDataLoader.load_all.
+        runs holds the outcome of all loads.
+    """
+    def __init__(self, runs: list) -> None:
+        self.runs = runs
+        errors_str = ",\n".join([f"\t{run.table.fqdn()} : {run.error}" for run in runs if run.error is not None])
+        super().__init__(f"Data loads failed with the following errors :\n{errors_str}")
+
+
+class CassetteMissException(Exception):
+    """
+        Raised when a call to replay has not been recorded in the cassette, see CassetteClient.
+    """
+    def __init__(self, cassette_path: str, call: str) -> None:
+        super().__init__(f"{call} has not been recorded in {cassette_path}. "
+                         "Please record it again, for instance with CassetteMode.AUTO.")
+
+
+class BytesBudgetExceededException(Exception):
+    """
+        Raised when the dry run of a query estimates more bytes processed than allowed, see BQQueryTemplate.dry_run.
+    """
+    def __init__(self, total_bytes_processed: int, max_bytes: int) -> None:
+        self.total_bytes_processed = total_bytes_processed
+        self.max_bytes = max_bytes
+        super().__init__(f"Query would process {total_bytes_processed} bytes, "
+                         f"which is more than the budget of {max_bytes} bytes.")
@@ -0,0 +1,63 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+    Parsing of dates and times written with isoformat, since fromisoformat doesn't exist in python 3.6.
+"""
+
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional, Tuple
+
+_OFFSET_RE = re.compile(r"([+-])(\d{2}):(\d{2})(?::(\d{2}))?$")
+
+
+def parse_date(value: str) -> date:
+    """
+    Args:
+        value (str): date such as 2020-11-26.
+
+    Returns:
+        date: parsed date.
+    """
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def parse_time(value: str) -> time:
+    """
+    Args:
+        value (str): time such as 17:09:03.967259, optionally followed by an offset such as +00:00.
+
+    Returns:
+        time: parsed time, aware if an offset is given.
+    """
+    value, tzinfo = _split_offset(value)
+    parsed = datetime.strptime(value, "%H:%M:%S.%f" if "." in value else "%H:%M:%S").time()
+    return parsed.replace(tzinfo=tzinfo)
+
+
+def parse_datetime(value: str) -> datetime:
+    """
+    Args:
+        value (str): datetime such as 2020-11-26T17:09:03.967259, optionally followed by an offset such as +00:00.
+            Date and time may be separated by a space as well.
+
+    Returns:
+        datetime: parsed datetime, aware if an offset is given.
+    """
+    if len(value) == 10:
+        return datetime.combine(parse_date(value), time())
+    return datetime.combine(parse_date(value[:10]), parse_time(value[11:]))
+
+
+def _split_offset(value: str) -> Tuple[str, Optional[timezone]]:
+    if value.endswith("Z"):
+        return value[:-1], timezone.utc
+    match = _OFFSET_RE.search(value)
+    if match is None:
+        return value, None
+    sign, hours, minutes, seconds = match.groups()
+    offset = timedelta(hours=int(hours), minutes=int(minutes), seconds=int(seconds or 0))
+    return value[:match.start()], timezone(-offset if sign == "-" else offset)
@@ -0,0 +1,109 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+# C0114 disabled because this module contains only one class
+# pylint: disable=C0114
+
+import base64
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from google.cloud.bigquery.schema import SchemaField
+from google.cloud.bigquery.table import Row
+
+from bq_test_kit.iso_format import parse_date, parse_datetime, parse_time
+
+# tags of the values that JSON can't hold.
+_DECODERS: Dict[str, Callable[[str], Any]] = {
+    "$datetime": parse_datetime,
+    "$date": parse_date,
+    "$time": parse_time,
+    "$decimal": Decimal,
+    "$bytes": base64.b64decode
+}
+
+
+class RecordedRows():
+    """Rows of a job held in memory, with the attributes of RowIterator used by BQQueryResult.
+       They are recorded as JSON by cassettes and by the query result cache.
+    """
+
+    def __init__(self, schema: List[SchemaField], rows: List[List[Any]], total_rows: Optional[int]) -> None:
+        self.schema = schema
+        self.total_rows = total_rows
+        self._rows = rows
+        self._field_to_index = {field.name: index for index, field in enumerate(schema)}
+
+    def __iter__(self) -> Iterator[Row]:
+        return (Row(row, self._field_to_index) for row in self._rows)
+
+    @staticmethod
+    def from_row_iterator(row_iterator) -> 'RecordedRows':
+        """
+        Args:
+            row_iterator (RowIterator): rows returned by BigQuery, fully read.
+
+        Returns:
+            RecordedRows: copy of the rows, that can be recorded.
+        """
+        rows = [list(row.values()) for row in row_iterator]
+        return RecordedRows(list(row_iterator.schema or []), rows, row_iterator.total_rows)
+
+    @staticmethod
+    def from_record(record: Dict[str, Any]) -> 'RecordedRows':
+        """
+        Args:
+            record (Dict[str, Any]): rows as recorded by to_record.
+
+        Returns:
+            RecordedRows: recorded rows.
+        """
+        schema = [SchemaField.from_api_repr(field) for field in record["schema"]]
+        return RecordedRows(schema, _decode(record["rows"]), record["total_rows"])
+
+    def to_record(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: JSON serializable rows.
+        """
+        return {
+            "schema": [field.to_api_repr() for field in self.schema],
+            "rows": _encode(self._rows),
+            "total_rows": self.total_rows
+        }
+
+
+def _encode(value: Any) -> Any:
+    # datetime is checked before date since it is a subclass of date.
+    if isinstance(value, datetime):
+        encoded = {"$datetime": value.isoformat()}
+    elif isinstance(value, date):
+        encoded = {"$date": value.isoformat()}
+    elif isinstance(value, time):
+        encoded = {"$time": value.isoformat()}
+    elif isinstance(value, Decimal):
+        encoded = {"$decimal": str(value)}
+    elif isinstance(value, bytes):
+        encoded = {"$bytes": base64.b64encode(value).decode("ascii")}
+    elif isinstance(value, (dict, Row)):
+        encoded = {k: _encode(v) for k, v in value.items()}
+    elif isinstance(value, (list, tuple)):
+        encoded = [_encode(v) for v in value]
+    else:
+        encoded = value
+    return encoded
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1:
+            tag, encoded = next(iter(value.items()))
+            if tag in _DECODERS:
+                return _DECODERS[tag](encoded)
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
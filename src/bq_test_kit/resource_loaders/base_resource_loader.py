@@ -6,6 +6,8 @@
 # C0114 disabled because this module contains only one class
 # pylint: disable=C0114
 
+from typing import Iterator
+
 
 class BaseResourceLoader():
     """Base of all resource loader. Interface used by the DSL.
@@ -20,3 +22,12 @@ class BaseResourceLoader():
             str: resource as string.
         """
         raise NotImplementedError("Load must be implemented")
+
+    def iter_lines(self) -> Iterator[str]:
+        """Retrieve from a resource and iterate over its lines, without line terminators.
+           Default implementation loads the whole resource, loaders should override it to read lazily.
+
+        Returns:
+            Iterator[str]: lines of the resource.
+        """
+        return iter(self.load().splitlines(keepends=False))
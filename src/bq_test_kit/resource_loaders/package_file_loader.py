@@ -7,6 +7,7 @@
 # pylint: disable=C0114
 
 from os.path import basename, dirname
+from typing import Iterator
 
 import pkg_resources
 from logzero import logger
@@ -35,6 +36,12 @@ class PackageFileLoader(BaseResourceLoader):
         with open(self.absolute_path(), 'r') as schemafile:
             return schemafile.read()
 
+    def iter_lines(self) -> Iterator[str]:
+        logger.info("Streaming file %s in package %s", self.file_name, self.package)
+        with open(self.absolute_path(), 'r', encoding="utf-8") as datum_file:
+            for line in datum_file:
+                yield line.rstrip("\r\n")
+
     def absolute_path(self) -> str:
         """
         Returns:
@@ -0,0 +1,47 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+    Lexical analysis of BigQuery standard SQL, shared by the query templates and the execution backends.
+"""
+
+import re
+from typing import List, NamedTuple
+
+_TOKEN_RE = re.compile(r"""
+    (?P<space>\s+)
+    |(?P<comment>--[^\n]*|\#[^\n]*|/\*.*?\*/)
+    |(?P<string>(?:[rR][bB]?|[bB][rR]?)?(?:'''.*?'''|\"\"\".*?\"\"\"|'(?:\\.|[^'\\])*'|"(?:\\.|[^"\\])*"))
+    |(?P<quoted>`[^`]*`)
+    |(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    |(?P<word>[A-Za-z_][A-Za-z0-9_]*)
+    |(?P<param>@[A-Za-z_][A-Za-z0-9_]*)
+    |(?P<op><=|>=|<>|!=|\|\||.)
+""", re.VERBOSE | re.DOTALL)
+
+
+class Token(NamedTuple):
+    """Lexical unit of a query.
+    """
+    kind: str
+    text: str
+
+    def is_word(self, *words: str) -> bool:
+        """
+        Returns:
+            bool: True if the token is one of the given keywords, case insensitive.
+        """
+        return self.kind == "word" and self.text.upper() in words
+
+
+def tokenize(query: str) -> List[Token]:
+    """
+    Args:
+        query (str): BigQuery query.
+
+    Returns:
+        List[Token]: tokens of the query, whitespaces and comments included.
+    """
+    return [Token(match.lastgroup, match.group()) for match in _TOKEN_RE.finditer(query)]
@@ -0,0 +1,158 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import gzip
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from google.api_core.exceptions import BadRequest, NotFound
+from google.cloud.bigquery.schema import SchemaField
+from google.cloud.bigquery.table import Row, TableReference
+
+from bq_test_kit.backends import CassetteClient, CassetteMode, SQLiteClient
+from bq_test_kit.bq_dsl import BQQueryTemplate, Project
+from bq_test_kit.bq_test_kit_config import BQTestKitConfig
+from bq_test_kit.constants import DEFAULT_LOCATION
+from bq_test_kit.data_literal_transformers import JsonDataLiteralTransformer
+from bq_test_kit.exceptions import CassetteMissException
+from bq_test_kit.interpolators.shell_interpolator import ShellInterpolator
+
+QUERY = "select f.foo, b.bar from ${TABLE_FOO} f inner join ${TABLE_BAR} b on f.foobar = b.foobar"
+DATUM = {
+    "TABLE_FOO": (['{"foobar": "1", "foo": 1}'], [SchemaField("foobar", "STRING"), SchemaField("foo", "INT64")]),
+    "TABLE_BAR": (['{"foobar": "1", "bar": "b"}'], [SchemaField("foobar", "STRING"), SchemaField("bar", "STRING")])
+}
+
+
+def _conf():
+    return BQTestKitConfig({DEFAULT_LOCATION: "EU"})
+
+
+def _run(bq_client, query=QUERY, as_data_literals=True):
+    datum = BQQueryTemplate(from_=query, bqtk_config=_conf(), bq_client=bq_client,
+                            interpolators=[ShellInterpolator()]).with_datum(DATUM)
+    if as_data_literals:
+        datum = datum.as_data_literals()
+    return datum.loaded_with(JsonDataLiteralTransformer()).run()
+
+
+def _recorded_keys(cassette_path):
+    with gzip.open(cassette_path, "rt", encoding="utf-8") as cassette:
+        return set(json.load(cassette)["interactions"])
+
+
+def test_record_and_replay(tmp_path):
+    cassette_path = str(tmp_path / "cassettes" / "test.json.gz")
+    with CassetteClient(SQLiteClient(), cassette_path, CassetteMode.RECORD) as bq_client:
+        recorded = _run(bq_client)
+        assert _run(bq_client, as_data_literals=False).rows == recorded.rows
+        dataset = Project("test_project", bq_client=bq_client, bqtk_config=_conf()).dataset("dataset_foo")
+        with dataset as ds:
+            with ds.table("table_bar", schema=DATUM["TABLE_BAR"][1]):
+                pass
+    assert recorded.rows == [{"foo": 1, "bar": "b"}]
+
+    replay_client = CassetteClient(None, cassette_path, CassetteMode.REPLAY)
+    replayed = _run(replay_client, QUERY.replace(" b on", "\n  b   on -- comment\n"))
+    assert replayed.rows == recorded.rows
+    assert replayed.schema == recorded.schema
+    assert _run(replay_client, as_data_literals=False).rows == recorded.rows
+    dataset = Project("test_project", bq_client=replay_client, bqtk_config=_conf()).dataset("dataset_foo")
+    with dataset as ds:
+        with ds.table("table_bar", schema=DATUM["TABLE_BAR"][1]) as table:
+            assert table.fqdn() == "test_project.dataset_foo.table_bar"
+    with pytest.raises(NotFound):
+        replay_client.get_table("test_project.dataset_foo.table_bar")
+    with pytest.raises(CassetteMissException):
+        _run(replay_client, QUERY + " where f.foo = 1")
+
+
+def test_auto_mode_records_changed_queries(tmp_path):
+    cassette_path = str(tmp_path / "test.json.gz")
+    sqlite_client = SQLiteClient()
+    with CassetteClient(sqlite_client, cassette_path) as bq_client:
+        _run(bq_client)
+    first_keys = _recorded_keys(cassette_path)
+
+    changed_query = QUERY + " where f.foo = 1"
+    with CassetteClient(MagicMock(wraps=sqlite_client), cassette_path) as bq_client:
+        _run(bq_client)
+        bq_client._bq_client.query.assert_not_called()
+        assert _run(bq_client, changed_query).rows == [{"foo": 1, "bar": "b"}]
+        bq_client._bq_client.query.assert_called_once()
+    with CassetteClient(None, cassette_path, CassetteMode.REPLAY) as bq_client:
+        assert _run(bq_client, changed_query).rows == [{"foo": 1, "bar": "b"}]
+
+    with CassetteClient(sqlite_client, cassette_path) as bq_client:
+        _run(bq_client, changed_query)
+    assert not first_keys & _recorded_keys(cassette_path)
+
+
+def test_record_and_replay_dry_run(tmp_path):
+    cassette_path = str(tmp_path / "test.json.gz")
+    with CassetteClient(SQLiteClient(), cassette_path, CassetteMode.RECORD) as bq_client:
+        recorded = BQQueryTemplate(from_=QUERY, bqtk_config=_conf(), bq_client=bq_client,
+                                   interpolators=[ShellInterpolator()]).with_datum(DATUM) \
+                                                                       .loaded_with(JsonDataLiteralTransformer()) \
+                                                                       .dry_run()
+
+    replay_client = CassetteClient(None, cassette_path, CassetteMode.REPLAY)
+    replayed = BQQueryTemplate(from_=QUERY, bqtk_config=_conf(), bq_client=replay_client,
+                               interpolators=[ShellInterpolator()]).with_datum(DATUM) \
+                                                                   .loaded_with(JsonDataLiteralTransformer()) \
+                                                                   .dry_run()
+    assert replayed == recorded
+    assert [field.name for field in replayed.schema] == ["foo", "bar"]
+
+
+def test_record_and_replay_split_literals(tmp_path):
+    cassette_path = str(tmp_path / "test.json.gz")
+    datum = {"TABLE_FOO": (['{"foo": 1}', '{"foo": 2}'], [SchemaField("foo", "INT64")])}
+
+    def _run_split(bq_client):
+        return BQQueryTemplate(from_="select foo from ${TABLE_FOO} order by foo", bqtk_config=_conf(),
+                               bq_client=bq_client, interpolators=[ShellInterpolator()]) \
+            .with_max_literal_size(1).with_datum(datum).loaded_with(JsonDataLiteralTransformer()).run()
+
+    with CassetteClient(SQLiteClient(), cassette_path, CassetteMode.RECORD) as bq_client:
+        recorded = _run_split(bq_client)
+        assert _run_split(bq_client).rows == recorded.rows
+
+    replay_client = CassetteClient(None, cassette_path, CassetteMode.REPLAY)
+    assert _run_split(replay_client).rows == recorded.rows == [{"foo": 1}, {"foo": 2}]
+    # create, insert, query and abort of the session.
+    assert len(_recorded_keys(cassette_path)) == 4
+
+
+def test_replay_of_errors_and_values(tmp_path):
+    cassette_path = str(tmp_path / "test.json.gz")
+    values = [datetime(2020, 11, 26, 17, 9, 3, tzinfo=timezone.utc), date(2020, 11, 26),
+              Decimal("1.23"), b"\x00\xff", {"a": [b"b"]}]
+    job = MagicMock(job_id="job_1", total_bytes_processed=10, referenced_tables=[TableReference.from_string("p.d.t")])
+    job.result.return_value.schema = [SchemaField(f"f_{index}", "STRING") for index in range(len(values))]
+    job.result.return_value.total_rows = 1
+    job.result.return_value.__iter__.return_value = [Row(values, {f"f_{index}": index
+                                                                  for index in range(len(values))})]
+    failing_job = MagicMock(job_id="job_2")
+    failing_job.result.side_effect = BadRequest("Syntax error")
+    inner_client = MagicMock()
+    inner_client.query.side_effect = [job, failing_job]
+    with CassetteClient(inner_client, cassette_path, CassetteMode.RECORD) as bq_client:
+        bq_client.query("select 1").result()
+        with pytest.raises(BadRequest):
+            bq_client.query("select error").result()
+
+    bq_client = CassetteClient(None, cassette_path, CassetteMode.REPLAY)
+    replayed_job = bq_client.query("select 1")
+    assert list(next(iter(replayed_job.result())).values()) == values
+    assert replayed_job.total_bytes_processed == 10
+    assert replayed_job.referenced_tables == [TableReference.from_string("p.d.t")]
+    with pytest.raises(BadRequest, match="Syntax error"):
+        bq_client.query("select error").result()
+    with pytest.raises(ValueError):
+        CassetteClient(None, cassette_path, CassetteMode.AUTO)
@@ -0,0 +1,164 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from google.api_core.exceptions import BadRequest, Conflict, NotFound
+from google.cloud.bigquery import ConnectionProperty
+from google.cloud.bigquery.job import QueryJobConfig
+from google.cloud.bigquery.query import ScalarQueryParameter
+from google.cloud.bigquery.schema import SchemaField
+from google.cloud.bigquery.table import Row
+
+from bq_test_kit.backends import SQLiteClient
+from bq_test_kit.bq_dsl import BQQueryTemplate, Project
+from bq_test_kit.bq_dsl.bq_resources.tables import Tables
+from bq_test_kit.bq_test_kit_config import BQTestKitConfig
+from bq_test_kit.constants import DEFAULT_LOCATION
+from bq_test_kit.data_literal_transformers import (JsonDataLiteralTransformer,
+                                                   LiteralFormat)
+from bq_test_kit.interpolators.shell_interpolator import ShellInterpolator
+
+QUERY = "select f.foo, b.bar, f.rec.a as a, f.arr from ${TABLE_FOO} f inner join ${TABLE_BAR} b on f.foobar = b.foobar"
+DATUM = {
+    "TABLE_FOO": (['{"foobar": "1", "foo": 1, "rec": {"a": 1.5}, "arr": [{"x": 1}, {"x": 2}]}',
+                   '{"foobar": "2", "foo": 2}'],
+                  [SchemaField("foobar", "STRING"), SchemaField("foo", "INT64"),
+                   SchemaField("rec", "RECORD", fields=[SchemaField("a", "FLOAT64")]),
+                   SchemaField("arr", "RECORD", mode="REPEATED", fields=[SchemaField("x", "INT64")])]),
+    "TABLE_BAR": (['{"foobar": "1", "bar": "b"}'], [SchemaField("foobar", "STRING"), SchemaField("bar", "STRING")])
+}
+
+
+def _conf():
+    return BQTestKitConfig({DEFAULT_LOCATION: "EU"})
+
+
+def _query_template(bq_client, query=QUERY):
+    return BQQueryTemplate(from_=query, bqtk_config=_conf(), bq_client=bq_client,
+                           interpolators=[ShellInterpolator()])
+
+
+@pytest.mark.parametrize("literal_format", [LiteralFormat.UNION_ALL, LiteralFormat.ARRAY_OF_STRUCTS])
+def test_query_template_with_datum(literal_format):
+    bq_client = SQLiteClient()
+    transformer = JsonDataLiteralTransformer().with_literal_format(literal_format)
+    expected = [{"foo": 1, "bar": "b", "a": 1.5, "arr": [{"x": 1}, {"x": 2}]}]
+    result = _query_template(bq_client).with_datum(DATUM).as_data_literals().loaded_with(transformer).run()
+    assert result.rows == expected
+    assert [field.field_type for field in result.schema] == ["INTEGER", "STRING", "FLOAT", "RECORD"]
+    result = _query_template(bq_client).with_datum(DATUM).loaded_with(transformer).run()
+    assert result.rows == expected
+    result = _query_template(bq_client).with_datum(DATUM).loaded_with(transformer) \
+                                       .with_temp_tables_dropped().run()
+    assert result.rows == expected
+    assert bq_client._connection.execute("select count(*) from sqlite_temp_master").fetchone() == (0,)
+
+
+def test_declared_column_types():
+    bq_client = SQLiteClient()
+    result = _query_template(bq_client, "select '{\"a\": 1}' as s, true as b, date '2020-01-01' as d, "
+                                        "cast('1.5' as NUMERIC) as n, [struct(cast(1 as INT64) as x, false as y)] as r"
+                             ).run()
+    assert result.rows == [{"s": '{"a": 1}', "b": True, "d": date(2020, 1, 1), "n": Decimal("1.5"),
+                            "r": [{"x": 1, "y": False}]}]
+    assert [(field.field_type, field.mode) for field in result.schema] == [
+        ("STRING", "NULLABLE"), ("BOOLEAN", "NULLABLE"), ("DATE", "NULLABLE"), ("NUMERIC", "NULLABLE"),
+        ("RECORD", "REPEATED")
+    ]
+    result = _query_template(bq_client, "create temp table t as select cast(null as INT64) as i, '[1]' as s;\n"
+                                        "select t.* from t").run()
+    assert result.rows == [{"i": None, "s": "[1]"}]
+    assert [field.field_type for field in result.schema] == ["INTEGER", "STRING"]
+
+
+def test_resources_and_loads(tmp_path):
+    bq_client = SQLiteClient()
+    data_file = tmp_path / "data.json"
+    data_file.write_text('{"f_int": 1, "f_bool": true, "f_arr": ["a"]}\n{"f_int": 2, "f_bool": false}')
+    resource = MagicMock()
+    resource.absolute_path.return_value = str(data_file)
+    schema = [SchemaField("f_int", "INT64"), SchemaField("f_bool", "BOOLEAN"),
+              SchemaField("f_arr", "STRING", mode="REPEATED")]
+    dataset = Project("test_project", bq_client=bq_client, bqtk_config=_conf()).dataset("dataset_foo")
+    with dataset as ds:
+        assert bq_client.get_dataset(ds.fqdn()).dataset_id == "dataset_foo"
+        with pytest.raises(Conflict):
+            ds.create()
+        with ds.table("table_bar", schema=schema) as table:
+            table.json_loader(from_=resource).load()
+            result = _query_template(bq_client, f"select f_int, f_arr from `{table.fqdn()}` where f_bool "
+                                                f"and f_int = @f_int") \
+                .with_query_parameters([ScalarQueryParameter("f_int", "INT64", 1)]).run()
+            assert result.rows == [{"f_int": 1, "f_arr": ["a"]}]
+            _query_template(bq_client, f"select f_int * 10 as f_int from {table.fqdn()}") \
+                .with_destination(ds.table("table_dest")).run()
+            assert bq_client.get_table(f"{ds.fqdn()}.table_dest").schema[0].name == "f_int"
+            with pytest.raises(BadRequest):
+                _query_template(bq_client, "select unknown_column from dataset_foo.table_bar").run()
+        with Tables(ds.table("table_a", schema=schema), ds.table("table_b", schema=schema)).in_batch():
+            assert [t.table_id for t in bq_client.list_tables(ds.fqdn())] == ["table_a", "table_b", "table_dest"]
+        ds.table("table_dest").delete()
+    with pytest.raises(NotFound):
+        bq_client.get_dataset("test_project.dataset_foo")
+
+
+def test_query_template_with_split_literals():
+    bq_client = SQLiteClient()
+    transformer = JsonDataLiteralTransformer()
+    expected = [{"foo": 1, "bar": "b", "a": 1.5, "arr": [{"x": 1}, {"x": 2}]}]
+    query_template = _query_template(bq_client).with_max_literal_size(1).with_datum(DATUM).loaded_with(transformer)
+    assert query_template.run().rows == expected
+    nb_jobs = len(bq_client.list_jobs())
+    assert query_template.run().rows == expected
+    # table_foo is created then filled by a second setup job, the query and the abort of the session follow.
+    assert len(bq_client.list_jobs()) - nb_jobs == 4
+    assert bq_client._session_id is None
+    assert bq_client._connection.execute("select count(*) from sqlite_temp_master").fetchone() == (0,)
+    session_id = bq_client.query("select 1", job_config=QueryJobConfig(create_session=True)).session_info.session_id
+    query_template.job_config.connection_properties = [ConnectionProperty("session_id", session_id)]
+    assert query_template.run().rows == expected
+    assert query_template.run().rows == expected
+    assert bq_client._session_id == session_id
+
+
+def test_session():
+    bq_client = SQLiteClient()
+    job = bq_client.query("create temp table t as select 1 as i", job_config=QueryJobConfig(create_session=True))
+    session_id = job.session_info.session_id
+    session_config = QueryJobConfig(connection_properties=[ConnectionProperty("session_id", session_id)])
+    with pytest.raises(BadRequest, match="still active"):
+        bq_client.query("select 1", job_config=QueryJobConfig(create_session=True)).result()
+    assert list(bq_client.query("select 2 as i").result()) == [Row((2,), {"i": 0})]
+    assert [row.i for row in bq_client.query("select i from t", job_config=session_config).result()] == [1]
+    bq_client.query("CALL BQ.ABORT_SESSION();", job_config=session_config).result()
+    assert bq_client._connection.execute("select count(*) from sqlite_temp_master").fetchone() == (0,)
+    with pytest.raises(BadRequest, match="not found"):
+        bq_client.query("select i from t", job_config=session_config).result()
+
+
+def test_dry_run():
+    bq_client = SQLiteClient()
+    query_template = _query_template(bq_client).with_max_literal_size(1).with_datum(DATUM) \
+                                               .loaded_with(JsonDataLiteralTransformer())
+    estimate = query_template.dry_run(max_bytes=0)
+    assert estimate.total_bytes_processed == 0
+    assert estimate.referenced_tables == []
+    assert [(field.name, field.field_type) for field in estimate.schema] == [
+        ("foo", "INTEGER"), ("bar", "STRING"), ("a", "FLOAT"), ("arr", "RECORD")
+    ]
+    assert bq_client._connection.execute("select count(*) from sqlite_temp_master").fetchone() == (0,)
+    with pytest.raises(BadRequest):
+        _query_template(bq_client, "select unknown_column from ${TABLE_FOO}").with_datum(DATUM) \
+                                                                           .loaded_with(JsonDataLiteralTransformer()) \
+                                                                           .dry_run()
+    bq_client.create_dataset("dataset_foo")
+    job = bq_client.query("create table dataset_foo.t as select 1 as i", job_config=QueryJobConfig(dry_run=True))
+    assert list(job.result()) == []
+    with pytest.raises(NotFound):
+        bq_client.get_table("dataset_foo.t")
@@ -0,0 +1,62 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+from bq_test_kit.backends import SQLiteDialect
+from bq_test_kit.backends.sqlite_dialect import DataType
+
+
+def test_statements():
+    script = "CREATE TEMP TABLE t as (select ';' as x); # comment;\nselect * from t;\n"
+    assert SQLiteDialect().statements(script) == ["CREATE TEMP TABLE t as (select ';' as x)", "select * from t"]
+
+
+def test_translate_literals():
+    dialect = SQLiteDialect()
+    assert dialect.translate(r"(select cast(1 as INT64) as a, 'a\'b' as b, b'ab' as c, date '2020-01-01' as d)") == [
+        "select cast(1 as INTEGER) as a, 'a''b' as b, X'6162' as c, '2020-01-01' as d"
+    ]
+    assert dialect.translate("select struct(cast(1.5 as FLOAT64) as a, [1, 2] as l) as r, "
+                             "cast(null as STRUCT<a INT64>) as n") == [
+        "select json_object('a', cast(1.5 as REAL), 'l', json_array(1, 2)) as r, json(null) as n"
+    ]
+    assert dialect.translate("select * from unnest(ARRAY<STRUCT<a INT64, b STRUCT<c BYTES>>>"
+                             "[(1, (from_base64('YWI=')))])") == [
+        "select * from (select json_extract(value, '$.\"a\"') as \"a\", json_extract(value, '$.\"b\"') as \"b\" "
+        "from json_each(json_array(json_object('a', 1, 'b', json_object('c', 'YWI=')))))"
+    ]
+
+
+def test_translate_tables_and_paths():
+    dialect = SQLiteDialect()
+    assert dialect.translate("create or replace table ds.t2 as "
+                             "select t.r.a, r.b, array_agg(u) from `p.ds.t`, unnest(r.l) u") == [
+        'DROP TABLE IF EXISTS "ds.t2"',
+        "CREATE table \"ds.t2\" as select json_extract(t.r, '$.\"a\"'), json_extract(r, '$.\"b\"'), "
+        "json_group_array(u) from \"ds.t\" AS \"t\", "
+        "(select value as \"u\" from json_each(json_extract(r, '$.\"l\"'))) u"
+    ]
+    assert dialect.translate("create or replace temp table t as (select 1 as a)") == [
+        'DROP TABLE IF EXISTS "t"', 'CREATE temp table "t" as select 1 as a'
+    ]
+    assert dialect.translate("CREATE TABLE IF NOT EXISTS `p.ds.t` (\n`a` INT64 NOT NULL OPTIONS(description=\"x, y\"),"
+                             "\n`r` STRUCT<b ARRAY<STRING>>\n)\nPARTITION BY _PARTITIONDATE\nCLUSTER BY `a`") == [
+        'CREATE TABLE IF NOT EXISTS "ds.t" ("a" INTEGER NOT NULL, "r" TEXT)'
+    ]
+
+
+def test_column_types():
+    dialect = SQLiteDialect()
+    table = [("a", DataType("INT64")), ("r", DataType("STRUCT", fields=(("b", DataType("DATE")),)))]
+    tables = {("ds", "t"): table}
+    assert dialect.column_types("select t.r.b, a / 2 as c, count(*) n, a > 1 as p from `p.ds.t` t", tables.get) == [
+        ("b", DataType("DATE")), ("c", DataType("FLOAT64")), ("n", DataType("INT64")), ("p", DataType("BOOL"))
+    ]
+    assert dialect.column_types("select null as x union all select @x", tables.get, {"x": DataType("TIME")}) == [
+        ("x", DataType("TIME"))
+    ]
+    assert dialect.column_types("select * except (a) from ds.t", tables.get) == [table[1]]
+    assert dialect.column_types("select * from ds.unknown", tables.get) is None
+    assert dialect.column_types("insert into ds.t select 1, null", tables.get) == []
+    assert dialect.created_table("create or replace temp table t as select 1") == ("t",)
@@ -3,10 +3,20 @@
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
+from copy import deepcopy
+from unittest.mock import MagicMock
+
+import pytest
+from google.api_core.exceptions import BadRequest, Forbidden
 from google.cloud.bigquery.job import LoadJobConfig, WriteDisposition
 
+from bq_test_kit.bq_dsl import Project
+from bq_test_kit.bq_dsl.bq_resources.data_loaders import JsonDataLoader
 from bq_test_kit.bq_dsl.bq_resources.data_loaders.base_data_loader import \
     BaseDataLoader
+from bq_test_kit.bq_test_kit_config import BQTestKitConfig
+from bq_test_kit.constants import DEFAULT_LOCATION
+from bq_test_kit.exceptions import DataLoadException
 
 
 def test_change_ignore_unknown_values():
@@ -34,3 +44,76 @@ def test_change_to_partition():
     assert loader.partition is None
     loader = loader.to_partition("20201023")
     assert loader.partition == "20201023"
+
+
+def test_fluent_methods_share_table():
+    table = object()
+    loader = BaseDataLoader(table=table, from_=None, load_job_config=LoadJobConfig(), bq_client=None)
+    overwrite_loader = loader.overwrite()
+    assert overwrite_loader.table is table
+    assert overwrite_loader.load_job_config is not loader.load_job_config
+    assert loader.load_job_config.write_disposition is None
+
+
+def test_skip_if_unchanged(tmp_path):
+    data_file = tmp_path / "data.json"
+    data_file.write_text('{"f_int": 1}')
+    resource = MagicMock()
+    resource.absolute_path.return_value = str(data_file)
+    bq_client = MagicMock()
+    labels = {}
+    bq_client.get_table.return_value.labels = labels
+    bq_client.update_table.side_effect = lambda bqtable, fields: labels.update(bqtable.labels)
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    })
+    table = Project("test_project", bq_client=bq_client, bqtk_config=conf).dataset("dataset_foo").table("table_bar")
+    loader = JsonDataLoader(table=table, from_=resource, bq_client=bq_client).skip_if_unchanged()
+    assert deepcopy(loader).skip_unchanged
+    BaseDataLoader.reset_load_stats()
+    loader.load()
+    assert sorted(labels) == ["bqtk_definition", "bqtk_load"]
+    loader.load()
+    assert bq_client.load_table_from_file.call_count == 1
+    assert BaseDataLoader.load_stats() == (1, 1)
+    loader.overwrite().load()
+    data_file.write_text('{"f_int": 2}')
+    loader.overwrite().load()
+    loader.overwrite().load()
+    assert bq_client.load_table_from_file.call_count == 3
+    loader.to_partition("20201023").load()
+    assert sorted(labels) == ["bqtk_definition", "bqtk_load", "bqtk_load_20201023"]
+    loader.skip_if_unchanged(False).load()
+    assert BaseDataLoader.load_stats() == (5, 2)
+    BaseDataLoader.reset_load_stats()
+    assert BaseDataLoader.load_stats() == (0, 0)
+
+
+def test_load_all(tmp_path):
+    data_file = tmp_path / "data.json"
+    data_file.write_text('{"f_int": 1}')
+    resource = MagicMock()
+    resource.absolute_path.return_value = str(data_file)
+    bq_client = MagicMock()
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    })
+    dataset = Project("test_project", bq_client=bq_client, bqtk_config=conf).dataset("dataset_foo")
+    loaders = [JsonDataLoader(table=dataset.table(f"table_{i}"), from_=resource, bq_client=bq_client)
+               for i in range(3)]
+    runs = BaseDataLoader.load_all(loaders)
+    assert [run.table.name for run in runs] == ["table_0", "table_1", "table_2"]
+    assert all(run.succeeded and not run.skipped and run.duration > 0 for run in runs)
+    assert bq_client.load_table_from_file.call_count == 3
+    assert BaseDataLoader.load_all([]) == []
+    failed_job = MagicMock()
+    failed_job.result.side_effect = BadRequest("load failed")
+    bq_client.load_table_from_file.side_effect = [MagicMock(), failed_job, Forbidden("upload failed")]
+    with pytest.raises(DataLoadException) as exception_info:
+        BaseDataLoader.load_all(loaders)
+    assert "test_project.dataset_foo.table_1 : 400 load failed" in str(exception_info.value)
+    assert "test_project.dataset_foo.table_2 : 403 upload failed" in str(exception_info.value)
+    assert [run.succeeded for run in exception_info.value.runs] == [True, False, False]
+    bq_client.load_table_from_file.side_effect = TypeError("bug")
+    with pytest.raises(TypeError):
+        BaseDataLoader.load_all(loaders)
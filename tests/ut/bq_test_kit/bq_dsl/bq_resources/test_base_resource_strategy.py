@@ -3,6 +3,8 @@
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
+from unittest.mock import MagicMock
+
 import pytest
 
 from bq_test_kit.bq_dsl.bq_resources.resource_strategy import \
@@ -14,3 +16,25 @@ def test_exceptions():
         BaseResourceStrategy().before(None, None)
     with pytest.raises(NotImplementedError):
         BaseResourceStrategy().after(None)
+
+
+def test_manage_delegates_to_before_and_after():
+    calls = []
+
+    class _Recording(BaseResourceStrategy):
+        def before(self, delete, create):
+            calls.append(("before", delete, create))
+
+        def after(self, delete):
+            calls.append(("after", delete))
+
+    bq_resource = MagicMock()
+    bq_resource.fqdn.return_value = "test_project.dataset_foo"
+    strategy = _Recording()
+    strategy.manage_before(bq_resource)
+    strategy.manage_before(bq_resource, create=print)
+    strategy.manage_after(bq_resource)
+    assert calls == [("before", bq_resource.delete, bq_resource.create),
+                     ("before", bq_resource.delete, print),
+                     ("after", bq_resource.delete)]
+    assert not strategy.deletes_contents_of(bq_resource)
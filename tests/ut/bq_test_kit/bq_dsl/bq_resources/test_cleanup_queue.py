@@ -0,0 +1,76 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import threading
+from copy import deepcopy
+from unittest.mock import MagicMock
+
+from bq_test_kit.bq_dsl import Project
+from bq_test_kit.bq_dsl.bq_resources import CleanupQueue, DeferredCleanAfter
+from bq_test_kit.bq_test_kit_config import BQTestKitConfig
+from bq_test_kit.constants import DEFAULT_LOCATION
+
+
+def test_deferred_deletions_keep_order():
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    })
+    bq_client = MagicMock()
+    cleanup_queue = CleanupQueue()
+    deleted = []
+    bq_client.delete_table.side_effect = lambda table, **_: deleted.append(table.table_id)
+    bq_client.delete_dataset.side_effect = lambda dataset, **_: deleted.append(dataset.dataset_id)
+    ds = Project("test_project", bq_client=bq_client, bqtk_config=conf).dataset("dataset_foo")
+    ds = ds.with_resource_strategy(cleanup_queue.strategy())
+    assert isinstance(ds.resource_strategy, DeferredCleanAfter)
+    assert deepcopy(ds).resource_strategy.cleanup_queue is cleanup_queue
+    table = ds.table("table_foo").with_resource_strategy(cleanup_queue.strategy())
+    with table.dataset as dataset, dataset.table("table_foo") as _:
+        pass
+    report = cleanup_queue.drain()
+    assert report == (2, [], [])
+    assert deleted == ["table_foo", "dataset_foo"]
+
+
+def test_drain_reports_failed_and_left_deletions():
+    cleanup_queue = CleanupQueue(drain_timeout=0.05)
+    release = threading.Event()
+
+    def fail():
+        raise ValueError("boom")
+
+    cleanup_queue.submit("failing", fail)
+    cleanup_queue.submit("blocking", release.wait)
+    cleanup_queue.submit("pending", lambda: None)
+    report = cleanup_queue.drain()
+    assert report.failed == [("failing", "boom")]
+    assert report.left == ["blocking", "pending"]
+    release.set()
+    assert cleanup_queue.drain(timeout=5) == (2, [("failing", "boom")], [])
+
+
+def test_creation_waits_for_pending_deletion():
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    })
+    bq_client = MagicMock()
+    cleanup_queue = CleanupQueue()
+    release = threading.Event()
+    calls = []
+
+    def delete_dataset(dataset, **_):
+        release.wait(5)
+        calls.append(("delete", dataset.dataset_id))
+    bq_client.delete_dataset.side_effect = delete_dataset
+    bq_client.create_dataset.side_effect = lambda dataset, **_: calls.append(("create", dataset.dataset_id))
+    ds = Project("test_project", bq_client=bq_client, bqtk_config=conf).dataset("dataset_foo") \
+        .with_resource_strategy(cleanup_queue.strategy())
+    with ds:
+        pass
+    assert not cleanup_queue.wait_for(ds.fqdn(), timeout=0.01)
+    threading.Timer(0.05, release.set).start()
+    with ds:
+        assert calls == [("create", "dataset_foo"), ("delete", "dataset_foo"), ("create", "dataset_foo")]
+    assert cleanup_queue.drain(timeout=5) == (2, [], [])
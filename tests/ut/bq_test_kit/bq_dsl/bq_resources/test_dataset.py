@@ -3,9 +3,13 @@
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
+from copy import deepcopy
+from unittest.mock import MagicMock
+
 from bq_test_kit.bq_dsl import Dataset, Project
 from bq_test_kit.bq_dsl.bq_resources.resource_strategy import (
-    CleanAfter, CleanBeforeAndAfter, CleanBeforeAndKeepAfter, Noop)
+    CleanAfter, CleanAfterWithContents, CleanBeforeAndAfter,
+    CleanBeforeAndKeepAfter, Noop)
 from bq_test_kit.bq_dsl.bq_resources.table import Table
 from bq_test_kit.bq_test_kit_config import BQTestKitConfig
 from bq_test_kit.constants import DEFAULT_LOCATION
@@ -186,3 +190,72 @@ def test_change_location():
     assert ds.isolate_func(ds) == "dataset_foo"
     assert ds.create_options == {}
     assert ds.location == "US"
+
+
+def test_table_index():
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    })
+    ds = Project("test_project", bq_client=None, bqtk_config=conf).dataset("dataset_foo")
+    table = ds.table("table_0")
+    for i in range(1, 300):
+        table = table.table(f"table_{i}")
+    dataset = table.dataset
+    assert [t.name for t in dataset.tables] == [f"table_{i}" for i in range(300)]
+    assert all(t.dataset is dataset for t in dataset.tables)
+    assert dataset.table("table_42") is dataset.tables[42]
+    assert dataset.table("table_42").project is dataset.project
+    assert ds.tables == []
+    first_table_dataset = dataset.table("table_0").with_alias("foo").dataset
+    assert len(first_table_dataset.tables) == 300
+    assert first_table_dataset.table("table_0").alias == "foo"
+    assert dataset.table("table_0").alias is None
+    assert first_table_dataset.project.dataset("dataset_foo") is first_table_dataset
+
+
+def test_clean_with_contents():
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    }).with_test_context("context")
+    bq_client = MagicMock()
+    ds = Project("test_project", bq_client=bq_client, bqtk_config=conf).dataset("dataset_foo")
+    ds = ds.isolate().clean_with_contents()
+    assert isinstance(ds.resource_strategy, CleanAfterWithContents)
+    table = ds.table("table_foo")
+    with table.dataset as dataset, dataset.table("table_foo") as managed_table:
+        assert dataset.resource_strategy.deletes_contents_of(dataset)
+        assert managed_table.dataset.resource_strategy.deletes_contents_of(managed_table.dataset)
+    bq_client.delete_table.assert_not_called()
+    bq_client.delete_dataset.assert_called_once()
+    assert bq_client.delete_dataset.call_args[1]["delete_contents"] is True
+    assert not ds.resource_strategy.deletes_contents_of(ds)
+
+
+def test_clean_with_contents_of_not_isolated_dataset():
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    })
+    bq_client = MagicMock()
+    ds = Project("test_project", bq_client=bq_client, bqtk_config=conf).dataset("dataset_foo").clean_with_contents()
+    assert not ds.is_isolated()
+    with ds as dataset, dataset.table("table_foo"):
+        assert not dataset.resource_strategy.deletes_contents_of(dataset)
+    bq_client.delete_table.assert_called_once()
+    assert bq_client.delete_dataset.call_args[1]["delete_contents"] is False
+
+
+def test_deepcopy_of_registered_dataset():
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    })
+    table = Project("test_project", bq_client=None, bqtk_config=conf).dataset("dataset_foo").table("table_foo")
+    ds = table.dataset
+    ds_copy = deepcopy(ds)
+    assert ds_copy is not ds
+    assert ds_copy.fqdn() == ds.fqdn()
+    assert ds_copy.project.dataset("dataset_foo") is ds_copy
+    assert [t.name for t in ds_copy.tables] == ["table_foo"]
+    assert ds_copy.table("table_foo").dataset is ds_copy
+    table_copy = deepcopy(table)
+    assert table_copy.dataset.table("table_foo") is table_copy
+    assert table_copy.dataset.project.dataset("dataset_foo") is table_copy.dataset
@@ -0,0 +1,137 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import os
+import re
+from copy import deepcopy
+from unittest.mock import MagicMock
+
+import pytest
+from google.api_core.exceptions import NotFound
+
+from bq_test_kit.bq_dsl import Dataset, Project
+from bq_test_kit.bq_dsl.bq_resources import DatasetPool, PooledDataset
+from bq_test_kit.bq_test_kit_config import BQTestKitConfig
+from bq_test_kit.constants import DEFAULT_LOCATION
+from bq_test_kit.exceptions import DatasetPoolExhaustedException
+
+
+def _dataset(bq_client, name="dataset_foo"):
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    })
+    project = Project("test_project", bq_client=bq_client, bqtk_config=conf)
+    return Dataset(name, project=project, bq_client=bq_client, bqtk_config=conf)
+
+
+def test_lease_and_return(tmp_path):
+    bq_client = MagicMock()
+    bq_client.get_dataset.side_effect = NotFound("missing")
+    table = MagicMock(table_id="table_bar")
+    bq_client.list_tables.return_value = [table]
+    pool = DatasetPool(bq_client, max_size=2, host_id="h1", lease_directory=str(tmp_path))
+    ds = _dataset(bq_client).pooled(pool)
+    assert isinstance(ds.resource_strategy, PooledDataset)
+    assert deepcopy(ds).resource_strategy.pool is pool
+    assert ds.fqdn() == "test_project.dataset_foo_pool"
+    with ds as pooled_ds:
+        assert pooled_ds.fqdn() == "test_project.dataset_foo_pool_h1_0"
+        assert os.listdir(tmp_path) == ["test_project.dataset_foo_pool_h1_0.lease"]
+        assert pool.stats() == (1, 0, 1, 0, 1)
+    bq_client.create_dataset.assert_called_once()
+    assert bq_client.create_dataset.call_args[0][0].location == "EU"
+    bq_client.delete_table.assert_called_once_with(table, not_found_ok=True)
+    bq_client.delete_dataset.assert_not_called()
+    assert os.listdir(tmp_path) == []
+    assert pool.stats() == (1, 1, 1, 0, 0)
+    assert ds.fqdn() == "test_project.dataset_foo_pool"
+    with ds:
+        assert ds.fqdn() == "test_project.dataset_foo_pool_h1_0"
+    assert bq_client.create_dataset.call_count == 1
+    assert pool.stats() == (2, 2, 1, 0, 0)
+
+
+def test_pool_grows_up_to_max_size(tmp_path):
+    bq_client = MagicMock()
+    lease_directory = str(tmp_path)
+    other_worker = DatasetPool(bq_client, max_size=2, host_id="h1", lease_directory=lease_directory)
+    pool = DatasetPool(bq_client, max_size=2, host_id="h1", lease_directory=lease_directory,
+                       lease_timeout=0.05, poll_interval=0.01)
+    ds = _dataset(bq_client)
+    assert other_worker.lease(ds) == "dataset_foo_pool_h1_0"
+    assert other_worker.lease(ds) == "dataset_foo_pool_h1_0"
+    assert other_worker.name_of(ds) == "dataset_foo_pool_h1_0"
+    assert pool.lease(ds) == "dataset_foo_pool_h1_1"
+    assert pool.lease(_dataset(bq_client, "dataset_bar")) == "dataset_bar_pool_h1_0"
+    with pytest.raises(DatasetPoolExhaustedException):
+        DatasetPool(bq_client, max_size=2, host_id="h1", lease_directory=lease_directory,
+                    lease_timeout=0.05, poll_interval=0.01).lease(ds)
+    assert DatasetPool(bq_client, max_size=2, host_id="h2", lease_directory=lease_directory).lease(ds) == \
+        "dataset_foo_pool_h2_0"
+    other_worker.release_all()
+    assert other_worker.stats().in_use == 0
+    pool.release_all()
+    assert [name for name in os.listdir(tmp_path) if "_h1_" in name and name.endswith(".lease")] == []
+
+
+def test_default_host_id():
+    assert re.fullmatch(r"\w+", DatasetPool(MagicMock()).host_id)
+
+
+def test_stale_lease_is_taken_over(tmp_path, monkeypatch):
+    def dead_process(pid, signal):
+        raise ProcessLookupError(pid)
+    monkeypatch.setattr(os, "kill", dead_process)
+    (tmp_path / "test_project.dataset_foo_pool_h1_0.lease").write_text("123456")
+    pool = DatasetPool(MagicMock(), host_id="h1", lease_directory=str(tmp_path))
+    assert pool.lease(_dataset(MagicMock())) == "dataset_foo_pool_h1_0"
+    assert (tmp_path / "test_project.dataset_foo_pool_h1_0.lease").read_text() == str(os.getpid())
+    pool.release_all()
+
+
+def test_dirty_dataset_is_emptied_on_next_lease(tmp_path):
+    bq_client = MagicMock()
+    table = MagicMock(table_id="table_bar")
+    bq_client.list_tables.return_value = [table]
+    ds = _dataset(bq_client).pooled(DatasetPool(bq_client, host_id="h1", lease_directory=str(tmp_path)))
+    ds.__enter__()
+    ds.resource_strategy.pool.release_all()
+    bq_client.delete_table.assert_not_called()
+    assert os.listdir(tmp_path) == ["test_project.dataset_foo_pool_h1_0.lease.dirty"]
+    with ds.pooled(DatasetPool(bq_client, host_id="h1", lease_directory=str(tmp_path))) as pooled_ds:
+        assert pooled_ds.fqdn() == "test_project.dataset_foo_pool_h1_0"
+        bq_client.delete_table.assert_called_once_with(table, not_found_ok=True)
+        assert os.listdir(tmp_path) == ["test_project.dataset_foo_pool_h1_0.lease"]
+    assert bq_client.delete_table.call_count == 2
+    assert os.listdir(tmp_path) == []
+
+
+def test_stale_dataset_is_emptied_on_next_lease(tmp_path, monkeypatch):
+    def dead_process(pid, signal):
+        raise ProcessLookupError(pid)
+    monkeypatch.setattr(os, "kill", dead_process)
+    (tmp_path / "test_project.dataset_foo_pool_h1_0.lease").write_text("123456")
+    bq_client = MagicMock()
+    table = MagicMock(table_id="table_bar")
+    bq_client.list_tables.return_value = [table]
+    pool = DatasetPool(bq_client, host_id="h1", lease_directory=str(tmp_path))
+    with _dataset(bq_client).pooled(pool):
+        bq_client.delete_table.assert_called_once_with(table, not_found_ok=True)
+
+
+def test_threads_share_leases(tmp_path):
+    bq_client = MagicMock()
+    bq_client.list_tables.return_value = [MagicMock(table_id="table_bar")]
+    pool = DatasetPool(bq_client, host_id="h1", lease_directory=str(tmp_path))
+    ds = _dataset(bq_client).pooled(pool)
+    with ds as first_ds:
+        with ds as second_ds:
+            assert first_ds.fqdn() == second_ds.fqdn() == "test_project.dataset_foo_pool_h1_0"
+        bq_client.delete_table.assert_not_called()
+        assert pool.stats().in_use == 1
+        assert first_ds.fqdn() == "test_project.dataset_foo_pool_h1_0"
+    bq_client.delete_table.assert_called_once()
+    assert pool.stats() == (1, 1, 0, 0, 0)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,71 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+from datetime import timedelta
+
+from google.cloud.bigquery.schema import SchemaField
+
+from bq_test_kit.bq_dsl import Project
+from bq_test_kit.bq_dsl.bq_resources.clustering import Clustering
+from bq_test_kit.bq_dsl.bq_resources.partitions import (IngestionTime, Range,
+                                                        TimeField,
+                                                        TimePartitioningType)
+from bq_test_kit.bq_test_kit_config import BQTestKitConfig
+from bq_test_kit.constants import DEFAULT_LOCATION
+
+SCHEMA = [
+    SchemaField("f_int", "INT64", mode="REQUIRED", description='an "int"'),
+    SchemaField("f_date", "DATE"),
+    SchemaField("f_timestamp", "TIMESTAMP"),
+    SchemaField("f_record", "RECORD", mode="REPEATED", fields=[SchemaField("f_string", "STRING")])
+]
+
+
+def _table():
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    })
+    return Project("test_project", bq_client=None, bqtk_config=conf) \
+        .dataset("dataset_foo").table("table_bar", schema=SCHEMA)
+
+
+def test_ddl():
+    assert _table().ddl() == ("CREATE TABLE `test_project.dataset_foo.table_bar` (\n"
+                              '  `f_int` INT64 NOT NULL OPTIONS(description="an \\"int\\""),\n'
+                              "  `f_date` DATE,\n"
+                              "  `f_timestamp` TIMESTAMP,\n"
+                              "  `f_record` ARRAY<STRUCT<`f_string` STRING>>\n"
+                              ")")
+
+
+def test_ddl_with_nested_fields():
+    table = _table().with_schema(from_=[
+        SchemaField("f_struct", "RECORD", mode="REQUIRED", fields=[
+            SchemaField("select", "INT64", mode="REQUIRED", description="reserved"),
+            SchemaField("f_repeated", "STRING", mode="REPEATED"),
+            SchemaField("f_nested", "STRUCT", fields=[SchemaField("from", "DATE", mode="REQUIRED")])
+        ])
+    ])
+    assert table.ddl() == ("CREATE TABLE `test_project.dataset_foo.table_bar` (\n"
+                           "  `f_struct` STRUCT<`select` INT64 NOT NULL OPTIONS(description=\"reserved\"), "
+                           "`f_repeated` ARRAY<STRING>, `f_nested` STRUCT<`from` DATE NOT NULL>> NOT NULL\n"
+                           ")")
+
+
+def test_ddl_with_partition_and_options():
+    table = _table().with_create_options(exists_ok=True).cluster_by(Clustering("f_int", "f_date"))
+    ddl = table.partition_by(TimeField("f_date")).ddl()
+    assert ddl.startswith("CREATE TABLE IF NOT EXISTS `test_project.dataset_foo.table_bar` (")
+    assert ddl.endswith("\nPARTITION BY `f_date`\nCLUSTER BY `f_int`, `f_date`")
+    ddl = table.partition_by(TimeField("f_date", type_=TimePartitioningType.MONTH)).ddl()
+    assert "\nPARTITION BY DATE_TRUNC(`f_date`, MONTH)\n" in ddl
+    ddl = table.partition_by(TimeField("f_timestamp", type_=TimePartitioningType.HOUR)).ddl()
+    assert "\nPARTITION BY TIMESTAMP_TRUNC(`f_timestamp`, HOUR)\n" in ddl
+    assert "\nPARTITION BY _PARTITIONDATE\n" in table.partition_by(IngestionTime()).ddl()
+    ddl = table.partition_by(IngestionTime(type_=TimePartitioningType.HOUR)).ddl()
+    assert "\nPARTITION BY TIMESTAMP_TRUNC(_PARTITIONTIME, HOUR)\n" in ddl
+    ddl = table.partition_by(Range(on_field="f_int", start=0, end=100, interval=10)).ddl()
+    assert "\nPARTITION BY RANGE_BUCKET(`f_int`, GENERATE_ARRAY(0, 100, 10))\n" in ddl
+    assert '\nOPTIONS(expiration_timestamp=TIMESTAMP "' in _table().expire_after(timedelta(hours=1)).ddl()
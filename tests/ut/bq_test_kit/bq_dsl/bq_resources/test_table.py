@@ -3,20 +3,25 @@
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
+from datetime import datetime, timedelta, timezone
 from json.decoder import JSONDecodeError
+from unittest.mock import MagicMock
 
 import pytest
+from google.api_core.exceptions import NotFound
 from google.cloud.bigquery.schema import SchemaField
 
 from bq_test_kit.bq_dsl import Dataset, Project, Table
-from bq_test_kit.bq_dsl.bq_resources.data_loaders import (DsvDataLoader,
+from bq_test_kit.bq_dsl.bq_resources.data_loaders import (BaseDataLoader,
+                                                          DsvDataLoader,
                                                           JsonDataLoader)
 from bq_test_kit.bq_dsl.bq_resources.partitions import (BasePartition,
                                                         IngestionTime,
                                                         NoPartition, Range,
                                                         TimeField)
 from bq_test_kit.bq_dsl.bq_resources.resource_strategy import (
-    CleanAfter, CleanBeforeAndAfter, CleanBeforeAndKeepAfter, Noop)
+    CleanAfter, CleanBeforeAndAfter, CleanBeforeAndKeepAfter, ExpireAfter,
+    Noop)
 from bq_test_kit.bq_test_kit_config import BQTestKitConfig
 from bq_test_kit.constants import DEFAULT_LOCATION
 from bq_test_kit.exceptions import InvalidInstanceException
@@ -103,6 +108,41 @@ def test_change_clean_always():
     assert isinstance(table.resource_strategy, CleanBeforeAndAfter)
 
 
+def test_change_expire_after():
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    })
+    bq_client = MagicMock()
+    project = Project("test_project", bq_client=bq_client, bqtk_config=conf)
+    table = project.dataset("dataset_foo").table("table_bar").partition_by(IngestionTime())
+    table = table.expire_after(timedelta(hours=2))
+    assert isinstance(table.resource_strategy, ExpireAfter)
+    assert table.resource_strategy.ttl == timedelta(hours=2)
+    before_creation = datetime.now(timezone.utc) - timedelta(milliseconds=1)
+    with table:
+        pass
+    bqtable = bq_client.create_table.call_args[0][0]
+    assert before_creation + timedelta(hours=2) <= bqtable.expires <= datetime.now(timezone.utc) + timedelta(hours=2)
+    assert bqtable.time_partitioning is not None
+    bq_client.delete_table.assert_not_called()
+
+
+def test_dataset_expire_after():
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    }).with_test_context("context")
+    bq_client = MagicMock()
+    dataset = Project("test_project", bq_client=bq_client, bqtk_config=conf).dataset("dataset_foo")
+    dataset = dataset.isolate().expire_after()
+    assert dataset.resource_strategy.expiration == timedelta(hours=1)
+    with dataset as entered_dataset, entered_dataset.table("table_bar").expire_after():
+        pass
+    assert bq_client.create_dataset.call_args[0][0].default_table_expiration_ms == 3600000
+    bq_client.list_tables.assert_not_called()
+    bq_client.delete_table.assert_not_called()
+    bq_client.delete_dataset.assert_not_called()
+
+
 def test_change_isolate():
     conf = BQTestKitConfig({
         DEFAULT_LOCATION: "EU"
@@ -289,3 +329,68 @@ def test_table_dsl():
     dataset_bar = project.dataset("dataset_bar")
     assert [table.name for table in dataset_bar.tables] == ["table_zoo"]
     assert isinstance(dataset_bar.table("table_zoo").partition_type, IngestionTime)
+
+
+def test_fluent_methods_share_attributes():
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    })
+    schema = [SchemaField("f1", field_type="INT64")]
+    table = Project("test_project", bq_client=None, bqtk_config=conf) \
+        .dataset("dataset_foo") \
+        .table("table_foo", schema=schema) \
+        .table("table_bar")
+    aliased_table = table.with_alias("bar")
+    assert table.alias is None
+    assert aliased_table.alias == "bar"
+    assert aliased_table.dataset is not table.dataset
+    assert aliased_table.project is not table.project
+    assert aliased_table.dataset.tables[1] is aliased_table
+    assert table.dataset.tables[1] is table
+    assert aliased_table.dataset.tables[0].dataset is aliased_table.dataset
+    assert aliased_table.dataset.tables[0].schema is table.dataset.tables[0].schema
+    assert aliased_table.dataset.tables[0].schema == schema
+    assert aliased_table.bqtk_config is table.bqtk_config
+
+
+def test_clean_and_keep_loaded(tmp_path):
+    data_file = tmp_path / "data.json"
+    data_file.write_text('{"f1": 1}')
+    resource = MagicMock()
+    resource.absolute_path.return_value = str(data_file)
+    existing_labels = {}
+
+    def _get_table(fqdn):
+        table_id = fqdn.split(".")[-1]
+        if table_id not in existing_labels:
+            raise NotFound(fqdn)
+        return MagicMock(labels=existing_labels[table_id])
+    bq_client = MagicMock()
+    bq_client.get_table.side_effect = _get_table
+    bq_client.create_table.side_effect = lambda bqtable: existing_labels.update({bqtable.table_id: {}})
+    bq_client.delete_table.side_effect = lambda bqtable, not_found_ok: existing_labels.pop(bqtable.table_id, None)
+    bq_client.update_table.side_effect = lambda bqtable, fields: existing_labels[bqtable.table_id].update(
+        bqtable.labels)
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    })
+    table = Project("test_project", bq_client=bq_client, bqtk_config=conf) \
+        .dataset("dataset_foo") \
+        .table("table_foo", schema=[SchemaField("f1", field_type="INT64")]) \
+        .clean_and_keep(keep_loaded=True)
+    assert isinstance(table.resource_strategy, CleanBeforeAndKeepAfter)
+    assert not table.clean_and_keep().resource_strategy.keep_loaded
+    BaseDataLoader.reset_load_stats()
+    for _ in range(2):
+        with table as entered_table:
+            entered_table.json_loader(from_=resource).overwrite().skip_if_unchanged().load()
+    assert bq_client.create_table.call_count == 1
+    assert BaseDataLoader.load_stats() == (1, 1)
+    with table.with_schema(from_=[SchemaField("f2", field_type="STRING")]) as entered_table:
+        entered_table.json_loader(from_=resource).overwrite().skip_if_unchanged().load()
+    assert bq_client.create_table.call_count == 2
+    assert BaseDataLoader.load_stats() == (2, 1)
+    with table.clean_and_keep() as entered_table:
+        entered_table.json_loader(from_=resource).overwrite().skip_if_unchanged().load()
+    assert bq_client.create_table.call_count == 3
+    assert BaseDataLoader.load_stats() == (3, 1)
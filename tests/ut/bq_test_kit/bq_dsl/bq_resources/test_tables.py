@@ -3,9 +3,16 @@
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
+import threading
+from unittest.mock import MagicMock
+
 import pytest
+from google.api_core.exceptions import BadRequest
+from google.cloud.bigquery.schema import SchemaField
 
+from bq_test_kit.bq_dsl.bq_resources.dataset import Dataset
 from bq_test_kit.bq_dsl.bq_resources.project import Project
+from bq_test_kit.bq_dsl.bq_resources.table import Table
 from bq_test_kit.bq_dsl.bq_resources.tables import Tables
 from bq_test_kit.bq_test_kit_config import BQTestKitConfig
 from bq_test_kit.constants import DEFAULT_LOCATION
@@ -77,3 +84,136 @@ def test_resources_flattening():
 def test_invalid_resource():
     with pytest.raises(InvalidInstanceException):
         Tables.from_(1)._flatten_bq_resources()
+
+
+class _Recorder():
+
+    def __init__(self, fail_on: str = None, error: type = BadRequest) -> None:
+        self.calls = []
+        self.fail_on = fail_on
+        self.error = error
+        self.lock = threading.Lock()
+
+    def call(self, action: str, bq_resource):
+        with self.lock:
+            self.calls.append((action, bq_resource.name))
+        if bq_resource.name == self.fail_on and action == "create":
+            raise self.error(f"{bq_resource.name} failed")
+
+
+def _recorded_project(recorder: _Recorder, monkeypatch) -> Project:
+    for method in ["create", "delete"]:
+        for resource_type in [Dataset, Table]:
+            monkeypatch.setattr(resource_type, method, lambda bqr, method=method: recorder.call(method, bqr))
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    })
+    return Project("test_project", bq_client=None, bqtk_config=conf) \
+        .dataset("dataset_foo") \
+        .table("table_foofoo") \
+        .table("table_foobar") \
+        .project.dataset("dataset_bar") \
+        .table("table_barfoo") \
+        .project
+
+
+def test_parallel_provisioning(monkeypatch):
+    recorder = _Recorder()
+    project = _recorded_project(recorder, monkeypatch)
+    tables = Tables.from_(project).parallel(max_workers=4)
+    assert tables.max_workers == 4
+    with tables as (table_foofoo, table_foobar, table_barfoo):
+        assert [table_foofoo.name, table_foobar.name, table_barfoo.name] == ["table_foofoo",
+                                                                             "table_foobar",
+                                                                             "table_barfoo"]
+        assert {action for action, _ in recorder.calls[:2]} == {"create"}
+        assert {name for _, name in recorder.calls[:2]} == {"dataset_foo", "dataset_bar"}
+        assert {name for _, name in recorder.calls[2:]} == {"table_foofoo", "table_foobar", "table_barfoo"}
+        recorder.calls.clear()
+    assert {action for action, _ in recorder.calls} == {"delete"}
+    assert {name for _, name in recorder.calls[:3]} == {"table_foofoo", "table_foobar", "table_barfoo"}
+    assert {name for _, name in recorder.calls[3:]} == {"dataset_foo", "dataset_bar"}
+
+
+def test_parallel_provisioning_failure(monkeypatch):
+    recorder = _Recorder(fail_on="table_foobar")
+    project = _recorded_project(recorder, monkeypatch)
+    with pytest.raises(BadRequest, match="table_foobar failed"):
+        with Tables.from_(project).parallel(max_workers=4):
+            pass
+    deleted = [name for action, name in recorder.calls if action == "delete"]
+    assert sorted(deleted[:2]) == ["table_barfoo", "table_foofoo"]
+    assert sorted(deleted[2:]) == ["dataset_bar", "dataset_foo"]
+
+
+def test_parallel_provisioning_unexpected_failure(monkeypatch):
+    recorder = _Recorder(fail_on="table_foobar", error=ValueError)
+    project = _recorded_project(recorder, monkeypatch)
+    with pytest.raises(ValueError, match="table_foobar failed"):
+        with Tables.from_(project).parallel(max_workers=4):
+            pass
+    deleted = [name for action, name in recorder.calls if action == "delete"]
+    assert sorted(deleted[:2]) == ["table_barfoo", "table_foofoo"]
+    assert sorted(deleted[2:]) == ["dataset_bar", "dataset_foo"]
+
+
+def test_batch_provisioning():
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    })
+    bq_client = MagicMock()
+    schema = [SchemaField("f_int", "INT64")]
+    project = Project("test_project", bq_client=bq_client, bqtk_config=conf) \
+        .dataset("dataset_foo") \
+        .table("table_foofoo", schema=schema) \
+        .table("table_foobar", schema=schema).expire_after() \
+        .table("table_without_schema") \
+        .project
+    tables = Tables.from_(project).in_batch()
+    assert tables.batch and tables.parallel().batch
+    with tables as (table_foofoo, table_foobar, _):
+        bq_client.create_dataset.assert_called_once()
+        bq_client.query.assert_called_once()
+        script = bq_client.query.call_args[0][0]
+        assert script.startswith("CREATE TABLE `test_project.dataset_foo.table_foofoo` (")
+        assert ";\nCREATE TABLE `test_project.dataset_foo.table_foobar` (" in script
+        assert "OPTIONS(expiration_timestamp=" in script
+        assert bq_client.query.call_args[1]["location"] == "EU"
+        assert [c[0][0].table_id for c in bq_client.create_table.call_args_list] == ["table_without_schema"]
+    deleted = [c[0][0].table_id for c in bq_client.delete_table.call_args_list]
+    assert sorted(deleted) == ["table_foofoo", "table_without_schema"]
+    bq_client.delete_dataset.assert_called_once()
+
+
+def test_batch_provisioning_failure():
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    })
+    bq_client = MagicMock()
+    bq_client.query.side_effect = BadRequest("script failed")
+    project = Project("test_project", bq_client=bq_client, bqtk_config=conf) \
+        .dataset("dataset_foo") \
+        .table("table_foofoo", schema=[SchemaField("f_int", "INT64")]) \
+        .project
+    with pytest.raises(BadRequest, match="script failed"):
+        with Tables.from_(project).in_batch():
+            pass
+    bq_client.delete_table.assert_called_once()
+    bq_client.delete_dataset.assert_called_once()
+
+
+def test_batch_provisioning_unexpected_failure():
+    conf = BQTestKitConfig({
+        DEFAULT_LOCATION: "EU"
+    })
+    bq_client = MagicMock()
+    bq_client.query.side_effect = KeyboardInterrupt()
+    project = Project("test_project", bq_client=bq_client, bqtk_config=conf) \
+        .dataset("dataset_foo") \
+        .table("table_foofoo", schema=[SchemaField("f_int", "INT64")]) \
+        .project
+    with pytest.raises(KeyboardInterrupt):
+        with Tables.from_(project).in_batch():
+            pass
+    bq_client.delete_table.assert_called_once()
+    bq_client.delete_dataset.assert_called_once()
@@ -0,0 +1,79 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+from unittest.mock import MagicMock
+
+import pytest
+from google.cloud.bigquery.schema import SchemaField
+from google.cloud.bigquery.table import Row
+
+from bq_test_kit.bq_dsl import BQQueryTemplate
+from bq_test_kit.bq_dsl.bq_query_results import BQQueryResult
+from bq_test_kit.bq_test_kit_config import BQTestKitConfig
+from bq_test_kit.constants import DEFAULT_LOCATION
+
+
+class PagedRowIterator():
+
+    def __init__(self, nb_rows, total_rows=None):
+        self.schema = [SchemaField("f_int", "INTEGER"), SchemaField("f_bytes", "BYTES")]
+        self.total_rows = total_rows
+        self.nb_rows = nb_rows
+        self.pulled = 0
+        self.iterations = 0
+
+    def __iter__(self):
+        self.iterations += 1
+        for index in range(self.nb_rows):
+            self.pulled += 1
+            self.total_rows = self.nb_rows
+            yield Row((index, b"\x01"), {"f_int": 0, "f_bytes": 1})
+
+
+def test_lazy_result():
+    row_iterator = PagedRowIterator(1000)
+    result = BQQueryResult(row_iterator, lazy=True)
+    assert row_iterator.pulled == 0
+    assert result.count() == 1000
+    assert row_iterator.pulled == 1
+    assert result.head(2) == [{"f_int": 0, "f_bytes": "AQ=="}, {"f_int": 1, "f_bytes": "AQ=="}]
+    assert result.rows_bq.head(1)[0]["f_bytes"] == b"\x01"
+    assert row_iterator.pulled == 2
+    assert [row["f_int"] for row in result.rows] == list(range(1000))
+    assert row_iterator.iterations == 1
+    with pytest.raises(ValueError):
+        list(result.rows)
+    with pytest.raises(ValueError):
+        result.head(3)
+
+
+def test_eager_result():
+    row_iterator = PagedRowIterator(3, total_rows=3)
+    result = BQQueryResult(row_iterator)
+    assert row_iterator.pulled == 3
+    assert result.head(1) == [{"f_int": 0, "f_bytes": "AQ=="}]
+    assert result.count() == 3
+    assert result.rows == result.rows
+    assert len(result.rows_bq) == 3
+
+
+def test_count_with_destination():
+    # rows written to a destination table are not fetched, see BQQueryTemplate.with_destination.
+    row_iterator = PagedRowIterator(0, total_rows=42)
+    assert BQQueryResult(row_iterator).count() == 42
+    assert BQQueryResult(row_iterator, lazy=True).count() == 42
+
+
+def test_query_template_lazy_result():
+    bq_client = MagicMock()
+    bq_client.query.return_value.result.return_value = PagedRowIterator(10, total_rows=10)
+    bq_tpl = BQQueryTemplate(from_="select 1", bqtk_config=BQTestKitConfig({DEFAULT_LOCATION: "EU"}),
+                             bq_client=bq_client)
+    lazy_tpl = bq_tpl.with_lazy_result(page_size=5)
+    assert bq_tpl.lazy_result is False
+    result = lazy_tpl.run()
+    assert result.lazy
+    assert result.count() == 10
+    bq_client.query.return_value.result.assert_called_once_with(max_results=None, page_size=5)
@@ -3,16 +3,23 @@
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
+import asyncio
 from typing import Any, Dict
+from unittest.mock import MagicMock
 
-from google.cloud.bigquery.job import WriteDisposition
+import pytest
+from google.cloud.bigquery import ConnectionProperty
+from google.cloud.bigquery.job import QueryJobConfig, WriteDisposition
 from google.cloud.bigquery.query import ScalarQueryParameter, UDFResource
+from google.cloud.bigquery.schema import SchemaField
+from google.cloud.bigquery.table import TableReference
 
 from bq_test_kit.bq_dsl import BQQueryTemplate, Dataset, Project, Table
 from bq_test_kit.bq_test_kit_config import BQTestKitConfig
 from bq_test_kit.constants import DEFAULT_LOCATION
 from bq_test_kit.data_literal_transformers.json_data_literal_transformer import \
     JsonDataLiteralTransformer
+from bq_test_kit.exceptions import BytesBudgetExceededException
 from bq_test_kit.interpolators.base_interpolator import BaseInterpolator
 from bq_test_kit.resource_loaders import PackageFileLoader
 
@@ -170,3 +177,196 @@ def test_temp_tables():
     })
     bq_tpl = bq_tpl.with_temp_tables(temp_table_input)
     assert bq_tpl.temp_tables == [temp_table_input]
+
+
+def test_temp_tables_max_literal_size():
+    conf = BQTestKitConfig({DEFAULT_LOCATION: "EU"})
+    bq_tpl = BQQueryTemplate(from_="select * from t1", bqtk_config=conf, bq_client=None)
+    assert bq_tpl.max_literal_size is None
+    bq_tpl = bq_tpl.with_temp_tables((JsonDataLiteralTransformer(), {
+        "t1": (['{"f_int": 1}', '{"f_int": 2}'], [SchemaField("f_int", "INT64")])
+    })).with_temp_tables_dropped()
+    _, setup_statements, create_statements, drop_statements, nb_statements = bq_tpl._generate_temp_tables()
+    assert setup_statements == []
+    assert create_statements == ("CREATE TEMP TABLE t1 as (select cast(1 as INT64) as f_int\n"
+                                 "union all\n"
+                                 "select cast(2 as INT64) as f_int);\n")
+    chunked_tpl = bq_tpl.with_max_literal_size(1)
+    assert chunked_tpl.max_literal_size == 1
+    assert bq_tpl.max_literal_size is None
+    (temp_table_queries, chunked_setup_statements, chunked_create_statements,
+     chunked_drop_statements, chunked_nb_statements) = chunked_tpl._generate_temp_tables()
+    assert chunked_setup_statements == ["CREATE TEMP TABLE t1 as (select cast(1 as INT64) as f_int);",
+                                        "INSERT INTO t1 select cast(2 as INT64) as f_int;"]
+    assert chunked_create_statements == ""
+    assert chunked_drop_statements == drop_statements == "\nDROP TABLE t1;"
+    assert chunked_nb_statements == nb_statements == 1
+    assert temp_table_queries == {"t1": "(select f_int as f_int from t1)"}
+
+
+def test_run_split_temp_tables_in_session():
+    conf = BQTestKitConfig({DEFAULT_LOCATION: "EU"})
+    bq_client = _mock_client()
+    bq_client.query.return_value.session_info.session_id = "session_1"
+    job_config = QueryJobConfig(maximum_bytes_billed=1000, labels={"team": "qa"}, priority="BATCH",
+                                destination="test_project.dataset_foo.table_bar")
+    bq_tpl = BQQueryTemplate(from_="select * from t1", bqtk_config=conf, bq_client=bq_client, job_config=job_config)
+    bq_tpl = bq_tpl.with_temp_tables((JsonDataLiteralTransformer(), {
+        "t1": (['{"f_int": 1}', '{"f_int": 2}'], [SchemaField("f_int", "INT64")])
+    })).with_max_literal_size(1)
+    result = bq_tpl.run()
+    assert result.rows == [{"f_int": 1}]
+    queries = [call.args[0] for call in bq_client.query.call_args_list]
+    assert queries == ["CREATE TEMP TABLE t1 as (select cast(1 as INT64) as f_int);",
+                       "INSERT INTO t1 select cast(2 as INT64) as f_int;",
+                       "select * from t1;",
+                       "CALL BQ.ABORT_SESSION();"]
+    job_configs = [call.kwargs["job_config"] for call in bq_client.query.call_args_list]
+    assert job_configs[0].create_session
+    assert [(prop.key, prop.value) for prop in job_configs[1].connection_properties] == [("session_id", "session_1")]
+    for setup_job_config in job_configs[:2]:
+        assert setup_job_config.maximum_bytes_billed == 1000
+        assert setup_job_config.labels == {"team": "qa"}
+        assert setup_job_config.priority == "BATCH"
+        assert setup_job_config.destination is None
+        assert not setup_job_config.use_legacy_sql
+    assert not job_configs[1].create_session
+    assert not job_configs[2].create_session
+    assert job_configs[2].destination.table_id == "table_bar"
+    assert [(prop.key, prop.value) for prop in job_configs[2].connection_properties] == [("session_id", "session_1")]
+    assert [(prop.key, prop.value) for prop in job_configs[3].connection_properties] == [("session_id", "session_1")]
+    assert bq_tpl.job_config.connection_properties == []
+    bq_client.query.reset_mock()
+    bq_tpl.job_config.connection_properties = [ConnectionProperty("session_id", "session_2")]
+    bq_tpl.run()
+    queries = [call.args[0] for call in bq_client.query.call_args_list]
+    assert "CALL BQ.ABORT_SESSION();" not in queries
+    assert queries[0] == "CREATE OR REPLACE TEMP TABLE t1 as (select cast(1 as INT64) as f_int);"
+    bq_client.query.reset_mock()
+    bq_tpl.job_config.connection_properties = []
+    bq_tpl.job_config.dry_run = True
+    bq_tpl.run()
+    assert [call.args[0] for call in bq_client.query.call_args_list] == [
+        "CREATE TEMP TABLE t1 as (select cast(1 as INT64) as f_int);\n"
+        "INSERT INTO t1 select cast(2 as INT64) as f_int;\n"
+        "select * from t1;"
+    ]
+    assert not bq_client.query.call_args.kwargs["job_config"].create_session
+
+
+def _mock_client(nb_pending_polls: int = 0):
+    bq_client = MagicMock()
+    query_job = bq_client.query.return_value
+    query_job.job_id = "BQTK_job"
+    query_job.done.side_effect = [False] * nb_pending_polls + [True]
+    query_job.result.return_value = [{"f_int": 1}]
+    return bq_client
+
+
+def test_arun():
+    conf = BQTestKitConfig({DEFAULT_LOCATION: "EU"})
+    bq_client = _mock_client(nb_pending_polls=2)
+    bq_tpl = BQQueryTemplate(from_="select 1 as f_int", bqtk_config=conf, bq_client=bq_client)
+    loop = asyncio.new_event_loop()
+    try:
+        result = loop.run_until_complete(bq_tpl.arun(initial_delay=0.001, max_delay=0.002))
+    finally:
+        loop.close()
+    assert result.rows == [{"f_int": 1}]
+    assert bq_client.query.call_count == 1
+    assert bq_client.query.call_args[0][0] == "select 1 as f_int"
+    assert bq_client.query.return_value.done.call_count == 3
+    bq_client.list_jobs.assert_not_called()
+
+
+def test_arun_all():
+    conf = BQTestKitConfig({DEFAULT_LOCATION: "EU"})
+    succeeding_tpl = BQQueryTemplate(from_="select 1 as f_int", bqtk_config=conf, bq_client=_mock_client())
+    failing_client = _mock_client()
+    failing_client.query.side_effect = ValueError("invalid query")
+    failing_tpl = BQQueryTemplate(from_="select", bqtk_config=conf, bq_client=failing_client)
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(BQQueryTemplate.arun_all([failing_tpl, succeeding_tpl],
+                                                                   return_exceptions=True, max_concurrency=1))
+        with pytest.raises(ValueError):
+            loop.run_until_complete(BQQueryTemplate.arun_all([failing_tpl]))
+    finally:
+        loop.close()
+    assert isinstance(results[0], ValueError)
+    assert results[1].rows == [{"f_int": 1}]
+
+
+def test_run_result_of_last_user_statement():
+    conf = BQTestKitConfig({DEFAULT_LOCATION: "EU"})
+    bq_client = _mock_client()
+    bq_tpl = BQQueryTemplate(from_="select * from t1", bqtk_config=conf, bq_client=bq_client)
+    bq_tpl = bq_tpl.with_temp_tables((JsonDataLiteralTransformer(), {
+        "t1": (['{"f_int": 1}'], [SchemaField("f_int", "INT64")])
+    }))
+    assert bq_tpl.drop_temp_tables is False
+    assert bq_tpl.run().rows == [{"f_int": 1}]
+    assert bq_client.query.call_args[0][0] == ("CREATE TEMP TABLE t1 as (select cast(1 as INT64) as f_int);\n"
+                                               "select * from t1;")
+    bq_client.list_jobs.assert_not_called()
+
+    dropped_tpl = bq_tpl.with_temp_tables_dropped()
+    assert dropped_tpl.drop_temp_tables is True
+    assert bq_tpl.drop_temp_tables is False
+    child_jobs = [MagicMock(job_id=f"script_job_{step}") for step in [2, 0, 1]]
+    for child_job in child_jobs:
+        child_job.result.return_value = [{"job_id": child_job.job_id}]
+    bq_client.list_jobs.return_value = child_jobs
+    assert dropped_tpl.run().rows == [{"job_id": "script_job_1"}]
+    assert bq_client.query.call_args[0][0] == ("CREATE TEMP TABLE t1 as (select cast(1 as INT64) as f_int);\n"
+                                               "select * from t1;\n"
+                                               "DROP TABLE t1;")
+    bq_client.list_jobs.assert_called_once_with(parent_job="BQTK_job")
+
+
+def test_fluent_methods_share_temp_tables():
+    conf = BQTestKitConfig({DEFAULT_LOCATION: "EU"})
+    datum = ['{"f_int": 1}']
+    schema = [SchemaField("f_int", "INT64")]
+    bq_tpl = BQQueryTemplate(from_="select * from t1", bqtk_config=conf, bq_client=None)
+    bq_tpl = bq_tpl.with_temp_tables((JsonDataLiteralTransformer(), {"t1": (datum, schema)}))
+    chained_tpl = bq_tpl.add_interpolator(DummyInterpolator()) \
+                        .update_global_dict({"foo": "bar"}) \
+                        .with_query_parameters([ScalarQueryParameter("p1", "INT64", 1)]) \
+                        .with_temp_tables((JsonDataLiteralTransformer(), {"t2": (datum, schema)}))
+    assert chained_tpl.temp_tables[0][1]["t1"][0] is datum
+    assert chained_tpl.temp_tables[0] is bq_tpl.temp_tables[0]
+    assert chained_tpl.temp_tables[1][1]["t2"][0] is datum
+    assert len(chained_tpl.temp_tables) == 2
+    assert len(chained_tpl.interpolators) == 1
+    assert chained_tpl.global_dict == {"foo": "bar"}
+    assert len(chained_tpl.job_config.query_parameters) == 1
+    assert len(bq_tpl.temp_tables) == 1
+    assert bq_tpl.interpolators == []
+    assert bq_tpl.global_dict == {}
+    assert bq_tpl.job_config.query_parameters == []
+
+
+def test_dry_run():
+    conf = BQTestKitConfig({DEFAULT_LOCATION: "EU"})
+    bq_client = MagicMock()
+    query_job = bq_client.query.return_value
+    query_job.total_bytes_processed = 1024
+    query_job.referenced_tables = [TableReference.from_string("p1.d1.t2")]
+    query_job.schema = [SchemaField("f_int", "INTEGER")]
+    bq_tpl = BQQueryTemplate(from_="select * from t1 join `p1.d1.t2` using (f_int)", bqtk_config=conf,
+                             bq_client=bq_client)
+    bq_tpl = bq_tpl.with_temp_tables((JsonDataLiteralTransformer(), {
+        "t1": (['{"f_int": 1}'], [SchemaField("f_int", "INT64")])
+    }))
+    estimate = bq_tpl.dry_run(max_bytes=1024)
+    assert estimate.total_bytes_processed == 1024
+    assert estimate.referenced_tables == ["p1.d1.t2"]
+    assert estimate.schema == [SchemaField("f_int", "INTEGER")]
+    assert bq_client.query.call_args[0][0].startswith("CREATE TEMP TABLE t1 as")
+    job_config = bq_client.query.call_args[1]["job_config"]
+    assert job_config.dry_run is True
+    assert job_config.use_query_cache is False
+    assert not bq_tpl.job_config.dry_run
+    with pytest.raises(BytesBudgetExceededException):
+        bq_tpl.dry_run(max_bytes=1023)
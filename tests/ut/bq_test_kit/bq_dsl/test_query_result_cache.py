@@ -0,0 +1,74 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+from unittest.mock import MagicMock
+
+from google.cloud.bigquery.job import QueryJobConfig
+from google.cloud.bigquery.query import ScalarQueryParameter
+
+from bq_test_kit.backends import SQLiteClient
+from bq_test_kit.bq_dsl import BQQueryTemplate, QueryResultCache
+from bq_test_kit.bq_test_kit_config import BQTestKitConfig
+from bq_test_kit.constants import DEFAULT_LOCATION
+
+
+def _query_template(bq_client, query, result_cache, job_config=None):
+    return BQQueryTemplate(from_=query, bqtk_config=BQTestKitConfig({DEFAULT_LOCATION: "EU"}),
+                           bq_client=bq_client, job_config=job_config).with_result_cache(result_cache)
+
+
+def test_result_cache(tmp_path):
+    bq_client = MagicMock(wraps=SQLiteClient())
+    result_cache = QueryResultCache(max_entries=1, directory=str(tmp_path))
+    query_template = _query_template(bq_client, "select @f_int as f_int, from_base64('AQ==') as f_bytes", result_cache)
+    param_1 = query_template.with_query_parameters([ScalarQueryParameter("f_int", "INT64", 1)])
+    param_2 = query_template.with_query_parameters([ScalarQueryParameter("f_int", "INT64", 2)])
+    assert param_1.run().rows == [{"f_int": 1, "f_bytes": "AQ=="}]
+    assert param_1.run().rows == [{"f_int": 1, "f_bytes": "AQ=="}]
+    assert param_2.run().rows == [{"f_int": 2, "f_bytes": "AQ=="}]
+    assert bq_client.query.call_count == 2
+    assert result_cache.stats() == (1, 0, 2)
+    # param_1 result has been evicted from memory by the one of param_2.
+    assert param_1.run().rows == [{"f_int": 1, "f_bytes": "AQ=="}]
+    assert result_cache.stats() == (1, 1, 2)
+
+    other_run_cache = QueryResultCache(directory=str(tmp_path))
+    result = param_2.with_result_cache(other_run_cache).run()
+    assert result.rows == [{"f_int": 2, "f_bytes": "AQ=="}]
+    assert [field.field_type for field in result.schema] == ["INTEGER", "BYTES"]
+    assert bq_client.query.call_count == 2
+    other_run_cache.clear()
+    param_2.with_result_cache(other_run_cache).run()
+    assert bq_client.query.call_count == 3
+
+
+def test_result_cache_bypass():
+    bq_client = MagicMock(wraps=SQLiteClient())
+    result_cache = QueryResultCache()
+    bq_client.create_dataset("test_project.dataset_foo")
+    for query in ["select generate_uuid() as id",
+                  "create or replace table `test_project.dataset_foo.table_foo` as select 1 as f_int"]:
+        query_template = _query_template(bq_client, query, result_cache)
+        query_template.run()
+        query_template.run()
+    query_template = _query_template(bq_client, "select 1 as f_int", result_cache)
+    query_template.with_destination(MagicMock(fqdn=lambda: "test_project.dataset_foo.table_bar")).run()
+    query_template.with_destination(MagicMock(fqdn=lambda: "test_project.dataset_foo.table_bar")).overwrite().run()
+    assert bq_client.query.call_count == 6
+    assert result_cache.stats() == (0, 0, 0)
+
+
+def test_result_cache_key_job_config():
+    bq_client = MagicMock(wraps=SQLiteClient())
+    result_cache = QueryResultCache()
+    job_configs = [QueryJobConfig(), QueryJobConfig(default_dataset="test_project.dataset_foo"),
+                   QueryJobConfig(default_dataset="test_project.dataset_bar"),
+                   QueryJobConfig(maximum_bytes_billed=1000)]
+    for job_config in job_configs:
+        _query_template(bq_client, "select 1 as f_int", result_cache, job_config).run()
+    assert result_cache.stats() == (0, 0, 4)
+    _query_template(bq_client, "select 1 as f_int", result_cache,
+                    QueryJobConfig(default_dataset="test_project.dataset_foo")).run()
+    assert result_cache.stats() == (1, 0, 4)
@@ -0,0 +1,43 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import pytest
+from google.cloud.bigquery.schema import SchemaField
+
+from bq_test_kit.bq_dsl.schema_mixin import SchemaMixin
+from bq_test_kit.constants import DEFAULT_DATA_TYPE_CACHE_SIZE
+from bq_test_kit.exceptions import UnexpectedTypeException
+
+
+def test_generate_data_type():
+    schema = [SchemaField("f_int", "INTEGER"),
+              SchemaField("f_floats", "FLOAT", mode="REPEATED"),
+              SchemaField("f_struct", "RECORD", mode="REPEATED", fields=[SchemaField("f_bool", "BOOL")])]
+    assert SchemaMixin.generate_data_type(schema) == ("STRUCT<f_int INT64, f_floats ARRAY<FLOAT64>, "
+                                                      "f_struct ARRAY<STRUCT<f_bool BOOL>>>")
+    assert SchemaMixin.generate_data_type(schema[2]) == "ARRAY<STRUCT<f_bool BOOL>>"
+    assert SchemaMixin.generate_data_type(SchemaField("f_date", "date")) == "DATE"
+    with pytest.raises(UnexpectedTypeException):
+        SchemaMixin.generate_data_type(SchemaField("f_json", "JSON"))
+
+
+def test_generate_data_type_cache():
+    SchemaMixin.resize_data_type_cache(2)
+    try:
+        field = SchemaField("f_struct", "RECORD", fields=[SchemaField("f_string", "STRING")])
+        same_field = SchemaField("f_struct", "RECORD", fields=[SchemaField("f_string", "STRING")],
+                                 description="same fingerprint")
+        assert SchemaMixin.generate_data_type(field) == "STRUCT<f_string STRING>"
+        assert SchemaMixin.generate_data_type(same_field) == "STRUCT<f_string STRING>"
+        cache_info = SchemaMixin.data_type_cache_info()
+        assert (cache_info.hits, cache_info.misses, cache_info.maxsize, cache_info.currsize) == (1, 1, 2, 1)
+        SchemaMixin.generate_data_type(SchemaField("f1", "STRING"))
+        SchemaMixin.generate_data_type(SchemaField("f2", "STRING"))
+        assert SchemaMixin.data_type_cache_info().currsize == 2
+        SchemaMixin.clear_data_type_cache()
+        assert SchemaMixin.data_type_cache_info().currsize == 0
+    finally:
+        SchemaMixin.resize_data_type_cache()
+    assert SchemaMixin.data_type_cache_info().maxsize == DEFAULT_DATA_TYPE_CACHE_SIZE
@@ -6,6 +6,7 @@
 import pytest
 from google.cloud.bigquery.schema import SchemaField
 
+from bq_test_kit.constants import DEFAULT_SCHEMA_PLAN_CACHE_SIZE
 from bq_test_kit.data_literal_transformers import BaseDataLiteralTransformer
 
 
@@ -13,3 +14,57 @@ def test_load_implementation():
     bdlt = BaseDataLiteralTransformer()
     with pytest.raises(NotImplementedError):
         bdlt.load(1, [SchemaField("titi", "STRING")])
+
+
+def test_schema_plan_cache():
+    bdlt = BaseDataLiteralTransformer()
+    schema = [SchemaField("f_string", "STRING"),
+              SchemaField("f_struct", "RECORD", fields=[SchemaField("f_int", "INT64")])]
+    plan = bdlt.schema_plan(schema)
+    assert bdlt.schema_plan(list(schema)) is plan
+    assert bdlt.schema_plan(schema, str.upper) is not plan
+    assert plan.index["f_struct"].record_plan.index["f_int"].target_name == "f_int"
+    copied_bdlt = bdlt.use_string_cast_to_bytes()
+    assert copied_bdlt.schema_plan(schema) is not plan
+    assert bdlt.schema_plan(schema) is plan
+
+
+def test_schema_plan_cache_is_bounded_and_keyed_by_field_names():
+    bdlt = BaseDataLiteralTransformer()
+    schema = [SchemaField("f_string", "STRING")]
+    plan = bdlt.schema_plan(schema, lambda name: name.upper())
+    field_names = {"f_string": "F_STRING"}
+    assert bdlt.schema_plan(schema, field_names.__getitem__) is plan
+    assert bdlt.schema_plan(list(schema), lambda name: name.upper()) is plan
+    for index in range(DEFAULT_SCHEMA_PLAN_CACHE_SIZE + 10):
+        bdlt.schema_plan([SchemaField(f"f_{index}", "STRING")])
+    assert len(bdlt._schema_plans) == DEFAULT_SCHEMA_PLAN_CACHE_SIZE
+
+
+def test_schema_plan_of_schema_changed_in_place():
+    bdlt = BaseDataLiteralTransformer()
+    schema = [SchemaField("f_string", "STRING")]
+    plan = bdlt.schema_plan(schema)
+    schema[0] = SchemaField("f_string", "INT64")
+    int_plan = bdlt.schema_plan(schema)
+    assert int_plan is not plan
+    assert int_plan.index["f_string"].data_type == "INT64"
+    schema.append(SchemaField("f_bool", "BOOL"))
+    assert "f_bool" in bdlt.schema_plan(schema).index
+    field_names = {"f_string": "F_STRING", "f_bool": "F_BOOL"}
+    renamed_plan = bdlt.schema_plan(schema, field_names.__getitem__)
+    field_names["f_string"] = "G_STRING"
+    assert bdlt.schema_plan(schema, field_names.__getitem__) is not renamed_plan
+
+
+def test_schema_plan_transform():
+    bdlt = BaseDataLiteralTransformer()
+    schema = [SchemaField("f_string", "STRING"),
+              SchemaField("f_struct", "RECORD", fields=[SchemaField("f_int", "INT64")])]
+    query, errors = bdlt.transform_to_literal({"f_string": "a", "f_unknown": 1}, schema, str.upper)
+    assert query is None
+    assert errors == ["Key f_unknown @ . not in schema"]
+    lenient_bdlt = bdlt.ignore_unknown_values()
+    query, errors = lenient_bdlt.transform_to_literal({"f_string": "a", "f_unknown": 1}, schema, str.upper)
+    assert query == "select 'a' as F_STRING, cast(null as STRUCT<f_int INT64>) as F_STRUCT"
+    assert errors is None
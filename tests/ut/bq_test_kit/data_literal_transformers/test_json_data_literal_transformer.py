@@ -3,9 +3,13 @@
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
+from io import StringIO
+
 import pytest
+from google.cloud.bigquery.schema import SchemaField
 
-from bq_test_kit.data_literal_transformers import JsonDataLiteralTransformer
+from bq_test_kit.data_literal_transformers import (JsonDataLiteralTransformer,
+                                                   LiteralFormat)
 from bq_test_kit.data_literal_transformers.json_format import JsonFormat
 from bq_test_kit.exceptions import (DataLiteralTransformException,
                                     InvalidInstanceException,
@@ -476,3 +480,95 @@ def test_json_empty_array_schema():
         PackageFileLoader("tests/ut/bq_test_kit/data_literal_transformers/resources/empty_array_schema.json")
     )
     assert query == expected
+
+
+def test_json_load_as_array_of_structs():
+    transformer = JsonDataLiteralTransformer().with_literal_format(LiteralFormat.ARRAY_OF_STRUCTS)
+    schema = [SchemaField("f_int", "INT64"),
+              SchemaField("f_struct", "RECORD", fields=[SchemaField("f_string", "STRING")]),
+              SchemaField("f_repeated", "DATE", mode="REPEATED")]
+    query = transformer.load(['{"f_int": 1, "f_struct": {"f_string": "a"}, "f_repeated": ["2020-11-26"]}',
+                              '{"f_repeated": []}'],
+                             schema, lambda name: name.upper())
+    assert query == ("(select * from unnest(ARRAY<STRUCT<F_INT INT64, F_STRUCT STRUCT<F_STRING STRING>, "
+                     "F_REPEATED ARRAY<DATE>>>[\n"
+                     "(cast(1 as INT64), struct('a'), [date '2020-11-26']),\n"
+                     "(null, null, [])\n"
+                     "]))")
+    query = transformer.load(None, schema)
+    assert query == ("(select * from unnest(ARRAY<STRUCT<f_int INT64, f_struct STRUCT<f_string STRING>, "
+                     "f_repeated ARRAY<DATE>>>[]))")
+    with pytest.raises(DataLiteralTransformException) as exception:
+        transformer.load(['{"f_int": 1}', '{"f_unknown": 1}'], schema)
+    assert str(exception.value) == ("Exception happened in line 2 with the following errors :\n"
+                                    "\tKey f_unknown @ . not in schema")
+
+
+def test_json_load_to_sink():
+    transformer = JsonDataLiteralTransformer()
+    datum = PackageFileLoader("tests/ut/bq_test_kit/data_literal_transformers/resources/nested_schema_datum.json")
+    schema = PackageFileLoader("tests/ut/bq_test_kit/data_literal_transformers/resources/nested_schema.json")
+    sink = StringIO()
+    transformer.load_to(sink, datum, schema)
+    assert sink.getvalue() == transformer.load(datum, schema)
+    sink = StringIO()
+    transformer.load_to(sink, None, schema)
+    assert sink.getvalue() == transformer.load(None, schema)
+    with pytest.raises(RowParsingException):
+        transformer.load_to(StringIO(), ['{"f_string": "a"}', '{', '{"f_unknown": "b"}'], schema)
+    with pytest.raises(DataLiteralTransformException) as exception:
+        transformer.load_to(StringIO(), ['{"f_unknown": "a"}', '{}', '{"f_unknown": "b"}'], schema)
+    assert str(exception.value) == ("Exception happened in line 1 with the following errors :\n"
+                                    "\tKey f_unknown @ . not in schema\n\n"
+                                    "Exception happened in line 3 with the following errors :\n"
+                                    "\tKey f_unknown @ . not in schema")
+
+
+class _Renamer():
+    def rename(self, name: str) -> str:
+        return name.upper()
+
+
+def test_json_load_with_process_pool():
+    transformer = JsonDataLiteralTransformer()
+    parallel_transformer = transformer.use_process_pool(max_workers=2, chunk_size=2)
+    assert parallel_transformer.max_workers == 2 and transformer.max_workers == 1
+    schema = [SchemaField("f_int", "INT64"),
+              SchemaField("f_struct", "RECORD", fields=[SchemaField("f_string", "STRING")])]
+    datum = [f'{{"f_int": {i}, "f_struct": {{"f_string": "{i}"}}}}' for i in range(7)]
+    renamer = _Renamer()
+    assert parallel_transformer.load(datum, schema, renamer.rename) == transformer.load(datum, schema, renamer.rename)
+    invalid_datum = datum[:3] + ['{"f_unknown": 1}'] + datum[3:] + ['{"f_struct": 1}']
+    with pytest.raises(DataLiteralTransformException) as exception:
+        parallel_transformer.load(invalid_datum, schema)
+    assert str(exception.value) == ("Exception happened in line 4 with the following errors :\n"
+                                    "\tKey f_unknown @ . not in schema\n\n"
+                                    "Exception happened in line 9 with the following errors :\n"
+                                    "\t.f_struct is not a dictionary while schema is of type RECORD")
+
+
+def test_json_load_chunks():
+    transformer = JsonDataLiteralTransformer()
+    schema = [SchemaField("f_int", "INT64")]
+    datum = ['{"f_int": 1}', '{"f_int": 2}', '{"f_int": 3}']
+    assert transformer.load_chunks(datum, schema) == [transformer.load(datum, schema)]
+    literals = transformer.load_chunks(datum, schema, max_size=80)
+    assert literals == [
+        "(select cast(1 as INT64) as f_int\nunion all\nselect cast(2 as INT64) as f_int)",
+        "(select cast(3 as INT64) as f_int)"
+    ]
+    assert all(len(literal) <= 80 for literal in literals)
+    assert transformer.load_chunks(datum, schema, max_size=1) == [
+        "(select cast(1 as INT64) as f_int)",
+        "(select cast(2 as INT64) as f_int)",
+        "(select cast(3 as INT64) as f_int)"
+    ]
+    assert transformer.load_chunks(None, schema, max_size=1) == [transformer.load(None, schema)]
+    with pytest.raises(DataLiteralTransformException) as exception:
+        transformer.load_chunks(datum[:2], schema + [SchemaField("f_str", "STRING", mode="REQUIRED")], max_size=1)
+    assert str(exception.value) == (
+        "Exception happened in line 1 with the following errors :\n"
+        "\t.f_str is required\n\n"
+        "Exception happened in line 2 with the following errors :\n"
+        "\t.f_str is required"
+    )
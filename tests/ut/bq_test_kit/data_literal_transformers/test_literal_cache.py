@@ -0,0 +1,100 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import os
+import pickle
+from copy import deepcopy
+from unittest.mock import patch
+
+from google.cloud.bigquery.schema import SchemaField
+
+from bq_test_kit.data_literal_transformers import (DsvDataLiteralTransformer,
+                                                   JsonDataLiteralTransformer,
+                                                   LiteralCache)
+from bq_test_kit.data_literal_transformers.json_format import JsonFormat
+
+SCHEMA = [SchemaField("f_int", "INT64"), SchemaField("f_string", "STRING")]
+DATUM = ['{"f_int": 1, "f_string": "a"}', '{"f_int": 2, "f_string": "b"}']
+
+
+def test_get_put_and_eviction(tmp_path):
+    cache = LiteralCache(str(tmp_path / "cache"), max_size=10)
+    assert cache.get("k1") is None
+    cache.put("k1", "12345")
+    cache.put("k2", "67890")
+    assert cache.get("k1") == "12345"
+    os.utime(tmp_path / "cache" / "k1.sql", (0, 0))
+    cache.put("k3", "abc")
+    assert cache.get("k1") is None
+    assert cache.get("k2") == "67890"
+    assert cache.get("k3") == "abc"
+    cache.clear()
+    assert cache.get("k2") is None
+    assert deepcopy(cache) is cache
+    assert pickle.loads(pickle.dumps(cache)).directory == cache.directory
+
+
+def test_get_of_entry_evicted_after_read(tmp_path):
+    cache = LiteralCache(str(tmp_path / "cache"))
+    cache.put("k1", "12345")
+    utime = os.utime
+
+    def _evict_then_utime(path, *args, **kwargs):
+        os.remove(path)
+        utime(path, *args, **kwargs)
+
+    with patch("bq_test_kit.data_literal_transformers.literal_cache.os.utime", side_effect=_evict_then_utime):
+        assert cache.get("k1") == "12345"
+    assert cache.get("k1") is None
+
+
+def test_transformer_with_literal_cache(tmp_path):
+    cache = LiteralCache(str(tmp_path))
+    transformer = JsonDataLiteralTransformer().with_literal_cache(cache)
+    assert transformer.literal_cache is cache
+    expected = JsonDataLiteralTransformer().load(DATUM, SCHEMA)
+    assert transformer.load(DATUM, SCHEMA) == expected
+    assert transformer.load(DATUM, SCHEMA) == expected
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert stats.cold_seconds > 0 and stats.warm_seconds > 0
+    assert len(os.listdir(tmp_path)) == 1
+    assert transformer.load_as({"t1": (DATUM, SCHEMA)}) == {"t1": expected}
+    assert cache.stats().hits == 2
+    cache.reset_stats()
+    assert cache.stats() == (0, 0, 0.0, 0.0)
+
+
+def test_literal_cache_key(tmp_path):
+    cache = LiteralCache(str(tmp_path))
+    transformer = JsonDataLiteralTransformer().with_literal_cache(cache)
+    key = transformer._literal_cache_key(DATUM, SCHEMA, None)
+    assert transformer._literal_cache_key(list(DATUM), list(SCHEMA), None) == key
+    assert transformer.use_process_pool(2)._literal_cache_key(DATUM, SCHEMA, None) == key
+    assert transformer._literal_cache_key(DATUM, SCHEMA, lambda name: name) != key
+    assert (transformer._literal_cache_key(DATUM, SCHEMA, lambda name: name) ==
+            transformer._literal_cache_key(DATUM, SCHEMA, str))
+    assert transformer._literal_cache_key(DATUM, SCHEMA, str.upper) != key
+    assert transformer._literal_cache_key(DATUM[:1], SCHEMA, None) != key
+    assert transformer._literal_cache_key(DATUM, SCHEMA[:1], None) != key
+    assert transformer._literal_cache_key(DATUM, SCHEMA, None, 100) != key
+    assert transformer.use_datetime_like_cast()._literal_cache_key(DATUM, SCHEMA, None) != key
+    assert transformer.use_string_cast_to_bytes()._literal_cache_key(DATUM, SCHEMA, None) != key
+    assert transformer.ignore_unknown_values()._literal_cache_key(DATUM, SCHEMA, None) != key
+    assert transformer.with_json_format(JsonFormat.JSON_ARRAY)._literal_cache_key(DATUM, SCHEMA, None) != key
+    dsv_transformer = DsvDataLiteralTransformer().with_literal_cache(cache)
+    dsv_key = dsv_transformer._literal_cache_key("1,a", SCHEMA, None)
+    assert dsv_key != transformer._literal_cache_key("1,a", SCHEMA, None)
+    assert dsv_transformer.with_field_delimiter(";")._literal_cache_key("1,a", SCHEMA, None) != dsv_key
+
+
+def test_load_chunks_with_literal_cache(tmp_path):
+    cache = LiteralCache(str(tmp_path))
+    transformer = JsonDataLiteralTransformer().with_literal_cache(cache)
+    expected = JsonDataLiteralTransformer().load_chunks(DATUM, SCHEMA, max_size=1)
+    assert len(expected) == 2
+    assert transformer.load_chunks(DATUM, SCHEMA, max_size=1) == expected
+    assert transformer.load_chunks(DATUM, SCHEMA, max_size=1) == expected
+    assert (cache.stats().hits, cache.stats().misses) == (1, 1)
@@ -14,3 +14,10 @@ def test_invalid_implementation():
         pass
     with pytest.raises(NotImplementedError):
         InvalidResourceLoader().load()
+
+
+def test_default_iter_lines():
+    class StringResourceLoader(BaseResourceLoader):
+        def load(self) -> str:
+            return "line 1\r\nline 2\n"
+    assert list(StringResourceLoader().iter_lines()) == ["line 1", "line 2"]
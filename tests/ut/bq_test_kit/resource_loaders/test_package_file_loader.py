@@ -35,3 +35,9 @@ def test_invalid_package_name():
                             "missing_resources/package_file_test_resource.txt")
     with pytest.raises(ModuleNotFoundError):
         pfl.load()
+
+
+def test_iter_lines():
+    pfl = PackageFileLoader("tests/ut/bq_test_kit/data_literal_transformers/"
+                            "resources/simple_schema_datum.csv")
+    assert list(pfl.iter_lines()) == pfl.load().splitlines()
@@ -4,14 +4,19 @@
 # https://opensource.org/licenses/MIT
 
 import os
+import threading
+import time
+from unittest.mock import MagicMock
 
 import pytest
+from google.api_core.exceptions import BadRequest
 
 from bq_test_kit.bq_dsl.bq_query_template import BQQueryTemplate
 from bq_test_kit.bq_dsl.bq_resources.project import Project
 from bq_test_kit.bq_test_kit import BQTestKit
 from bq_test_kit.bq_test_kit_config import BQTestKitConfig
-from bq_test_kit.exceptions import (ProjectNotDefinedException,
+from bq_test_kit.exceptions import (BytesBudgetExceededException,
+                                    ProjectNotDefinedException,
                                     RequirementsException)
 
 
@@ -51,3 +56,60 @@ def test_query_template():
     bqtk = BQTestKit(bq_client=None, bqtk_config=BQTestKitConfig().with_project(name="p1", project_id="p1id"))
     bq_tpl = bqtk.query_template(from_="select 1 as nb")
     assert isinstance(bq_tpl, BQQueryTemplate)
+
+
+def test_run_many():
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def _query(query, **_):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        if query == "fail":
+            raise BadRequest("invalid query")
+        if query == "bug":
+            raise ValueError("bug")
+        query_job = MagicMock()
+        query_job.result.return_value = [{"query": query}]
+        return query_job
+    bq_client = MagicMock()
+    bq_client.query.side_effect = _query
+    bqtk = BQTestKit(bq_client=bq_client, bqtk_config=BQTestKitConfig().with_default_location("EU"))
+    queries = ["q0", "fail", "q2", "bug", "q4"]
+    runs = bqtk.run_many([bqtk.query_template(from_=query) for query in queries], max_concurrency=2)
+    assert [run.succeeded for run in runs] == [True, False, True, False, True]
+    assert [run.result.rows[0]["query"] for run in runs if run.succeeded] == ["q0", "q2", "q4"]
+    assert isinstance(runs[1].error, BadRequest)
+    assert isinstance(runs[3].error, ValueError)
+    assert runs[1].result is None
+    assert all(run.duration >= 0.01 for run in runs)
+    assert running[1] == 2
+
+
+def test_dry_run_many():
+    def _query(query, **_):
+        if query == "fail":
+            raise BadRequest("invalid query")
+        query_job = MagicMock(referenced_tables=[], schema=None)
+        query_job.total_bytes_processed = int(query[1:])
+        return query_job
+    bq_client = MagicMock()
+    bq_client.query.side_effect = _query
+    bqtk = BQTestKit(bq_client=bq_client, bqtk_config=BQTestKitConfig().with_default_location("EU"))
+    queries = ["q10", "fail", "q20"]
+    dry_runs = bqtk.dry_run_many([bqtk.query_template(from_=query) for query in queries], max_bytes=15)
+    assert [dry_run.succeeded for dry_run in dry_runs] == [True, False, False]
+    assert dry_runs[0].estimate.total_bytes_processed == 10
+    assert dry_runs[0].estimate.schema == []
+    assert isinstance(dry_runs[1].error, BadRequest)
+    assert isinstance(dry_runs[2].error, BytesBudgetExceededException)
+    assert dry_runs[2].estimate is None
+    bq_client.query.side_effect = TypeError("bug")
+    assert isinstance(bqtk.dry_run_many([bqtk.query_template(from_="q10")])[0].error, TypeError)
+    bq_client.query.side_effect = KeyboardInterrupt()
+    with pytest.raises(KeyboardInterrupt):
+        bqtk.dry_run_many([bqtk.query_template(from_="q10")])
@@ -0,0 +1,30 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+from datetime import date, datetime, time, timedelta, timezone
+
+from bq_test_kit.iso_format import parse_date, parse_datetime, parse_time
+
+
+def test_parse_date():
+    assert parse_date("2020-11-26") == date(2020, 11, 26)
+
+
+def test_parse_time():
+    assert parse_time("17:09:03") == time(17, 9, 3)
+    assert parse_time("17:09:03.967259") == time(17, 9, 3, 967259)
+    assert parse_time("17:09:03+02:00") == time(17, 9, 3, tzinfo=timezone(timedelta(hours=2)))
+
+
+def test_parse_datetime():
+    assert parse_datetime("2020-11-26") == datetime(2020, 11, 26)
+    assert parse_datetime("2020-11-26T17:09:03") == datetime(2020, 11, 26, 17, 9, 3)
+    assert parse_datetime("2020-11-26 17:09:03.5") == datetime(2020, 11, 26, 17, 9, 3, 500000)
+    assert parse_datetime("2020-11-26T17:09:03.967259+00:00") == datetime(2020, 11, 26, 17, 9, 3, 967259,
+                                                                          tzinfo=timezone.utc)
+    assert parse_datetime("2020-11-26T17:09:03Z").tzinfo == timezone.utc
+    assert parse_datetime("2020-11-26T17:09:03-05:30").utcoffset() == -timedelta(hours=5, minutes=30)
+    value = datetime(2020, 11, 26, 17, 9, 3, 967259, tzinfo=timezone.utc)
+    assert parse_datetime(value.isoformat()) == value
@@ -0,0 +1,24 @@
+# Copyright (c) 2026 Bounkong Khamphousone
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import subprocess
+import sys
+
+from bq_test_kit.sql_tokens import Token, tokenize
+
+
+def test_tokenize():
+    assert tokenize("select `p.d.t`.a -- ;\n@x") == [
+        Token("word", "select"), Token("space", " "), Token("quoted", "`p.d.t`"), Token("op", "."),
+        Token("word", "a"), Token("space", " "), Token("comment", "-- ;"), Token("space", "\n"),
+        Token("param", "@x")
+    ]
+
+
+def test_query_dsl_does_not_load_backends():
+    loaded = subprocess.run([sys.executable, "-c", "import sys, bq_test_kit.bq_dsl; "
+                             "print(any(name.startswith('bq_test_kit.backends') for name in sys.modules))"],
+                            stdout=subprocess.PIPE, universal_newlines=True, check=True)
+    assert loaded.stdout.strip() == "False"